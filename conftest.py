@@ -0,0 +1,4 @@
+"""Pytest configuration for the nautobot_ssot_citrix_adm benchmarks."""
+import nautobot
+
+nautobot.setup()
@@ -24,7 +24,24 @@ class NautobotSsotCitrixAdmConfig(PluginConfig):
     required_settings = []
     min_version = "2.1.0"
     max_version = "2.9999"
-    default_settings = {"update_sites": True, "hostname_mapping": []}
+    default_settings = {
+        "update_sites": True,
+        "hostname_mapping": [],
+        "bulk_batch_size": 1000,
+        "transaction_chunk_size": 500,
+        "device_hash_diff": True,
+        "trusted_load": False,
+        "shard_timeout": 3600,
+        "shard_poll_interval": 5,
+        "ha_aware_collection": True,
+        "instance_priority": [],
+        "secrets_cache_ttl": 300,
+        "log_batch_size": 500,
+        "log_category_limit": 100,
+        "event_debounce": 30,
+        "event_max_delay": 300,
+        "event_batch_size": 50,
+    }
     caching_config = {}
 
     def ready(self):
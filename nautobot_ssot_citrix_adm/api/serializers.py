@@ -0,0 +1,21 @@
+"""Serializers for the nautobot_ssot_citrix_adm REST API."""
+from nautobot.extras.models import ExternalIntegration
+from nautobot.tenancy.models import Tenant
+from rest_framework import serializers
+
+
+class DeviceSyncSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """Options of a sync of a single ADC or Datacenter from Citrix ADM."""
+
+    instances = serializers.PrimaryKeyRelatedField(queryset=ExternalIntegration.objects.all(), many=True)
+    tenant = serializers.PrimaryKeyRelatedField(queryset=Tenant.objects.all(), required=False, allow_null=True)
+    hostname = serializers.CharField(required=False, allow_blank=True, default="")
+    datacenter = serializers.CharField(required=False, allow_blank=True, default="")
+    dryrun = serializers.BooleanField(required=False, default=False)
+    debug = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        """Validate exactly one of hostname or datacenter is specified."""
+        if bool(attrs.get("hostname")) == bool(attrs.get("datacenter")):
+            raise serializers.ValidationError("Exactly one of hostname or datacenter must be specified.")
+        return attrs
@@ -0,0 +1,8 @@
+"""URLs for the nautobot_ssot_citrix_adm REST API."""
+from django.urls import path
+from nautobot_ssot_citrix_adm.api.views import DeviceSyncView, EventReceiverView
+
+urlpatterns = [
+    path("sync/", DeviceSyncView.as_view(), name="sync"),
+    path("events/<uuid:instance>/", EventReceiverView.as_view(), name="events"),
+]
@@ -0,0 +1,95 @@
+"""Views for the nautobot_ssot_citrix_adm REST API."""
+from django.shortcuts import get_object_or_404
+from nautobot.extras.models import ExternalIntegration, JobResult
+from nautobot.extras.models import Job as JobModel
+from nautobot.tenancy.models import Tenant
+from rest_framework import status
+from rest_framework.exceptions import ParseError, PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+from nautobot_ssot_citrix_adm.api.serializers import DeviceSyncSerializer
+from nautobot_ssot_citrix_adm.utils.events import enqueue_device, parse_events, resolve_hostnames, schedule_worker
+
+
+class DeviceSyncView(APIView):
+    """Enqueue a sync of a single ADC or Datacenter from Citrix ADM to Nautobot."""
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = DeviceSyncSerializer
+
+    def post(self, request):
+        """Enqueue the Citrix ADM Device to Nautobot Job and return its Job Result."""
+        from nautobot_ssot_citrix_adm.jobs import CitrixAdmDeviceDataSource  # pylint: disable=import-outside-toplevel
+
+        serializer = DeviceSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if not request.user.has_perm("extras.run_job"):
+            raise PermissionDenied("This user does not have permission to run jobs.")
+        job_model = (
+            JobModel.objects.restrict(request.user, "run")
+            .filter(
+                module_name=CitrixAdmDeviceDataSource.__module__,
+                job_class_name=CitrixAdmDeviceDataSource.__name__,
+            )
+            .first()
+        )
+        if job_model is None or not job_model.enabled:
+            raise PermissionDenied("The Citrix ADM Device to Nautobot Job is not enabled to be run.")
+        data = serializer.validated_data
+        job_result = JobResult.enqueue_job(
+            job_model,
+            request.user,
+            dryrun=data["dryrun"],
+            memory_profiling=False,
+            instances=[str(instance.id) for instance in data["instances"]],
+            tenant=str(data["tenant"].id) if data.get("tenant") else None,
+            hostname=data["hostname"],
+            datacenter=data["datacenter"],
+            debug=data["debug"],
+        )
+        return Response(
+            {
+                "job_result": {
+                    "id": str(job_result.id),
+                    "status": job_result.status,
+                    "url": reverse("extras-api:jobresult-detail", kwargs={"pk": job_result.pk}, request=request),
+                }
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class EventReceiverView(APIView):
+    """Receive event notifications from a Citrix ADM instance and queue the ADCs they're about to be synced."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, instance):
+        """Queue the ADCs of the events and make sure the event worker is running.
+
+        The Tenant to sync the ADCs with can be passed as the `tenant` query parameter.
+        """
+        if not request.user.has_perm("extras.run_job"):
+            raise PermissionDenied("This user does not have permission to run jobs.")
+        instance = get_object_or_404(ExternalIntegration, pk=instance)
+        tenant = None
+        if request.query_params.get("tenant"):
+            tenant = get_object_or_404(Tenant, pk=request.query_params["tenant"])
+        if not isinstance(request.data, (dict, list)):
+            raise ParseError("Expected a JSON object or list of events.")
+        events = parse_events(request.data)
+        hostnames = resolve_hostnames([device for device, _ in events])
+        queued, ignored = set(), []
+        for device, event in events:
+            if device in hostnames:
+                enqueue_device(instance=instance, hostname=hostnames[device], event=event, tenant=tenant)
+                queued.add(hostnames[device])
+            else:
+                ignored.append(device)
+        worker = schedule_worker(request.user) if queued else None
+        return Response(
+            {"queued": sorted(queued), "ignored": ignored, "worker": str(worker.id) if worker else None},
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -0,0 +1,109 @@
+"""Base DiffSync adapter shared by the Citrix ADM and Nautobot adapters."""
+import gzip
+import hashlib
+import json
+from collections import defaultdict
+from typing import Type
+from diffsync import DiffSync, DiffSyncModel
+from diffsync.exceptions import ObjectAlreadyExists
+from django.conf import settings
+from nautobot_ssot_citrix_adm.utils.nautobot import PhaseProfiler
+
+SNAPSHOT_MODELS = ["datacenter", "device", "port", "prefix", "address", "ip_on_intf"]
+
+
+class BaseAdapter(DiffSync):
+    """DiffSync adapter that computes a content hash of each Device subtree once loaded."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the Device hash tables and the phase profiler."""
+        super().__init__(*args, **kwargs)
+        self.profiler = PhaseProfiler()
+        self.device_hashes = {}
+        self.device_subtrees = {}
+        self.trusted_load = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("trusted_load", False)
+
+    def new_model(self, model: Type[DiffSyncModel], **kwargs) -> DiffSyncModel:
+        """Instantiate a DiffSync model, skipping field validation when trusted load is enabled.
+
+        Only use this for data that is already normalized, ie returned by our Citrix ADM parsers or read from the database.
+
+        Args:
+            model (Type[DiffSyncModel]): DiffSync model class to instantiate.
+            kwargs: Field values for the model.
+
+        Returns:
+            DiffSyncModel: The new DiffSync model instance.
+        """
+        if self.trusted_load:
+            return model.construct(**kwargs)
+        return model(**kwargs)
+
+    def compute_device_hashes(self):
+        """Compute a content hash of each Device, its ports, and the IP Addresses and mappings on those ports.
+
+        The hash covers the identifiers and attributes that DiffSync compares so matching hashes in two adapters
+        mean there's no difference in any object of that Device's subtree.
+        """
+        ports, mappings, addresses = defaultdict(list), defaultdict(list), defaultdict(list)
+        for port in self.get_all("port"):
+            ports[port.device].append(port)
+        for mapping in self.get_all("ip_on_intf"):
+            mappings[mapping.device].append(mapping)
+        for addr in self.get_all("address"):
+            addresses[addr.address].append(addr)
+        self.device_hashes, self.device_subtrees = {}, {}
+        for device in self.get_all("device"):
+            subtree = [device, *ports[device.name], *mappings[device.name]]
+            subtree.extend(addr for mapping in mappings[device.name] for addr in addresses[mapping.address])
+            content = {f"{obj.get_type()}__{obj.get_unique_id()}": obj.get_attrs() for obj in subtree}
+            self.device_hashes[device.get_unique_id()] = hashlib.sha256(
+                json.dumps(sorted(content.items()), sort_keys=True, default=str).encode()
+            ).hexdigest()
+            self.device_subtrees[device.get_unique_id()] = subtree
+
+    def dump_snapshot(self) -> dict:
+        """Serialize all loaded objects into a JSON serializable dictionary.
+
+        Returns:
+            dict: Field values of the loaded objects keyed by model name.
+        """
+        snapshot = {}
+        for modelname in SNAPSHOT_MODELS:
+            snapshot[modelname] = []
+            for obj in self.get_all(modelname):
+                values = obj.dict(exclude={"diffsync", "model_flags"})
+                values["uuid"] = str(values["uuid"]) if values.get("uuid") else None
+                snapshot[modelname].append(values)
+        return snapshot
+
+    def load_snapshot(self, snapshot: dict):
+        """Load objects from a snapshot created by `dump_snapshot()`, skipping objects that are already loaded.
+
+        Args:
+            snapshot (dict): Field values of objects keyed by model name.
+        """
+        for modelname in SNAPSHOT_MODELS:
+            for values in snapshot.get(modelname, []):
+                obj = self.new_model(getattr(self, modelname), **values)
+                try:
+                    self.add(obj)
+                except ObjectAlreadyExists:
+                    if modelname == "device":
+                        self.job.logger.warning("Duplicate Device attempting to be loaded: %s", obj.name)
+
+    def dump_snapshot_file(self) -> bytes:
+        """Serialize all loaded objects into gzip compressed JSON.
+
+        Returns:
+            bytes: Compressed snapshot created by `dump_snapshot()`.
+        """
+        return gzip.compress(json.dumps(self.dump_snapshot(), separators=(",", ":")).encode())
+
+    def load_snapshot_file(self, data: bytes):
+        """Load objects from a compressed snapshot created by `dump_snapshot_file()`.
+
+        Args:
+            data (bytes): Compressed snapshot.
+        """
+        self.load_snapshot(json.loads(gzip.decompress(data)))
@@ -1,14 +1,16 @@
 """Nautobot SSoT Citrix ADM Adapter for Citrix ADM SSoT plugin."""
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import ipaddress
+import zlib
+from time import perf_counter
+import requests
 from django.conf import settings
-from diffsync import DiffSync
 from diffsync.exceptions import ObjectNotFound
-from nautobot.extras.choices import SecretsGroupAccessTypeChoices, SecretsGroupSecretTypeChoices
 from nautobot.extras.models import Job, ExternalIntegration
 from nautobot.tenancy.models import Tenant
 from nautobot_ssot_citrix_adm.constants import DEVICETYPE_MAP
+from nautobot_ssot_citrix_adm.diffsync.adapters.base import BaseAdapter
 from nautobot_ssot_citrix_adm.diffsync.models.citrix_adm import (
     CitrixAdmDatacenter,
     CitrixAdmDevice,
@@ -18,6 +20,9 @@ from nautobot_ssot_citrix_adm.diffsync.models.citrix_adm import (
     CitrixAdmIPAddressOnInterface,
 )
 from nautobot_ssot_citrix_adm.utils.citrix_adm import (
+    get_adc_keys,
+    get_ha_pairs,
+    mirror_ha_node,
     parse_hostname_for_role,
     parse_version,
     CitrixNitroClient,
@@ -25,11 +30,10 @@ from nautobot_ssot_citrix_adm.utils.citrix_adm import (
     parse_nsips,
     parse_nsip6s,
 )
+from nautobot_ssot_citrix_adm.utils.credentials import get_credentials, invalidate_credentials, prefetch_credentials
 
-PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"]
 
-
-class CitrixAdmAdapter(DiffSync):
+class CitrixAdmAdapter(BaseAdapter):
     """DiffSync adapter for Citrix ADM."""
 
     datacenter = CitrixAdmDatacenter
@@ -48,6 +52,9 @@ class CitrixAdmAdapter(DiffSync):
         sync=None,
         instances: List[ExternalIntegration],
         tenant: Optional[Tenant] = None,
+        shard: Optional[Tuple[int, int]] = None,
+        hostname: Optional[str] = None,
+        datacenter: Optional[str] = None,
         **kwargs,
     ):
         """Initialize Citrix ADM.
@@ -57,6 +64,9 @@ class CitrixAdmAdapter(DiffSync):
             sync (object, optional): Citrix ADM DiffSync. Defaults to None.
             instances (List[ExternalIntegration]): ExternalIntegrations defining Citrix ADM instances.
             tenant (Tenant, optional): Name of Tenant to associate Devices and IP Addresses with.
+            shard (Tuple[int, int], optional): Index and total number of shards to only load the Devices of a subset of Datacenters. Defaults to None.
+            hostname (str, optional): Hostname of the only Device to load. Defaults to None.
+            datacenter (str, optional): Name of the only Datacenter to load Devices from. Defaults to None.
         """
         super().__init__(*args, **kwargs)
         self.job = job
@@ -64,8 +74,12 @@ class CitrixAdmAdapter(DiffSync):
         self.instances = instances
         self.conn = None
         self.tenant = tenant
+        self.shard = shard
+        self.hostname = hostname
+        self.datacenter_name = datacenter
         self.adm_site_map = {}
         self.adm_device_map = {}
+        self.managed_elsewhere = set()
 
     def create_site_map(self):
         """Create mapping of ADM Datacenters to information about the Datacenter."""
@@ -85,11 +99,12 @@ class CitrixAdmAdapter(DiffSync):
                 {"name": site_info.get("name"), "region": site_info["region"] if site_info.get("region") else "Global"},
             )
             if found_site and self.job.debug:
-                self.job.logger.warning(f"Duplicate Site attempting to be loaded: {site_info}.")
+                self.job.logger.warning("Duplicate Site attempting to be loaded: %s.", site_info)
         except ObjectNotFound:
             if self.job.debug:
-                self.job.logger.info(f"Attempting to load DC: {site_info['name']}")
-            new_site = self.datacenter(
+                self.job.logger.info("Attempting to load DC: %s", site_info["name"])
+            new_site = self.new_model(
+                self.datacenter,
                 name=site_info["name"],
                 region=site_info["region"] if site_info.get("region") else "Global",
                 latitude=float(round(Decimal(site_info["latitude"] if site_info["latitude"] else 0.0), 6)),
@@ -98,24 +113,83 @@ class CitrixAdmAdapter(DiffSync):
             )
             self.add(new_site)
 
-    def load_devices(self):
-        """Load devices from Citrix ADM into DiffSync models."""
-        devices = self.conn.get_devices()
-        for dev in devices:
+    def get_device_filters(self) -> Optional[dict]:
+        """Build the Citrix ADM filter for the Devices in scope of a hostname or Datacenter sync.
+
+        Devices of a Datacenter whose name is used in several regions are filtered after they're retrieved.
+
+        Returns:
+            Optional[dict]: Attributes and values to filter the Devices on, empty when no Device can be in scope and None
+                when the Devices aren't filtered in Citrix ADM.
+        """
+        if self.hostname:
+            return {"hostname": self.hostname}
+        if self.datacenter_name:
+            site_ids = [site_id for site_id, site in self.adm_site_map.items() if site["name"] == self.datacenter_name]
+            if len(site_ids) == 1:
+                return {"datacenter_id": site_ids[0]}
+            if not site_ids:
+                return {}
+        return None
+
+    def in_scope(self, dev: dict) -> bool:
+        """Determine whether a Device belongs to the shard, hostname and Datacenter being loaded.
+
+        Args:
+            dev (dict): Device as returned by Citrix ADM.
+
+        Returns:
+            bool: Whether the Device should be loaded.
+        """
+        if self.shard and zlib.crc32(str(dev["datacenter_id"]).encode()) % self.shard[1] != self.shard[0]:
+            return False
+        if self.hostname and dev["hostname"] != self.hostname:
+            return False
+        if self.datacenter_name and self.adm_site_map.get(dev["datacenter_id"], {}).get("name") != self.datacenter_name:
+            return False
+        return True
+
+    def fetch_devices(self) -> List[dict]:
+        """Retrieve the Devices in scope from the Citrix ADM instance of the current connection.
+
+        Returns:
+            List[dict]: Devices with a hostname in the shard, hostname or Datacenter being loaded.
+        """
+        filters = self.get_device_filters()
+        if filters == {}:
+            self.job.logger.info("Datacenter %s not found in this Citrix ADM instance.", self.datacenter_name)
+            return []
+        devices = []
+        for dev in self.conn.get_devices(filters=filters) if filters else self.conn.get_devices():
             if not dev.get("hostname"):
-                self.job.logger.warning(f"Device without hostname will not be loaded. {dev}")
+                self.job.logger.warning("Device without hostname will not be loaded. %s", dev)
                 continue
+            if self.in_scope(dev):
+                devices.append(dev)
+        return devices
+
+    def load_devices(self, devices: Optional[List[dict]] = None):
+        """Load devices from Citrix ADM into DiffSync models.
+
+        Args:
+            devices (List[dict], optional): Devices to load, retrieved with `fetch_devices()` when not specified.
+        """
+        if devices is None:
+            devices = self.fetch_devices()
+        for dev in devices:
             try:
                 found_dev = self.get(self.device, dev["hostname"])
                 if found_dev:
-                    self.job.logger.warning(f"Duplicate Device attempting to be loaded: {dev['hostname']}")
+                    self.job.logger.warning("Duplicate Device attempting to be loaded: %s", dev["hostname"])
             except ObjectNotFound:
                 site = self.adm_site_map[dev["datacenter_id"]]
                 self.load_site(site_info=site)
                 role = parse_hostname_for_role(
-                    hostname_map=PLUGIN_CFG.get("hostname_mapping"), device_hostname=dev["hostname"]
+                    hostname_map=settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("hostname_mapping"),
+                    device_hostname=dev["hostname"],
                 )
-                new_dev = self.device(
+                new_dev = self.new_model(
+                    self.device,
                     name=dev["hostname"],
                     model=DEVICETYPE_MAP[dev["type"]] if dev["type"] in DEVICETYPE_MAP else dev["type"],
                     role=role,
@@ -131,18 +205,44 @@ class CitrixAdmAdapter(DiffSync):
                 self.adm_device_map[dev["hostname"]] = dev
 
     def create_port_map(self):
-        """Create a port/vlan/ip map for each ADC instance."""
+        """Create a port/vlan/ip map for each ADC instance.
+
+        With the `ha_aware_collection` setting enabled only the primary node of an HA pair is fully polled. The
+        secondary node reuses its VLAN bindings and NSIPs with its own NSIP and only its IPv6 addresses are requested.
+        """
         self.job.logger.info("Retrieving NSIP and port bindings from ADC instances.")
-        for _, adc in self.adm_device_map.items():
+        adcs = list(self.adm_device_map.values())
+        if settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("ha_aware_collection", True):
+            pairs = get_ha_pairs(adcs)
+        else:
+            pairs = [(adc, None) for adc in adcs]
+        for adc, secondary in pairs:
             vlan_bindings = self.conn.get_vlan_bindings(adc)
             nsips = self.conn.get_nsip(adc)
             nsip6s = self.conn.get_nsip6(adc)
+            self.set_ports(adc, vlan_bindings, nsips, nsip6s)
+            if secondary is None:
+                continue
+            if vlan_bindings and nsips:
+                vlan_bindings, nsips = mirror_ha_node(vlan_bindings, nsips, primary=adc, secondary=secondary)
+            else:
+                vlan_bindings = self.conn.get_vlan_bindings(secondary)
+                nsips = self.conn.get_nsip(secondary)
+            self.set_ports(secondary, vlan_bindings, nsips, self.conn.get_nsip6(secondary))
 
-            ports = parse_vlan_bindings(vlan_bindings, adc, self.job)
-            ports = parse_nsips(nsips, ports, adc)
-            ports = parse_nsip6s(nsip6s, ports)
+    def set_ports(self, adc: dict, vlan_bindings: List[dict], nsips: List[dict], nsip6s: List[dict]):
+        """Parse the ports of an ADC and add them to the device map.
 
-            self.adm_device_map[adc["hostname"]]["ports"] = ports
+        Args:
+            adc (dict): ADC as returned by Citrix ADM.
+            vlan_bindings (List[dict]): VLAN bindings of the ADC.
+            nsips (List[dict]): NSIPs of the ADC.
+            nsip6s (List[dict]): NSIP6s of the ADC.
+        """
+        ports = parse_vlan_bindings(vlan_bindings, adc, self.job)
+        ports = parse_nsips(nsips, ports, adc)
+        ports = parse_nsip6s(nsip6s, ports)
+        self.adm_device_map[adc["hostname"]]["ports"] = ports
 
     def load_ports(self):
         """Load ports from Citrix ADM into DiffSync models."""
@@ -198,7 +298,8 @@ class CitrixAdmAdapter(DiffSync):
         Returns:
             CitrixAdmPort: DiffSync model for Port that was loaded.
         """
-        new_port = self.port(
+        new_port = self.new_model(
+            self.port,
             name=port_name,
             device=dev_name,
             status="Active" if port_status == "ENABLED" else "Offline",
@@ -221,7 +322,8 @@ class CitrixAdmAdapter(DiffSync):
         try:
             self.get(self.prefix, {"prefix": prefix, "namespace": namespace})
         except ObjectNotFound:
-            new_pf = self.prefix(
+            new_pf = self.new_model(
+                self.prefix,
                 prefix=prefix,
                 namespace=namespace,
                 tenant=self.tenant.name if self.tenant else None,
@@ -243,7 +345,8 @@ class CitrixAdmAdapter(DiffSync):
         try:
             self.get(self.address, {"address": address, "prefix": prefix})
         except ObjectNotFound:
-            new_addr = self.address(
+            new_addr = self.new_model(
+                self.address,
                 address=address,
                 prefix=prefix,
                 tenant=self.tenant.name if self.tenant else None,
@@ -264,42 +367,164 @@ class CitrixAdmAdapter(DiffSync):
         try:
             self.get(self.ip_on_intf, {"address": address, "device": device, "port": port})
         except ObjectNotFound:
-            new_map = self.ip_on_intf(address=address, device=device, port=port, primary=primary, uuid=None)
+            new_map = self.new_model(
+                self.ip_on_intf, address=address, device=device, port=port, primary=primary, uuid=None
+            )
             self.add(new_map)
 
-    def load(self):
-        """Load data from Citrix ADM into DiffSync models."""
-        for instance in self.instances:
-            self.job.logger.info(f"Loading data from {instance.name}.")
-            if instance.secrets_group is not None:
-                _sg = instance.secrets_group
-                username = _sg.get_secret_value(
-                    access_type=SecretsGroupAccessTypeChoices.TYPE_HTTP,
-                    secret_type=SecretsGroupSecretTypeChoices.TYPE_USERNAME,
-                )
-                password = _sg.get_secret_value(
-                    access_type=SecretsGroupAccessTypeChoices.TYPE_HTTP,
-                    secret_type=SecretsGroupSecretTypeChoices.TYPE_PASSWORD,
-                )
-                self.conn = CitrixNitroClient(
-                    base_url=instance.remote_url,
-                    user=username,
-                    password=password,
-                    verify=instance.verify_ssl,
-                    logger=self.job,
-                )
-                self.conn.login()
-                self.adm_site_map = {}
-                self.adm_device_map = {}
+    def login(self, instance: ExternalIntegration):
+        """Log the current client into a Citrix ADM instance, dropping its cached credentials when that fails.
 
+        Args:
+            instance (ExternalIntegration): Citrix ADM instance the client belongs to.
+        """
+        try:
+            self.conn.login()
+        except requests.exceptions.RequestException:
+            invalidate_credentials(instance.secrets_group)
+            raise
+
+    def connect(self, instance: ExternalIntegration) -> Optional[dict]:
+        """Retrieve the Datacenters and the Devices in scope of a Citrix ADM instance.
+
+        The client is logged out again before returning so no session sits idle while the other instances are
+        connected to. `load_session()` logs back in just before polling the ADCs. In a Datacenter sync the hostnames of
+        the Devices the instance manages in other Datacenters are collected in `managed_elsewhere`.
+
+        Args:
+            instance (ExternalIntegration): Citrix ADM instance to connect to.
+
+        Returns:
+            Optional[dict]: Instance, client, Datacenter map, Devices and login latency in seconds, None when the
+                instance has no SecretsGroup.
+        """
+        if instance.secrets_group is None:
+            self.job.logger.warning(
+                "Missing SecretsGroup definition for %s. This must be defined so we can authenticate instance.",
+                instance.name,
+            )
+            return None
+        _sg = instance.secrets_group
+        with self.profiler.phase(f"{instance.name}: secrets lookup"):
+            username, password = get_credentials(_sg)
+        self.conn = CitrixNitroClient(
+            base_url=instance.remote_url,
+            user=username,
+            password=password,
+            verify=instance.verify_ssl,
+            logger=self.job,
+        )
+        with self.profiler.phase(f"{instance.name}: login"):
+            start = perf_counter()
+            self.login(instance)
+            latency = perf_counter() - start
+        try:
+            self.adm_site_map = {}
+            with self.profiler.phase(f"{instance.name}: sites"):
                 self.create_site_map()
-                self.load_devices()
+            with self.profiler.phase(f"{instance.name}: devices"):
+                devices = self.fetch_devices()
+            if self.datacenter_name:
+                in_scope = {dev["hostname"] for dev in devices}
+                self.managed_elsewhere.update(
+                    hostname for hostname in self.conn.get_device_hostnames() if hostname not in in_scope
+                )
+        finally:
+            self.conn.logout()
+        return {
+            "instance": instance,
+            "conn": self.conn,
+            "site_map": self.adm_site_map,
+            "devices": devices,
+            "latency": latency,
+        }
+
+    def assign_devices(self, sessions: List[dict]):
+        """Assign each Device to a single Citrix ADM instance so ADCs managed by several instances are polled once.
+
+        Instances are preferred in the order of the `instance_priority` setting, a list of ExternalIntegration names,
+        then by the lowest login latency. An ADC is recognized across instances by its hostname, ignoring casing and
+        domain, or its NSIP. The Devices assigned to a session are stored under its `assigned` key.
+
+        Args:
+            sessions (List[dict]): Sessions returned by `connect()`.
+        """
+        priority = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("instance_priority", [])
+        ranked = sorted(
+            sessions,
+            key=lambda session: (
+                (priority.index(session["instance"].name) if session["instance"].name in priority else len(priority)),
+                session["latency"],
+            ),
+        )
+        owners = {}
+        for session in ranked:
+            session["assigned"] = []
+            for dev in session["devices"]:
+                keys = get_adc_keys(dev)
+                owner = next((owners[key] for key in keys if key in owners), None)
+                owners.update(dict.fromkeys(keys - owners.keys(), owner or session["instance"].name))
+                if owner:
+                    if self.job.debug:
+                        self.job.logger.info(
+                            "%s is also managed by %s so it's collected from %s.",
+                            dev["hostname"],
+                            session["instance"].name,
+                            owner,
+                        )
+                    continue
+                session["assigned"].append(dev)
+        skipped = sum(len(session["devices"]) - len(session["assigned"]) for session in sessions)
+        if skipped:
+            self.job.logger.info("Skipping %s Devices managed by more than one Citrix ADM instance.", skipped)
+
+    def connect_all(self) -> List[dict]:
+        """Connect to all instances and assign each ADC to one of them.
+
+        Returns:
+            List[dict]: Sessions returned by `connect()` with the Devices assigned to them by `assign_devices()`.
+        """
+        with self.profiler.phase("secrets prefetch"):
+            prefetch_credentials([instance.secrets_group for instance in self.instances if instance.secrets_group])
+        sessions = []
+        for instance in self.instances:
+            self.job.logger.info("Loading data from %s.", instance.name)
+            session = self.connect(instance)
+            if session:
+                sessions.append(session)
+        self.assign_devices(sessions)
+        return sessions
+
+    def load_session(self, session: dict, devices: Optional[List[dict]] = None):
+        """Log into the instance of a session and load Devices with their ports and addresses, logging out afterwards.
+
+        Args:
+            session (dict): Session returned by `connect_all()`.
+            devices (List[dict], optional): Devices to load, the Devices assigned to the session when not specified.
+        """
+        name = session["instance"].name
+        self.conn = session["conn"]
+        self.adm_site_map = session["site_map"]
+        self.adm_device_map = {}
+
+        self.login(session["instance"])
+        try:
+            with self.profiler.phase(f"{name}: devices"):
+                self.load_devices(devices=session["assigned"] if devices is None else devices)
+            with self.profiler.phase(f"{name}: port map"):
                 self.create_port_map()
+            with self.profiler.phase(f"{name}: ports"):
                 self.load_ports()
+            with self.profiler.phase(f"{name}: addresses"):
                 self.load_addresses()
+        finally:
+            self.conn.logout()
 
-                self.conn.logout()
-            else:
-                self.job.logger.warning(
-                    f"Missing SecretsGroup definition for {instance.name}. This must be defined so we can authenticate instance."
-                )
+    def load(self):
+        """Load data from Citrix ADM into DiffSync models.
+
+        All instances are connected to first so each ADC is assigned to one of them before its data is collected.
+        """
+        for session in self.connect_all():
+            self.load_session(session)
+        self.compute_device_hashes()
@@ -1,16 +1,23 @@
 """Nautobot Adapter for Citrix ADM SSoT plugin."""
 
 from collections import defaultdict
+from operator import attrgetter
 from diffsync import DiffSync
 from diffsync.enum import DiffSyncModelFlags
 from diffsync.exceptions import ObjectNotFound
-from django.db.models import ProtectedError
-from typing import Optional
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db.models import Model, Prefetch, ProtectedError, Q, QuerySet
+from typing import List, Optional, Set, Tuple
+from uuid import UUID
+import netaddr
 from nautobot.dcim.models import Device as OrmDevice
-from nautobot.dcim.models import Interface, Location, LocationType
-from nautobot.extras.models import Job, Relationship, RelationshipAssociation
-from nautobot.ipam.models import IPAddress, IPAddressToInterface, Prefix
+from nautobot.dcim.models import DeviceType, Interface, Location, LocationType, Manufacturer, Platform
+from nautobot.extras.models import Job, Role, Status, TaggedItem
+from nautobot.ipam.models import IPAddress, IPAddressToInterface, Namespace, Prefix
 from nautobot.tenancy.models import Tenant
+from nautobot_ssot_citrix_adm.diffsync.adapters.base import BaseAdapter
 from nautobot_ssot_citrix_adm.diffsync.models.nautobot import (
     NautobotAddress,
     NautobotDatacenter,
@@ -29,7 +36,7 @@ except ImportError:
     LIFECYCLE_MGMT = False
 
 
-class NautobotAdapter(DiffSync):
+class NautobotAdapter(BaseAdapter):
     """DiffSync adapter for Nautobot."""
 
     datacenter = NautobotDatacenter
@@ -41,59 +48,168 @@ class NautobotAdapter(DiffSync):
 
     top_level = ["datacenter", "device", "prefix", "address", "ip_on_intf"]
 
-    def __init__(self, *args, job: Job, sync=None, tenant: Optional[Tenant] = None, **kwargs):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *args,
+        job: Job,
+        sync=None,
+        tenant: Optional[Tenant] = None,
+        bulk_import: bool = False,
+        transactional_sync: bool = False,
+        hostname: Optional[str] = None,
+        datacenter: Optional[str] = None,
+        devices: Optional[List[str]] = None,
+        prefixes: Optional[List[str]] = None,
+        addresses: Optional[List[str]] = None,
+        **kwargs,
+    ):
         """Initialize Nautobot.
 
         Args:
             job (Job): Nautobot job.
             sync (object, optional): Nautobot DiffSync. Defaults to None.
             tenant (Tenant, optional): Tenant to associate imported objects with. Used to filter loaded objects.
+            bulk_import (bool, optional): Queue new Prefixes, IP Addresses and Interfaces and create them in bulk. Defaults to False.
+            transactional_sync (bool, optional): Apply changes in chunked database transactions with a savepoint per object. Defaults to False.
+            hostname (str, optional): Name of the only Device to load with its Interfaces, IP Addresses and Prefixes. Defaults to None.
+            datacenter (str, optional): Name of the only Site to load Devices from. Defaults to None.
+            devices (List[str], optional): Names of the only Devices to load with their Interfaces, IP Addresses and Prefixes. Defaults to None.
+            prefixes (List[str], optional): Prefixes to load in addition to those of the Devices in scope, ie the Prefixes loaded from Citrix ADM for the same scope. Defaults to None.
+            addresses (List[str], optional): IP Addresses to load in addition to those of the Devices in scope. Defaults to None.
         """
         super().__init__(*args, **kwargs)
         self.job = job
         self.sync = sync
         self.tenant = tenant
+        self.bulk_import = bulk_import
+        self.device_filter = {"name": hostname} if hostname else {"location__name": datacenter} if datacenter else {}
+        if devices is not None:
+            self.device_filter = {"name__in": devices}
+        self.scope_networks = {prefix.split("/")[0] for prefix in prefixes or []}
+        self.scope_hosts = {address.split("/")[0] for address in addresses or []}
+        self.objects_to_create = defaultdict(list)
         self.objects_to_delete = defaultdict(list)
+        self.ref_cache = nautobot.ReferenceCache()
+        self.prefix_map = nautobot.JournaledDict()
+        self.address_map = nautobot.JournaledDict()
+        self.port_map = nautobot.JournaledDict()
+        self.tags_to_assign = []
+        self.tags_to_clear = []
+        self.primary_ips = []
+        self.software_registry = nautobot.SoftwareVersionRegistry(diffsync=self)
+        self.software_assignments = nautobot.JournaledDict()
+        self.chunker = None
+        self.profiler.track_shapes = getattr(job, "debug", False)
+        if transactional_sync:
+            self.chunker = nautobot.TransactionChunker(
+                job=job,
+                chunk_size=settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("transaction_chunk_size", 500),
+            )
+
+    def warm_ref_cache(self):
+        """Bulk load the reference objects used by the Nautobot DiffSync models into the reference cache."""
+        self.ref_cache.clear()
+        for model in [Status, Role, LocationType, Manufacturer, Platform, Tenant, Namespace]:
+            self.ref_cache.warm(queryset=model.objects.all())
+        self.ref_cache.warm(
+            queryset=DeviceType.objects.filter(manufacturer__name="Citrix"), fields=("model", "manufacturer")
+        )
+        self.ref_cache.warm(queryset=Location.objects.filter(location_type__name="Site"))
+        self.ref_cache.warm(
+            queryset=Location.objects.filter(location_type__name="Region"), fields=("name", "location_type")
+        )
+        if LIFECYCLE_MGMT:
+            self.software_registry.warm(platform_name="citrix.adc")
+
+    def side_effect_containers(self) -> list:
+        """Collect the maps, queues and caches the DiffSync models record their side effects in besides the database.
+
+        Returns:
+            list: Journaled maps, the reference cache, and dicts and lists that entries are added to during a create,
+                update, or delete.
+        """
+        return [
+            self.prefix_map,
+            self.address_map,
+            self.port_map,
+            self.tags_to_assign,
+            self.tags_to_clear,
+            self.primary_ips,
+            self.software_assignments,
+            self.software_registry.versions,
+            self.ref_cache,
+            self.objects_to_create,
+            *self.objects_to_create.values(),
+            self.objects_to_delete,
+            *self.objects_to_delete.values(),
+        ]
+
+    @property
+    def scoped(self) -> bool:
+        """Whether only the subtree of a Device or Site is loaded."""
+        return bool(self.device_filter)
+
+    def scope_filter(self, path: str = "") -> dict:
+        """Build the lookups limiting a queryset to the objects of the Devices in scope.
+
+        Args:
+            path (str, optional): Lookup path from the queried model to the Device, ie `device__`. Defaults to "".
+
+        Returns:
+            dict: Keyword arguments for `filter()`, empty when all Devices are loaded.
+        """
+        return {f"{path}{key}": value for key, value in self.device_filter.items()}
 
     def load_sites(self):
         """Load Sites from Nautobot into DiffSync models."""
         site_loctype = LocationType.objects.get(name="Site")
-        for site in Location.objects.filter(location_type=site_loctype):
+        for site in Location.objects.filter(location_type=site_loctype).select_related("parent"):
             if self.job.debug:
-                self.job.logger.info(f"Loading Site {site.name} from Nautobot.")
-            new_dc = self.datacenter(
+                self.job.logger.info("Loading Site %s from Nautobot.", site.name)
+            new_dc = self.new_model(
+                self.datacenter,
                 name=site.name,
                 region=site.parent.name if site.parent else "",
                 latitude=float(round(site.latitude, 6)) if site.latitude else None,
                 longitude=float(round(site.longitude, 6)) if site.longitude else None,
                 uuid=site.id,
             )
+            if self.scoped:
+                new_dc.model_flags = DiffSyncModelFlags.SKIP_UNMATCHED_DST
             self.add(new_dc)
 
-    def load_devices(self):
-        """Load Devices from Nautobot into DiffSync models."""
+    def get_devices(self) -> QuerySet:
+        """Build the queryset of the Devices loaded from Nautobot.
+
+        Returns:
+            QuerySet: Devices of the Tenant, or with Citrix ADM as System of Record, limited to the Devices in scope.
+        """
+        devices = OrmDevice.objects.select_related("device_type", "location", "role", "status", "tenant")
         if self.tenant:
-            devices = OrmDevice.objects.select_related("device_type", "location", "status").filter(tenant=self.tenant)
+            devices = devices.filter(tenant=self.tenant)
         else:
-            devices = OrmDevice.objects.select_related("device_type", "location", "status").filter(
-                _custom_field_data__system_of_record="Citrix ADM"
-            )
+            devices = devices.filter(_custom_field_data__system_of_record="Citrix ADM")
+        return devices.filter(**self.scope_filter())
+
+    def load_devices(self):
+        """Load Devices from Nautobot into DiffSync models."""
+        devices = self.get_devices()
+        software_versions = (
+            nautobot.get_software_versions(devices=devices if self.scoped else None) if LIFECYCLE_MGMT else {}
+        )
         for dev in devices:
             if self.job.debug:
-                self.job.logger.info(f"Loading Device {dev.name} from Nautobot.")
+                self.job.logger.info("Loading Device %s from Nautobot.", dev.name)
             version = dev._custom_field_data["os_version"]
             hanode = dev._custom_field_data.get("ha_node")
             if LIFECYCLE_MGMT:
-                try:
-                    software_relation = Relationship.objects.get(label="Software on Device")
-                    relationship = RelationshipAssociation.objects.get(
-                        relationship=software_relation, destination_id=dev.id
-                    )
-                    version = relationship.source.version
-                except RelationshipAssociation.DoesNotExist:
-                    self.job.logger.info(f"Unable to find DLC Software version for {dev.name}.")
+                if dev.id in software_versions:
+                    version = software_versions[dev.id]
+                else:
+                    self.job.logger.info("Unable to find DLC Software version for %s.", dev.name)
                     version = ""
-            new_dev = self.device(
+            new_dev = self.new_model(
+                self.device,
                 name=dev.name,
                 model=dev.device_type.model,
                 role=dev.role.name,
@@ -109,18 +225,29 @@ class NautobotAdapter(DiffSync):
                 new_dev.model_flags = DiffSyncModelFlags.SKIP_UNMATCHED_DST
             self.add(new_dev)
 
-    def load_ports(self):
-        """Load Interfaces from Nautobot into DiffSync models."""
+    def get_interfaces(self) -> QuerySet:
+        """Build the queryset of the Interfaces loaded from Nautobot.
+
+        Interfaces are selected through their Device so the System of Record index of Devices is used.
+
+        Returns:
+            QuerySet: Interfaces of the Devices that are loaded.
+        """
         if self.tenant:
             interfaces = Interface.objects.select_related("device", "status").filter(device__tenant=self.tenant)
         else:
             interfaces = Interface.objects.select_related("device", "status").filter(
                 device___custom_field_data__system_of_record="Citrix ADM"
             )
-        for intf in interfaces:
+        return interfaces.filter(**self.scope_filter("device__"))
+
+    def load_ports(self):
+        """Load Interfaces from Nautobot into DiffSync models."""
+        for intf in self.get_interfaces():
             try:
                 dev = self.get(self.device, intf.device.name)
-                new_intf = self.port(
+                new_intf = self.new_model(
+                    self.port,
                     name=intf.name,
                     device=intf.device.name,
                     status=intf.status.name,
@@ -131,82 +258,473 @@ class NautobotAdapter(DiffSync):
                     new_intf.model_flags = DiffSyncModelFlags.SKIP_UNMATCHED_DST
                 self.add(new_intf)
                 dev.add_child(new_intf)
+                self.port_map[(intf.device.name, intf.name)] = intf
             except ObjectNotFound:
                 self.job.logger.warning(
-                    f"Unable to find {intf.device.name} loaded so skipping loading port {intf.name}."
+                    "Unable to find %s loaded so skipping loading port %s.", intf.device.name, intf.name
                 )
 
-    def load_prefixes(self):
-        """Load Prefixes from Nautobot into DiffSync models."""
+    def get_prefixes(self) -> QuerySet:
+        """Build the queryset of the Prefixes loaded from Nautobot.
+
+        Returns:
+            QuerySet: Prefixes of the Tenant, or with Citrix ADM as System of Record, limited to the Devices in scope.
+        """
+        prefixes = Prefix.objects.select_related("namespace", "tenant")
         if self.tenant:
-            prefixes = Prefix.objects.filter(tenant=self.tenant)
+            prefixes = prefixes.filter(tenant=self.tenant)
         else:
-            prefixes = Prefix.objects.filter(_custom_field_data__system_of_record="Citrix ADM")
-        for pf in prefixes:
-            new_pf = self.prefix(
+            prefixes = prefixes.filter(_custom_field_data__system_of_record="Citrix ADM")
+        if self.scoped:
+            prefixes = prefixes.filter(
+                Q(**self.scope_filter("ip_addresses__interface_assignments__interface__device__"))
+                | Q(network__in=self.scope_networks)
+            ).distinct()
+        return prefixes
+
+    def load_prefixes(self):
+        """Load Prefixes from Nautobot into DiffSync models."""
+        for pf in self.get_prefixes():
+            new_pf = self.new_model(
+                self.prefix,
                 prefix=str(pf.prefix),
                 namespace=pf.namespace.name,
                 tenant=pf.tenant.name if pf.tenant else None,
                 uuid=pf.id,
             )
-            if self.tenant:
+            if self.tenant or self.scoped:
                 new_pf.model_flags = DiffSyncModelFlags.SKIP_UNMATCHED_DST
             self.add(new_pf)
 
-    def load_addresses(self):
-        """Load IP Addresses from Nautobot into DiffSync models."""
+    def get_addresses(self) -> QuerySet:
+        """Build the queryset of the IP Addresses loaded from Nautobot.
+
+        Returns:
+            QuerySet: IP Addresses of the Tenant, or with Citrix ADM as System of Record, limited to the Devices in scope.
+        """
+        addresses = IPAddress.objects.select_related("parent", "tenant").prefetch_related(
+            "tags",
+            "primary_ip4_for",
+            "primary_ip6_for",
+            Prefetch(
+                "interface_assignments",
+                queryset=IPAddressToInterface.objects.select_related("interface__device").filter(
+                    **self.scope_filter("interface__device__")
+                ),
+            ),
+        )
         if self.tenant:
-            addresses = IPAddress.objects.filter(tenant=self.tenant)
+            addresses = addresses.filter(tenant=self.tenant)
         else:
-            addresses = IPAddress.objects.filter(_custom_field_data__system_of_record="Citrix ADM")
-        for addr in addresses:
-            new_ip = self.address(
+            addresses = addresses.filter(_custom_field_data__system_of_record="Citrix ADM")
+        if self.scoped:
+            addresses = addresses.filter(
+                Q(**self.scope_filter("interface_assignments__interface__device__")) | Q(host__in=self.scope_hosts)
+            ).distinct()
+        return addresses
+
+    def load_addresses(self):
+        """Load IP Addresses from Nautobot into DiffSync models."""
+        for addr in self.get_addresses():
+            new_ip = self.new_model(
+                self.address,
                 address=str(addr.address),
                 prefix=str(addr.parent.prefix),
                 tenant=addr.tenant.name if addr.tenant else None,
                 uuid=addr.id,
                 tags=nautobot.get_tag_strings(addr.tags),
             )
-            if self.tenant:
+            if self.tenant or self.scoped:
                 new_ip.model_flags = DiffSyncModelFlags.SKIP_UNMATCHED_DST
             self.add(new_ip)
-            for mapping in IPAddressToInterface.objects.filter(ip_address=addr):
-                new_mapping = self.ip_on_intf(
+            self.address_map[str(addr.address)] = addr
+            primary = len(addr.primary_ip4_for.all()) > 0 or len(addr.primary_ip6_for.all()) > 0
+            for mapping in addr.interface_assignments.all():
+                new_mapping = self.new_model(
+                    self.ip_on_intf,
                     address=str(addr.address),
                     device=mapping.interface.device.name,
                     port=mapping.interface.name,
-                    primary=len(addr.primary_ip4_for.all()) > 0 or len(addr.primary_ip6_for.all()) > 0,
+                    primary=primary,
                     uuid=mapping.id,
                 )
                 if self.tenant:
                     new_mapping.model_flags = DiffSyncModelFlags.SKIP_UNMATCHED_DST
                 self.add(new_mapping)
 
+    def validate_objects(self, objs: List, unique_fields: Tuple[str, ...] = ()) -> List:
+        """Validate all objects in a batch prior to them being bulk created.
+
+        Uniqueness and foreign keys aren't validated per object as that costs queries per object. Instead objects
+        matching an existing or earlier queued object on `unique_fields` are dropped after a single query. Foreign keys
+        point at cached reference objects or objects created earlier in the same bulk import, and objects depending on
+        one that failed validation are dropped by `bulk_create_objects()`.
+
+        Args:
+            objs (List): List of unsaved Django model instances of the same model to be validated.
+            unique_fields (Tuple[str, ...], optional): Attribute names of a unique constraint of the model.
+
+        Returns:
+            List: Objects that passed validation. Objects that failed are logged and dropped.
+        """
+        seen = set()
+        if objs and unique_fields:
+            seen = set(
+                objs[0]
+                ._meta.model.objects.filter(
+                    **{f"{field}__in": {getattr(obj, field) for obj in objs} for field in unique_fields}
+                )
+                .values_list(*unique_fields)
+            )
+        valid_objs = []
+        for obj in objs:
+            try:
+                obj.full_clean(
+                    exclude=[field.name for field in obj._meta.fields if field.is_relation], validate_unique=False
+                )
+                if unique_fields:
+                    key = tuple(getattr(obj, field) for field in unique_fields)
+                    if key in seen:
+                        raise ValidationError(f"{obj._meta.verbose_name} with these values already exists.")
+                    seen.add(key)
+                valid_objs.append(obj)
+            except ValidationError as err:
+                self.job.logger.warning("Unable to create %s %s: %s", obj._meta.verbose_name, obj, err)
+        return valid_objs
+
+    @staticmethod
+    def find_supernet(namespace_id: UUID, network: str, max_length: int, networks: dict) -> Optional[UUID]:
+        """Find the most specific Prefix containing a network.
+
+        Args:
+            namespace_id (UUID): Namespace of the network.
+            network (str): Network or host address.
+            max_length (int): Longest prefix length to consider.
+            networks (dict): ID of each Prefix keyed by namespace ID, network address and prefix length.
+
+        Returns:
+            Optional[UUID]: ID of the most specific Prefix containing the network, None when there isn't one.
+        """
+        for length in range(max_length, -1, -1):
+            key = (namespace_id, str(netaddr.IPNetwork(f"{network}/{length}").network), length)
+            if key in networks:
+                return networks[key]
+        return None
+
+    def bulk_create_prefixes(self, batch_size: int) -> Set[UUID]:
+        """Assign parents to queued Prefixes, bulk create them, and then reparent existing children to them.
+
+        The existing supernets and children are looked up with a query per model for all Prefixes and children are
+        reparented with an update per new Prefix that has any.
+
+        Args:
+            batch_size (int): Number of objects to insert per query.
+
+        Returns:
+            Set[UUID]: IDs of the queued Prefixes that failed validation.
+        """
+        queued = self.objects_to_create["prefixes"]
+        prefixes = self.validate_objects(
+            sorted(queued, key=attrgetter("prefix_length")), unique_fields=("namespace_id", "network", "prefix_length")
+        )
+        failed = {pf.id for pf in queued} - {pf.id for pf in prefixes}
+        if not prefixes:
+            return failed
+        namespaces = {pf.namespace_id for pf in prefixes}
+        networks, existing_namespaces = {}, {}
+        for pk, namespace_id, network, length in Prefix.objects.filter(
+            namespace_id__in=namespaces, prefix_length__lt=max(pf.prefix_length for pf in prefixes)
+        ).values_list("id", "namespace_id", "network", "prefix_length"):
+            networks[(namespace_id, network, length)] = pk
+            existing_namespaces[pk] = namespace_id
+        old_parents, new_networks = {}, {}
+        for pf in prefixes:
+            old_parents[pf.id] = self.find_supernet(pf.namespace_id, pf.network, pf.prefix_length - 1, networks)
+            pf.parent_id = self.find_supernet(
+                pf.namespace_id, pf.network, pf.prefix_length - 1, {**networks, **new_networks}
+            )
+            new_networks[(pf.namespace_id, str(pf.network), pf.prefix_length)] = pf.id
+        Prefix.objects.bulk_create(prefixes, batch_size=batch_size)
+
+        parent_ids = {parent_id for parent_id in old_parents.values() if parent_id}
+        reparented = {Prefix: defaultdict(list), IPAddress: defaultdict(list)}
+        for pk, namespace_id, network, length, parent_id in (
+            Prefix.objects.filter(namespace_id__in=namespaces)
+            .filter(Q(parent_id__in=parent_ids) | Q(parent__isnull=True))
+            .exclude(id__in=[pf.id for pf in prefixes])
+            .values_list("id", "namespace_id", "network", "prefix_length", "parent_id")
+        ):
+            new_parent = self.find_supernet(namespace_id, network, length - 1, new_networks)
+            if new_parent and old_parents[new_parent] == parent_id:
+                reparented[Prefix][new_parent].append(pk)
+        for pk, host, parent_id in IPAddress.objects.filter(parent_id__in=parent_ids).values_list(
+            "id", "host", "parent_id"
+        ):
+            length = 32 if netaddr.IPAddress(host).version == 4 else 128
+            new_parent = self.find_supernet(existing_namespaces[parent_id], host, length, new_networks)
+            if new_parent and old_parents[new_parent] == parent_id:
+                reparented[IPAddress][new_parent].append(pk)
+        for model, children in reparented.items():
+            for parent_id, ids in children.items():
+                model.objects.filter(id__in=ids).update(parent_id=parent_id)
+        self.job.logger.info("Bulk created %s Prefixes.", len(prefixes))
+        return failed
+
+    def bulk_create_objects(self):
+        """Validate and bulk create all objects queued while in bulk import mode.
+
+        Objects are created in dependency order: Prefixes, IP Addresses, Interfaces, and then IP Address to Interface
+        mappings. Queued objects depending on an object that failed validation, such as the IP Addresses of a Prefix or
+        the mappings of an IP Address or Interface, are dropped along with the Tags and primary IPs queued for them.
+        """
+        batch_size = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("bulk_batch_size", 1000)
+        failed = self.bulk_create_prefixes(batch_size=batch_size)
+        for grouping, model, unique_fields in [
+            ("addresses", IPAddress, ("parent_id", "host")),
+            ("ports", Interface, ("device_id", "name")),
+            ("mappings", IPAddressToInterface, ("ip_address_id", "interface_id")),
+        ]:
+            queued = [
+                obj
+                for obj in self.objects_to_create[grouping]
+                if not any(getattr(obj, attr) in failed for attr in unique_fields if attr.endswith("_id"))
+            ]
+            skipped = len(self.objects_to_create[grouping]) - len(queued)
+            if skipped:
+                self.job.logger.warning(
+                    "Skipping %s %s depending on objects that failed validation.",
+                    skipped,
+                    model._meta.verbose_name_plural,
+                )
+            objs = self.validate_objects(queued, unique_fields=unique_fields)
+            failed |= {obj.id for obj in self.objects_to_create[grouping]} - {obj.id for obj in objs}
+            model.objects.bulk_create(objs, batch_size=batch_size)
+            self.job.logger.info("Bulk created %s %s.", len(objs), model._meta.verbose_name_plural)
+        self.tags_to_assign = [(addr, tags) for addr, tags in self.tags_to_assign if addr.id not in failed]
+        self.primary_ips = [mapping for mapping in self.primary_ips if mapping.id not in failed]
+        self.objects_to_create = defaultdict(list)
+
+    def assign_tags(self):
+        """Assign the Tags collected during the sync through the TaggedItem table and report the queries saved.
+
+        IP Addresses whose Tags were updated have their existing TaggedItems removed first so the result matches `tags.set()`.
+        """
+        if not self.tags_to_assign:
+            return
+        batch_size = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("bulk_batch_size", 1000)
+        with nautobot.QueryCounter() as counter:
+            if self.tags_to_clear:
+                TaggedItem.objects.filter(
+                    content_type=ContentType.objects.get_for_model(IPAddress), object_id__in=self.tags_to_clear
+                ).delete()
+            nautobot.bulk_add_tags(self.tags_to_assign, batch_size=batch_size)
+        # Assigning per IP Address takes at least a `tags.set()` plus a Tag lookup and content type add per Tag.
+        per_address = sum(1 + 2 * len(tags) for _, tags in self.tags_to_assign)
+        self.job.logger.info(
+            "Assigned Tags to %s IP Addresses with %s queries, saving at least %s queries.",
+            len(self.tags_to_assign),
+            counter.count,
+            per_address - counter.count,
+        )
+        self.tags_to_assign = []
+        self.tags_to_clear = []
+
+    def assign_primary_ips(self):
+        """Assign the primary IPs collected during the sync with a bulk update per IP version.
+
+        When a Device has multiple primary mappings for the same IP version the last one wins, matching
+        the previous behavior of saving the Device for each mapping.
+        """
+        batch_size = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("bulk_batch_size", 1000)
+        devices = {4: {}, 6: {}}
+        for mapping in self.primary_ips:
+            ip_version = mapping.ip_address.ip_version
+            device = devices[ip_version].get(mapping.interface.device_id, mapping.interface.device)
+            setattr(device, f"primary_ip{ip_version}", mapping.ip_address)
+            devices[ip_version][device.id] = device
+        for ip_version, devs in devices.items():
+            if devs:
+                OrmDevice.objects.bulk_update(devs.values(), [f"primary_ip{ip_version}"], batch_size=batch_size)
+                self.job.logger.info("Assigned primary IPv%s addresses to %s Devices.", ip_version, len(devs))
+        self.primary_ips = []
+
+    def queue_unmatched_deletes(self, prefixes: Set[Tuple[str, str]], addresses: Set[str]) -> dict:
+        """Queue the Prefixes and IP Addresses with Citrix ADM as System of Record that no window synced for deletion.
+
+        A scoped load never deletes unmatched Prefixes and IP Addresses as they may belong to Devices of other windows,
+        so a windowed sync ends with this pass to delete the same objects a full sync would. Like a full sync, nothing
+        is deleted when the objects are loaded by Tenant.
+
+        Args:
+            prefixes (Set[Tuple[str, str]]): Prefix and Namespace name of each Prefix loaded from Citrix ADM.
+            addresses (Set[str]): Each IP Address loaded from Citrix ADM.
+
+        Returns:
+            dict: Serialized diff of the queued deletions in the same structure as `Diff.dict()`.
+        """
+        diff = {}
+        if self.tenant:
+            return diff
+        for addr in IPAddress.objects.filter(_custom_field_data__system_of_record="Citrix ADM").select_related(
+            "parent"
+        ):
+            if str(addr.address) not in addresses:
+                self.objects_to_delete["addresses"].append(addr)
+                diff.setdefault("address", {})[f"{addr.address}__{addr.parent.prefix}"] = {"-": {}}
+        for pf in Prefix.objects.filter(_custom_field_data__system_of_record="Citrix ADM").select_related("namespace"):
+            if (str(pf.prefix), pf.namespace.name) not in prefixes:
+                self.objects_to_delete["prefixes"].append(pf)
+                diff.setdefault("prefix", {})[f"{pf.prefix}__{pf.namespace.name}"] = {"-": {}}
+        return diff
+
+    def delete_chunk(self, objs: List[Model]) -> Tuple[int, int]:
+        """Delete a chunk of objects of the same model with a single QuerySet delete.
+
+        If any object in the chunk is protected, the chunk is bisected until only the protected objects are left
+        and skipped. Single objects are deleted with their own `delete()` so model specific handling, such as a
+        Prefix reparenting its children, still applies.
+
+        Args:
+            objs (List[Model]): Objects of the same model to be deleted.
+
+        Returns:
+            Tuple[int, int]: Number of objects deleted and number of protected objects skipped.
+        """
+        if len(objs) == 1:
+            try:
+                objs[0].delete()
+                return 1, 0
+            except ProtectedError:
+                self.job.logger.info("Deletion failed protected object: %s", objs[0])
+                return 0, 1
+        model = objs[0]._meta.model
+        try:
+            _, deleted = model.objects.filter(pk__in=[obj.pk for obj in objs]).delete()
+            return deleted.get(model._meta.label, 0), 0
+        except ProtectedError:
+            middle = len(objs) // 2
+            first_deleted, first_protected = self.delete_chunk(objs[:middle])
+            second_deleted, second_protected = self.delete_chunk(objs[middle:])
+            return first_deleted + second_deleted, first_protected + second_protected
+
+    def delete_objects(self, grouping: str):
+        """Delete queued objects for a grouping in chunks per model and report the totals.
+
+        Args:
+            grouping (str): Name of the grouping in `objects_to_delete` to be deleted.
+        """
+        batch_size = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("bulk_batch_size", 1000)
+        objs_by_model = defaultdict(list)
+        for nautobot_obj in self.objects_to_delete[grouping]:
+            objs_by_model[nautobot_obj._meta.model].append(nautobot_obj)
+        total_deleted, total_protected = 0, 0
+        for model, objs in objs_by_model.items():
+            for start in range(0, len(objs), batch_size):
+                end = start + batch_size
+                chunk = objs[start:end]
+                if self.job.debug:
+                    self.job.logger.info("Deleting %s %s.", len(chunk), model._meta.verbose_name_plural)
+                deleted, protected = self.delete_chunk(chunk)
+                total_deleted += deleted
+                total_protected += protected
+        if self.objects_to_delete[grouping]:
+            self.job.logger.info(
+                "Deleted %s %s, skipped %s protected %s.", total_deleted, grouping, total_protected, grouping
+            )
+        self.objects_to_delete[grouping] = []
+
     def sync_complete(self, source: DiffSync, diff, *args, **kwargs):
         """Label and clean up function for DiffSync sync.
 
-        Once the sync is complete, this function labels all imported objects and then
-        deletes any objects from Nautobot that need to be deleted in a specific order.
+        Once the sync is complete, this function creates any objects queued in bulk import mode, assigns the
+        collected Tags, primary IPs and software versions, labels all imported objects and then deletes any objects
+        from Nautobot that need to be deleted in a specific order.
 
         Args:
             source: The DiffSync whose data was used to update this instance.
             diff: The Diff calculated prior to the sync operation.
         """
-        for grouping in ["addresses", "prefixes", "ports", "devices"]:
-            for nautobot_obj in self.objects_to_delete[grouping]:
-                try:
-                    if self.job.debug:
-                        self.job.logger.info(f"Deleting {nautobot_obj}.")
-                    nautobot_obj.delete()
-                except ProtectedError:
-                    self.job.logger.info(f"Deletion failed protected object: {nautobot_obj}")
-            self.objects_to_delete[grouping] = []
+        with self.profiler.phase("Nautobot: sync_complete"):
+            self._sync_complete()
         return super().sync_complete(source, diff, *args, **kwargs)
 
+    def _sync_complete(self):
+        """Apply the queued bulk operations and deletions at the end of the sync."""
+        if self.bulk_import:
+            self.bulk_create_objects()
+        self.assign_tags()
+        self.assign_primary_ips()
+        if LIFECYCLE_MGMT:
+            nautobot.reconcile_software_relationships(
+                diffsync=self,
+                assignments=self.software_assignments,
+                batch_size=settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("bulk_batch_size", 1000),
+            )
+            self.software_assignments = nautobot.JournaledDict()
+        for grouping in ["addresses", "prefixes", "ports", "devices"]:
+            self.delete_objects(grouping)
+        self.job.logger.info("Reference cache hits: %s, misses: %s.", self.ref_cache.hits, self.ref_cache.misses)
+
+    def diff_from(self, source: DiffSync, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Calculate the diff from the source adapter, skipping Device subtrees whose content hashes match.
+
+        Objects in an unchanged subtree are flagged to be ignored for the duration of the diff and then restored.
+
+        Args:
+            source (DiffSync): The DiffSync whose data is compared to this instance.
+        """
+        with self.profiler.phase("Nautobot: diff"):
+            return self._diff_from(source, *args, **kwargs)
+
+    def _diff_from(self, source: DiffSync, *args, **kwargs):
+        """Calculate the diff, flagging unchanged Device subtrees to be ignored."""
+        source_hashes = getattr(source, "device_hashes", {})
+        if not settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("device_hash_diff", True) or not source_hashes:
+            return super().diff_from(source, *args, **kwargs)
+        ignored = {}
+        unchanged = [uid for uid, digest in self.device_hashes.items() if source_hashes.get(uid) == digest]
+        for uid in unchanged:
+            for obj in self.device_subtrees[uid]:
+                ignored.setdefault(id(obj), (obj, obj.model_flags))
+                obj.model_flags |= DiffSyncModelFlags.IGNORE
+        self.job.logger.info(
+            "Skipping diff of %s unchanged Devices out of %s.", len(unchanged), len(self.device_hashes)
+        )
+        try:
+            return super().diff_from(source, *args, **kwargs)
+        finally:
+            for obj, model_flags in ignored.values():
+                obj.model_flags = model_flags
+
+    def sync_from(self, source: DiffSync, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Warm the reference cache before synchronizing data from the source adapter into Nautobot.
+
+        When transactional sync is enabled the changes are applied in transaction chunks. A failure that isn't
+        contained to a single object rolls back the chunk in progress.
+
+        Args:
+            source (DiffSync): The DiffSync whose data is used to update this instance.
+        """
+        with self.profiler.phase("Nautobot: sync"):
+            return self._sync_from(source, *args, **kwargs)
+
+    def _sync_from(self, source: DiffSync, *args, **kwargs):
+        """Synchronize the data, in transaction chunks when transactional sync is enabled."""
+        self.warm_ref_cache()
+        if not self.chunker:
+            return super().sync_from(source, *args, **kwargs)
+        self.chunker.begin()
+        try:
+            result = super().sync_from(source, *args, **kwargs)
+        except Exception as err:
+            self.chunker.rollback(err)
+            raise
+        self.chunker.commit()
+        return result
+
     def load(self):
         """Load data from Nautobot into DiffSync models."""
-        self.load_sites()
-        self.load_devices()
-        self.load_ports()
-        self.load_prefixes()
-        self.load_addresses()
+        for grouping in ["sites", "devices", "ports", "prefixes", "addresses"]:
+            with self.profiler.phase(f"Nautobot: load {grouping}"):
+                getattr(self, f"load_{grouping}")()
+        self.compute_device_hashes()
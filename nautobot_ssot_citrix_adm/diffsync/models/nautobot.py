@@ -5,7 +5,7 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from nautobot.dcim.models import Device as NewDevice
 from nautobot.dcim.models import DeviceType, Location, LocationType, Manufacturer, Interface, Platform
-from nautobot.extras.models import Role, Status, Tag
+from nautobot.extras.models import Role, Status
 from nautobot.ipam.models import IPAddress, IPAddressToInterface, Namespace, Prefix
 from nautobot.tenancy.models import Tenant
 from nautobot_ssot_citrix_adm.diffsync.models.base import (
@@ -16,7 +16,7 @@ from nautobot_ssot_citrix_adm.diffsync.models.base import (
     Address,
     IPAddressOnInterface,
 )
-from nautobot_ssot_citrix_adm.utils.nautobot import add_software_lcm, assign_version_to_device
+from nautobot_ssot_citrix_adm.utils.nautobot import chunked_operation
 
 try:
     import nautobot_device_lifecycle_mgmt  # noqa: F401
@@ -30,15 +30,17 @@ class NautobotDatacenter(Datacenter):
     """Nautobot implementation of Citrix ADM Datacenter model."""
 
     @classmethod
+    @chunked_operation
     def create(cls, diffsync, ids, attrs):
         """Create Site in Nautobot from NautobotDatacenter object."""
-        status_active = Status.objects.get(name="Active")
-        global_region = Location.objects.get_or_create(
-            name="Global", location_type=LocationType.objects.get(name="Region"), status=status_active
+        status_active = diffsync.ref_cache.get(Status, name="Active")
+        region_loctype = diffsync.ref_cache.get(LocationType, name="Region")
+        global_region = diffsync.ref_cache.get_or_create(
+            Location, name="Global", location_type=region_loctype, defaults={"status": status_active}
         )[0]
-        site_loctype = LocationType.objects.get(name="Site")
+        site_loctype = diffsync.ref_cache.get(LocationType, name="Site")
         if Location.objects.filter(name=ids["name"]).exists():
-            diffsync.job.logger.warning(f"Site {ids['name']} already exists so skipping creation.")
+            diffsync.job.logger.warning("Site %s already exists so skipping creation.", ids["name"])
             return None
         new_site = Location(
             name=ids["name"],
@@ -49,16 +51,18 @@ class NautobotDatacenter(Datacenter):
             location_type=site_loctype,
         )
         if ids.get("region"):
-            new_site.parent = Location.objects.get_or_create(
-                name=ids["region"], location_type=LocationType.objects.get(name="Region"), status=status_active
+            new_site.parent = diffsync.ref_cache.get_or_create(
+                Location, name=ids["region"], location_type=region_loctype, defaults={"status": status_active}
             )[0]
         new_site.validated_save()
+        diffsync.ref_cache.add(new_site, name=ids["name"])
         return super().create(diffsync=diffsync, ids=ids, attrs=attrs)
 
+    @chunked_operation
     def update(self, attrs):
         """Update Site in Nautobot from NautobotDatacenter object."""
         if not settings.PLUGINS_CONFIG.get("nautobot_ssot_citrix_adm").get("update_sites"):
-            self.diffsync.job.logger.warning(f"Update sites setting is disabled so skipping updating {self.name}.")
+            self.diffsync.job.logger.warning("Update sites setting is disabled so skipping updating %s.", self.name)
             return None
         site = Location.objects.get(id=self.uuid)
         if "latitude" in attrs:
@@ -73,74 +77,80 @@ class NautobotDevice(Device):
     """Nautobot implementation of Citrix ADM Device model."""
 
     @classmethod
+    @chunked_operation
     def create(cls, diffsync, ids, attrs):
         """Create Device in Nautobot from NautobotDevice object."""
-        lb_role, created = Role.objects.get_or_create(name=attrs["role"])
+        lb_role, created = diffsync.ref_cache.get_or_create(Role, name=attrs["role"])
         if created:
             lb_role.content_types.add(ContentType.objects.get_for_model(NewDevice))
-        lb_dt, _ = DeviceType.objects.get_or_create(
-            model=attrs["model"], manufacturer=Manufacturer.objects.get(name="Citrix")
+        lb_dt, _ = diffsync.ref_cache.get_or_create(
+            DeviceType, model=attrs["model"], manufacturer=diffsync.ref_cache.get(Manufacturer, name="Citrix")
         )
         new_device = NewDevice(
             name=ids["name"],
-            status=Status.objects.get(name=attrs["status"]),
+            status=diffsync.ref_cache.get(Status, name=attrs["status"]),
             role=lb_role,
-            location=Location.objects.get(name=attrs["site"]),
+            location=diffsync.ref_cache.get(Location, name=attrs["site"]),
             device_type=lb_dt,
             serial=attrs["serial"],
-            platform=Platform.objects.get(name="citrix.adc"),
+            platform=diffsync.ref_cache.get(Platform, name="citrix.adc"),
         )
         if attrs.get("tenant"):
-            new_device.tenant = Tenant.objects.update_or_create(name=attrs["tenant"])[0]
+            new_device.tenant = diffsync.ref_cache.get_or_create(Tenant, name=attrs["tenant"])[0]
         if attrs.get("version"):
             new_device.custom_field_data.update({"os_version": attrs["version"]})
-            if LIFECYCLE_MGMT:
-                lcm_obj = add_software_lcm(diffsync=diffsync, platform_name="citrix.adc", version=attrs["version"])
-                assign_version_to_device(diffsync=diffsync, device=new_device, software_lcm=lcm_obj)
         if attrs.get("hanode"):
             new_device.custom_field_data["ha_node"] = attrs["hanode"]
         new_device.custom_field_data["system_of_record"] = "Citrix ADM"
         new_device.custom_field_data["ssot_last_synchronized"] = datetime.today().date().isoformat()
         new_device.validated_save()
+        if attrs.get("version") and LIFECYCLE_MGMT:
+            diffsync.software_assignments[new_device.id] = diffsync.software_registry.get_or_create(
+                platform_name="citrix.adc", version=attrs["version"]
+            )
         return super().create(diffsync=diffsync, ids=ids, attrs=attrs)
 
+    @chunked_operation
     def update(self, attrs):
         """Update Device in Nautobot from NautobotDevice object."""
+        ref_cache = self.diffsync.ref_cache
         device = NewDevice.objects.get(id=self.uuid)
         if "model" in attrs:
-            device.device_type, _ = DeviceType.objects.get_or_create(
-                model=attrs["model"], manufacturer=Manufacturer.objects.get(name="Citrix")
+            device.device_type, _ = ref_cache.get_or_create(
+                DeviceType, model=attrs["model"], manufacturer=ref_cache.get(Manufacturer, name="Citrix")
             )
         if "status" in attrs:
-            device.status = Status.objects.get(name=attrs["status"])
+            device.status = ref_cache.get(Status, name=attrs["status"])
         if "role" in attrs:
-            device.role = Role.objects.get_or_create(name=attrs["role"])[0]
+            device.role = ref_cache.get_or_create(Role, name=attrs["role"])[0]
         if "serial" in attrs:
             device.serial = attrs["serial"]
         if "site" in attrs:
-            device.location = Location.objects.get(name=attrs["site"])
+            device.location = ref_cache.get(Location, name=attrs["site"])
         if "tenant" in attrs:
             if attrs.get("tenant"):
-                device.tenant = Tenant.objects.update_or_create(name=attrs["tenant"])[0]
+                device.tenant = ref_cache.get_or_create(Tenant, name=attrs["tenant"])[0]
             else:
                 device.tenant = None
         if "version" in attrs:
             device.custom_field_data.update({"os_version": attrs["version"]})
-            if LIFECYCLE_MGMT:
-                lcm_obj = add_software_lcm(diffsync=self.diffsync, platform_name="citrix.adc", version=attrs["version"])
-                assign_version_to_device(diffsync=self.diffsync, device=device, software_lcm=lcm_obj)
         if "hanode" in attrs:
             device.custom_field_data["ha_node"] = attrs["hanode"]
         device.custom_field_data["system_of_record"] = "Citrix ADM"
         device.custom_field_data["ssot_last_synchronized"] = datetime.today().date().isoformat()
         device.validated_save()
+        if "version" in attrs and LIFECYCLE_MGMT:
+            self.diffsync.software_assignments[device.id] = self.diffsync.software_registry.get_or_create(
+                platform_name="citrix.adc", version=attrs["version"]
+            )
         return super().update(attrs)
 
+    @chunked_operation
     def delete(self):
         """Delete Device in Nautobot from NautobotDevice object."""
         dev = NewDevice.objects.get(id=self.uuid)
         super().delete()
-        self.diffsync.job.logger.info(f"Deleting Device {dev.name}.")
+        self.diffsync.job.logger.info("Deleting Device %s.", dev.name)
         self.diffsync.objects_to_delete["devices"].append(dev)
         return self
 
@@ -149,26 +159,32 @@ class NautobotPort(Port):
     """Nautobot implementation of Citrix ADM Port model."""
 
     @classmethod
+    @chunked_operation
     def create(cls, diffsync, ids, attrs):
         """Create Interface in Nautobot from NautobotPort object."""
         new_port = Interface(
             name=ids["name"],
             device=NewDevice.objects.get(name=ids["device"]),
-            status=Status.objects.get(name=attrs["status"]),
+            status=diffsync.ref_cache.get(Status, name=attrs["status"]),
             description=attrs["description"],
             type="virtual",
             mgmt_only=bool(ids["name"] == "Management"),
         )
         new_port.custom_field_data["system_of_record"] = "Citrix ADM"
         new_port.custom_field_data["ssot_last_synchronized"] = datetime.today().date().isoformat()
-        new_port.validated_save()
+        if diffsync.bulk_import:
+            diffsync.objects_to_create["ports"].append(new_port)
+        else:
+            new_port.validated_save()
+        diffsync.port_map[(ids["device"], ids["name"])] = new_port
         return super().create(diffsync=diffsync, ids=ids, attrs=attrs)
 
+    @chunked_operation
     def update(self, attrs):
         """Update Interface in Nautobot from NautobotPort object."""
         port = Interface.objects.get(self.uuid)
         if "status" in attrs:
-            port.status = Status.objects.get(name=attrs["status"])
+            port.status = self.diffsync.ref_cache.get(Status, name=attrs["status"])
         if "description" in attrs:
             port.description = attrs["description"]
         port.custom_field_data["system_of_record"] = "Citrix ADM"
@@ -176,11 +192,12 @@ class NautobotPort(Port):
         port.validated_save()
         return super().update(attrs)
 
+    @chunked_operation
     def delete(self):
         """Delete Interface in Nautobot from NautobotPort object."""
         port = Interface.objects.get(id=self.uuid)
         super().delete()
-        self.diffsync.job.logger.info(f"Deleting Port {port.name} for {port.device.name}.")
+        self.diffsync.job.logger.info("Deleting Port %s for %s.", port.name, port.device.name)
         self.diffsync.objects_to_delete["ports"].append(port)
         return self
 
@@ -189,28 +206,34 @@ class NautobotSubnet(Subnet):
     """Nautobot implementation of Citrix ADM Subnet model."""
 
     @classmethod
+    @chunked_operation
     def create(cls, diffsync, ids, attrs):
         """Create Prefix in Nautobot from NautobotSubnet object."""
-        namespace = Namespace.objects.get_or_create(name=ids["namespace"])[0]
+        namespace = diffsync.ref_cache.get_or_create(Namespace, name=ids["namespace"])[0]
         if diffsync.job.debug:
-            diffsync.job.logger.info(f"Creating Prefix {ids['prefix']}.")
+            diffsync.job.logger.info("Creating Prefix %s.", ids["prefix"])
         _pf = Prefix(
             prefix=ids["prefix"],
             namespace=namespace,
-            status=Status.objects.get(name="Active"),
-            tenant=Tenant.objects.get(name=attrs["tenant"]) if attrs.get("tenant") else None,
+            status=diffsync.ref_cache.get(Status, name="Active"),
+            tenant=diffsync.ref_cache.get(Tenant, name=attrs["tenant"]) if attrs.get("tenant") else None,
         )
         _pf.custom_field_data.update({"system_of_record": "Citrix ADM"})
         _pf.custom_field_data.update({"ssot_last_synchronized": datetime.today().date().isoformat()})
-        _pf.validated_save()
+        if diffsync.bulk_import:
+            diffsync.objects_to_create["prefixes"].append(_pf)
+            diffsync.prefix_map[ids["prefix"]] = _pf
+        else:
+            _pf.validated_save()
         return super().create(diffsync=diffsync, ids=ids, attrs=attrs)
 
+    @chunked_operation
     def update(self, attrs):
         """Update IP Address in Nautobot from NautobotAddress object."""
         pf = Prefix.objects.get(id=self.uuid)
         if "tenant" in attrs:
             if attrs.get("tenant"):
-                pf.tenant = Tenant.objects.get(name=attrs["tenant"])
+                pf.tenant = self.diffsync.ref_cache.get(Tenant, name=attrs["tenant"])
             else:
                 pf.tenant = None
         pf.custom_field_data.update({"system_of_record": "Citrix ADM"})
@@ -218,6 +241,7 @@ class NautobotSubnet(Subnet):
         pf.validated_save()
         return super().update(attrs)
 
+    @chunked_operation
     def delete(self):
         """Delete Prefix in Nautobot."""
         try:
@@ -227,62 +251,64 @@ class NautobotSubnet(Subnet):
             return self
         except Prefix.DoesNotExist as err:
             if self.diffsync.job.debug:
-                self.diffsync.job.logger.warning(f"Unable to find Prefix {self.prefix} {self.uuid} for deletion. {err}")
+                self.diffsync.job.logger.warning(
+                    "Unable to find Prefix %s %s for deletion. %s", self.prefix, self.uuid, err
+                )
 
 
 class NautobotAddress(Address):
     """Nautobot implementation of Citrix ADM Address model."""
 
     @classmethod
+    @chunked_operation
     def create(cls, diffsync, ids, attrs):
         """Create IP Address in Nautobot from NautobotAddress object."""
         new_ip = IPAddress(
             address=ids["address"],
-            parent=Prefix.objects.get(prefix=ids["prefix"]),
-            status=Status.objects.get(name="Active"),
+            parent=diffsync.prefix_map.get(ids["prefix"]) or Prefix.objects.get(prefix=ids["prefix"]),
+            status=diffsync.ref_cache.get(Status, name="Active"),
             namespace=(
-                Namespace.objects.get_or_create(name=attrs["tenant"])[0]
+                diffsync.ref_cache.get_or_create(Namespace, name=attrs["tenant"])[0]
                 if attrs.get("tenant")
-                else Namespace.objects.get(name="Global")
+                else diffsync.ref_cache.get(Namespace, name="Global")
             ),
         )
         if attrs.get("tenant"):
-            new_ip.tenant = Tenant.objects.update_or_create(name=attrs["tenant"])[0]
-        if attrs.get("tags"):
-            new_ip.tags.set(attrs["tags"])
-            for tag in attrs["tags"]:
-                new_tag = Tag.objects.get(name=tag)
-                new_tag.content_types.add(ContentType.objects.get_for_model(NewDevice))
+            new_ip.tenant = diffsync.ref_cache.get_or_create(Tenant, name=attrs["tenant"])[0]
         new_ip.custom_field_data["system_of_record"] = "Citrix ADM"
         new_ip.custom_field_data["ssot_last_synchronized"] = datetime.today().date().isoformat()
-        new_ip.validated_save()
+        diffsync.address_map[ids["address"]] = new_ip
+        if diffsync.bulk_import:
+            diffsync.objects_to_create["addresses"].append(new_ip)
+        else:
+            new_ip.validated_save()
+        if attrs.get("tags"):
+            diffsync.tags_to_assign.append((new_ip, attrs["tags"]))
         return super().create(diffsync=diffsync, ids=ids, attrs=attrs)
 
+    @chunked_operation
     def update(self, attrs):
         """Update IP Address in Nautobot from NautobotAddress object."""
         addr = IPAddress.objects.get(id=self.uuid)
         if "tenant" in attrs:
             if attrs.get("tenant"):
-                addr.tenant = Tenant.objects.update_or_create(name=attrs["tenant"])[0]
+                addr.tenant = self.diffsync.ref_cache.get_or_create(Tenant, name=attrs["tenant"])[0]
             else:
                 addr.tenant = None
-        if "tags" in attrs:
-            addr.tags.set(attrs["tags"])
-            for tag in attrs["tags"]:
-                new_tag = Tag.objects.get(name=tag)
-                new_tag.content_types.add(ContentType.objects.get_for_model(NewDevice))
-        else:
-            addr.tags.clear()
         addr.custom_field_data["system_of_record"] = "Citrix ADM"
         addr.custom_field_data["ssot_last_synchronized"] = datetime.today().date().isoformat()
         addr.validated_save()
+        if "tags" in attrs:
+            self.diffsync.tags_to_clear.append(addr.id)
+            self.diffsync.tags_to_assign.append((addr, attrs["tags"] or []))
         return super().update(attrs)
 
+    @chunked_operation
     def delete(self):
         """Delete IP Address in Nautobot from NautobotAddress object."""
         addr = IPAddress.objects.get(id=self.uuid)
         super().delete()
-        self.diffsync.job.logger.info(f"Deleting IP Address {self}.")
+        self.diffsync.job.logger.info("Deleting IP Address %s.", self)
         self.diffsync.objects_to_delete["addresses"].append(addr)
         return self
 
@@ -291,39 +317,38 @@ class NautobotIPAddressOnInterface(IPAddressOnInterface):
     """Nautobot implementation of Citrix ADM IPAddressOnInterface model."""
 
     @classmethod
+    @chunked_operation
     def create(cls, diffsync, ids, attrs):
         """Create IPAddressToInterface in Nautobot from IPAddressOnInterface object."""
         new_map = IPAddressToInterface(
-            ip_address=IPAddress.objects.get(address=ids["address"]),
-            interface=Interface.objects.get(name=ids["port"], device__name=ids["device"]),
+            ip_address=diffsync.address_map.get(ids["address"]) or IPAddress.objects.get(address=ids["address"]),
+            interface=diffsync.port_map.get((ids["device"], ids["port"]))
+            or Interface.objects.get(name=ids["port"], device__name=ids["device"]),
         )
-        new_map.validated_save()
+        if diffsync.bulk_import:
+            diffsync.objects_to_create["mappings"].append(new_map)
+        else:
+            new_map.validated_save()
         if attrs.get("primary"):
-            if new_map.ip_address.ip_version == 4:
-                new_map.interface.device.primary_ip4 = new_map.ip_address
-            else:
-                new_map.interface.device.primary_ip6 = new_map.ip_address
-            new_map.interface.device.validated_save()
+            diffsync.primary_ips.append(new_map)
         return super().create(diffsync=diffsync, ids=ids, attrs=attrs)
 
+    @chunked_operation
     def update(self, attrs):
         """Update IP Address in Nautobot from IPAddressOnInterface object."""
-        mapping = IPAddressToInterface.objects.get(id=self.uuid)
+        mapping = IPAddressToInterface.objects.select_related("ip_address", "interface__device").get(id=self.uuid)
         if attrs.get("primary"):
-            if mapping.ip_address.ip_version == 4:
-                mapping.interface.device.primary_ip4 = mapping.ip_address
-            else:
-                mapping.interface.device.primary_ip6 = mapping.ip_address
-            mapping.interface.device.validated_save()
+            self.diffsync.primary_ips.append(mapping)
         mapping.validated_save()
         return super().update(attrs)
 
+    @chunked_operation
     def delete(self):
         """Delete IPAddressToInterface in Nautobot from NautobotIPAddressOnInterface object."""
         mapping = IPAddressToInterface.objects.get(id=self.uuid)
         super().delete()
         self.diffsync.job.logger.info(
-            f"Deleting IPAddress to Interface mapping between {self.address} and {self.device}'s {self.port} port."
+            "Deleting IPAddress to Interface mapping between %s and %s's %s port.", self.address, self.device, self.port
         )
         mapping.delete()
         return self
@@ -1,19 +1,63 @@
 """Jobs for Citrix ADM SSoT integration."""
 
+import gc
+import os
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import timedelta
+from time import monotonic, sleep
+from typing import Dict, List, Tuple
 from django.conf import settings
-from nautobot.core.celery import register_jobs
-from nautobot.extras.jobs import BooleanVar, Job, MultiObjectVar, ObjectVar
-from nautobot.extras.models import ExternalIntegration
+from django.utils import timezone
+from nautobot.core.celery import app, register_jobs
+from nautobot.dcim.models import Device
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.jobs import BooleanVar, FileVar, IntegerVar, Job, MultiObjectVar, ObjectVar, StringVar
+from nautobot.extras.models import ExternalIntegration, JobResult
+from nautobot.extras.models import Job as JobModel
 from nautobot.tenancy.models import Tenant
 from nautobot_ssot.jobs.base import DataSource, DataTarget
-from nautobot_ssot_citrix_adm.diffsync.adapters import citrix_adm, nautobot
+from nautobot_ssot_citrix_adm.utils.job_logging import buffered_job_logging
 
 
-PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"]
-
 name = "Citrix ADM SSoT"  # pylint: disable=invalid-name
 
 
+def get_rss() -> int:
+    """Read the current resident set size of this process.
+
+    Returns:
+        int: Resident set size in bytes, 0 when it can't be read such as on platforms without procfs.
+    """
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def get_free_worker_slots(queue: str) -> int:
+    """Count the Celery worker processes consuming a queue that aren't running or holding a task.
+
+    Args:
+        queue (str): Name of the Celery queue.
+
+    Returns:
+        int: Number of idle worker processes, 0 when no worker replied.
+    """
+    inspect = app.control.inspect(timeout=5)
+    stats = inspect.stats() or {}
+    active = inspect.active() or {}
+    reserved = inspect.reserved() or {}
+    free = 0
+    for worker, queues in (inspect.active_queues() or {}).items():
+        if queue not in {worker_queue["name"] for worker_queue in queues}:
+            continue
+        concurrency = stats.get(worker, {}).get("pool", {}).get("max-concurrency", 0)
+        free += max(concurrency - len(active.get(worker, [])) - len(reserved.get(worker, [])), 0)
+    return free
+
+
 class CitrixAdmDataSource(DataSource, Job):  # pylint: disable=too-many-instance-attributes
     """Citrix ADM SSoT Data Source."""
 
@@ -26,6 +70,35 @@ class CitrixAdmDataSource(DataSource, Job):  # pylint: disable=too-many-instance
     )
     tenant = ObjectVar(model=Tenant, queryset=Tenant.objects.all(), display_field="display_name", required=False)
     debug = BooleanVar(description="Enable for more verbose debug logging", default=False)
+    bulk_import = BooleanVar(
+        description="Create new Prefixes, IP Addresses and Interfaces in bulk. Bulk created objects bypass change logging.",
+        default=False,
+    )
+    transactional_sync = BooleanVar(
+        description="Apply changes in chunked database transactions so a failed object only rolls back itself.",
+        default=False,
+    )
+    sharded = BooleanVar(
+        description="Collect each Citrix ADM instance in a separate Job so instances are collected in parallel on the available workers.",
+        default=False,
+    )
+    datacenter_shards = IntegerVar(
+        description="Number of Jobs to split the Datacenters of each Citrix ADM instance across when sharded.",
+        default=1,
+        min_value=1,
+    )
+    windowed = BooleanVar(
+        description="Load, diff and sync one Site at a time so memory use is bounded by the largest Site.",
+        default=False,
+    )
+    save_snapshot = BooleanVar(
+        description="Attach a compressed snapshot of the data loaded from Citrix ADM to the Job Result.",
+        default=False,
+    )
+    snapshot = FileVar(
+        description="Load data from a snapshot attached to a previous Job Result instead of connecting to Citrix ADM.",
+        required=False,
+    )
 
     class Meta:  # pylint: disable=too-few-public-methods
         """Meta data for Citrix ADM."""
@@ -47,26 +120,541 @@ class CitrixAdmDataSource(DataSource, Job):  # pylint: disable=too-many-instance
 
     def load_source_adapter(self):
         """Load data from Citrix ADM into DiffSync models."""
+        from nautobot_ssot_citrix_adm.diffsync.adapters import citrix_adm  # pylint: disable=import-outside-toplevel
+
         self.source_adapter = citrix_adm.CitrixAdmAdapter(
             job=self, sync=self.sync, instances=self.instances, tenant=self.tenant
         )
-        self.source_adapter.load()
+        if self.snapshot:
+            self.logger.info("Loading data from snapshot %s.", self.snapshot.name)
+            self.source_adapter.load_snapshot_file(self.snapshot.read())
+            self.source_adapter.compute_device_hashes()
+            return
+        if self.sharded:
+            self.load_sharded()
+        else:
+            self.source_adapter.load()
+        if self.save_snapshot:
+            self.create_file(
+                f"citrix_adm_snapshot_{self.job_result.id}.json.gz", self.source_adapter.dump_snapshot_file()
+            )
+
+    def load_shard_inline(self, instance: ExternalIntegration, shard_index: int):
+        """Collect a shard in this Job and merge it into the source adapter.
+
+        Args:
+            instance (ExternalIntegration): Citrix ADM instance to collect.
+            shard_index (int): Index of the Datacenter shard to collect.
+        """
+        from nautobot_ssot_citrix_adm.diffsync.adapters import citrix_adm  # pylint: disable=import-outside-toplevel
+
+        adapter = citrix_adm.CitrixAdmAdapter(
+            job=self, instances=[instance], tenant=self.tenant, shard=(shard_index, self.datacenter_shards)
+        )
+        adapter.load()
+        self.source_adapter.load_snapshot(adapter.dump_snapshot())
+
+    def load_sharded(self):
+        """Collect the selected instances in collector Jobs running in parallel and merge their output.
+
+        This Job keeps its worker process while waiting, so the workers consuming the default Celery queue need an
+        idle process for every shard on top of it. The Job fails before enqueuing anything when they don't, as the
+        shards would otherwise wait behind it. Shards that fail or don't finish before the `shard_timeout` setting are
+        collected in this Job instead.
+        """
+        shards = len(self.instances) * self.datacenter_shards
+        free = get_free_worker_slots(settings.CELERY_TASK_DEFAULT_QUEUE)
+        if free < shards:
+            raise RuntimeError(
+                f"Sharded collection needs {shards} idle worker processes on the {settings.CELERY_TASK_DEFAULT_QUEUE} queue but only {free} are available."
+            )
+        job_model = JobModel.objects.get(
+            module_name=CitrixAdmCollector.__module__, job_class_name=CitrixAdmCollector.__name__
+        )
+        pending = {}
+        for instance in self.instances:
+            for shard_index in range(self.datacenter_shards):
+                job_result = JobResult.enqueue_job(
+                    job_model,
+                    self.user,
+                    instance=str(instance.id),
+                    tenant=str(self.tenant.id) if self.tenant else None,
+                    debug=self.debug,
+                    shard_index=shard_index,
+                    shard_count=self.datacenter_shards,
+                )
+                pending[job_result.id] = (instance, shard_index)
+        self.logger.info("Enqueued %s collector Jobs.", len(pending))
+        plugin_settings = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"]
+        deadline = monotonic() + plugin_settings.get("shard_timeout", 3600)
+        while pending and monotonic() < deadline:
+            for job_result in JobResult.objects.filter(
+                id__in=list(pending), status__in=JobResultStatusChoices.READY_STATES
+            ):
+                instance, shard_index = pending.pop(job_result.id)
+                if job_result.status == JobResultStatusChoices.STATUS_SUCCESS:
+                    self.logger.info(
+                        "Merging shard %s of %s from collector Job %s.", shard_index, instance.name, job_result.id
+                    )
+                    self.source_adapter.load_snapshot(job_result.result)
+                else:
+                    self.logger.warning(
+                        "Collector Job %s for shard %s of %s failed so collecting it here.",
+                        job_result.id,
+                        shard_index,
+                        instance.name,
+                    )
+                    self.load_shard_inline(instance=instance, shard_index=shard_index)
+            if pending:
+                sleep(plugin_settings.get("shard_poll_interval", 5))
+        for job_result_id, (instance, shard_index) in pending.items():
+            self.logger.warning(
+                "Collector Job %s for shard %s of %s timed out so collecting it here.",
+                job_result_id,
+                shard_index,
+                instance.name,
+            )
+            self.load_shard_inline(instance=instance, shard_index=shard_index)
+        self.source_adapter.compute_device_hashes()
 
     def load_target_adapter(self):
         """Load data from Nautobot into DiffSync models."""
-        self.target_adapter = nautobot.NautobotAdapter(job=self, sync=self.sync, tenant=self.tenant)
+        from nautobot_ssot_citrix_adm.diffsync.adapters import nautobot  # pylint: disable=import-outside-toplevel
+
+        self.target_adapter = nautobot.NautobotAdapter(
+            job=self,
+            sync=self.sync,
+            tenant=self.tenant,
+            bulk_import=self.bulk_import,
+            transactional_sync=self.transactional_sync,
+        )
         self.target_adapter.load()
 
+    def sync_data(self, memory_profiling):
+        """Perform the sync and record the phases of both adapters once it's done."""
+        try:
+            if self.windowed:
+                self.sync_windows(memory_profiling)
+            else:
+                super().sync_data(memory_profiling)
+        finally:
+            self.record_phases()
+
+    def plan_windows(self, sessions: List[dict]) -> Dict[str, dict]:
+        """Group the ADCs assigned to the Citrix ADM sessions and the Devices only left in Nautobot by Site.
+
+        An ADC belongs to the window of its Datacenter in Citrix ADM, wherever its Device is in Nautobot, so a Device
+        that moved between Sites is updated by the window of its new Site instead of being deleted by the old one.
+
+        Args:
+            sessions (List[dict]): Sessions returned by `CitrixAdmAdapter.connect_all()`.
+
+        Returns:
+            Dict[str, dict]: ADCs per session index under `adcs` and names of the Devices to delete under `orphans`
+                for each Site name.
+        """
+        windows = defaultdict(lambda: {"adcs": defaultdict(list), "orphans": []})
+        hostnames = set()
+        for index, session in enumerate(sessions):
+            for dev in session["assigned"]:
+                site = session["site_map"].get(dev["datacenter_id"], {}).get("name", "")
+                windows[site]["adcs"][index].append(dev)
+                hostnames.add(dev["hostname"])
+        if self.tenant:
+            devices = Device.objects.filter(tenant=self.tenant)
+        else:
+            devices = Device.objects.filter(_custom_field_data__system_of_record="Citrix ADM")
+        for name, site in devices.values_list("name", "location__name"):
+            if name not in hostnames:
+                windows[site]["orphans"].append(name)
+        return dict(windows)
+
+    def sync_window(self, site: str, window: dict, sessions: List[dict]) -> Tuple[dict, dict]:
+        """Load, diff and sync the ADCs and Devices of a single Site.
+
+        Args:
+            site (str): Name of the Site.
+            window (dict): ADCs and orphaned Devices of the Site returned by `plan_windows()`.
+            sessions (List[dict]): Sessions returned by `CitrixAdmAdapter.connect_all()`.
+
+        The time spent on each step is added to `window_times` and the Prefixes and IP Addresses loaded from Citrix ADM
+        to `window_prefixes` and `window_addresses`.
+
+        Returns:
+            Tuple[dict, dict]: Summary and serialized diff of the window.
+        """
+        from nautobot_ssot_citrix_adm.diffsync.adapters import citrix_adm  # pylint: disable=import-outside-toplevel
+        from nautobot_ssot_citrix_adm.diffsync.adapters import nautobot  # pylint: disable=import-outside-toplevel
+
+        start = monotonic()
+        source = citrix_adm.CitrixAdmAdapter(job=self, sync=self.sync, instances=self.instances, tenant=self.tenant)
+        source.profiler = self.window_profiler
+        for index, devices in window["adcs"].items():
+            source.load_session(sessions[index], devices=devices)
+        source.compute_device_hashes()
+        self.window_prefixes.update((prefix.prefix, prefix.namespace) for prefix in source.get_all("prefix"))
+        self.window_addresses.update(address.address for address in source.get_all("address"))
+        self.window_times["source_load_time"] += monotonic() - start
+        start = monotonic()
+        target = nautobot.NautobotAdapter(
+            job=self,
+            sync=self.sync,
+            tenant=self.tenant,
+            bulk_import=self.bulk_import,
+            transactional_sync=self.transactional_sync,
+            devices=[dev.name for dev in source.get_all("device")] + window["orphans"],
+            prefixes=[prefix.prefix for prefix in source.get_all("prefix")],
+            addresses=[address.address for address in source.get_all("address")],
+        )
+        target.profiler = self.window_profiler
+        target.load()
+        self.window_times["target_load_time"] += monotonic() - start
+        start = monotonic()
+        diff = source.diff_to(target, flags=self.diffsync_flags)
+        self.window_times["diff_time"] += monotonic() - start
+        if not self.dryrun:
+            start = monotonic()
+            source.sync_to(target, flags=self.diffsync_flags, diff=diff)
+            self.window_times["sync_time"] += monotonic() - start
+        return diff.summary(), diff.dict()
+
+    def delete_unmatched(self) -> Tuple[dict, dict]:
+        """Delete the Prefixes and IP Addresses that none of the windows loaded from Citrix ADM.
+
+        Returns:
+            Tuple[dict, dict]: Summary and serialized diff of the deletions.
+        """
+        from nautobot_ssot_citrix_adm.diffsync.adapters import nautobot  # pylint: disable=import-outside-toplevel
+
+        start = monotonic()
+        target = nautobot.NautobotAdapter(job=self, sync=self.sync, tenant=self.tenant)
+        target.profiler = self.window_profiler
+        diff = target.queue_unmatched_deletes(prefixes=self.window_prefixes, addresses=self.window_addresses)
+        self.window_times["diff_time"] += monotonic() - start
+        summary = {"delete": sum(len(objects) for objects in diff.values())}
+        if not self.dryrun:
+            start = monotonic()
+            for grouping in ["addresses", "prefixes"]:
+                target.delete_objects(grouping)
+            self.window_times["sync_time"] += monotonic() - start
+        return summary, diff
+
+    def sync_windows(self, memory_profiling: bool):
+        """Perform the sync one Site at a time, freeing the adapters and diff of each Site before the next one.
+
+        The ADCs are assigned to the instances once before the first window, each window then logs into the instances
+        of its ADCs only while polling them. The memory use of each window is logged, its peak traced memory with
+        memory profiling enabled and otherwise the change of the resident set size between its start and end, once
+        its adapters were freed. Prefixes and IP Addresses that no window loaded from Citrix ADM are deleted after the
+        last window, so the result matches a full sync. The times of the windows are added up on the Sync record.
+
+        Args:
+            memory_profiling (bool): Whether to trace memory allocations.
+        """
+        from nautobot_ssot_citrix_adm.diffsync.adapters import citrix_adm  # pylint: disable=import-outside-toplevel
+        from nautobot_ssot_citrix_adm.utils.nautobot import PhaseProfiler  # pylint: disable=import-outside-toplevel
+
+        self.window_profiler = PhaseProfiler(track_shapes=self.debug)
+        self.window_prefixes, self.window_addresses, self.window_times = set(), set(), Counter()
+        if memory_profiling:
+            tracemalloc.start()
+        collector = citrix_adm.CitrixAdmAdapter(job=self, sync=self.sync, instances=self.instances, tenant=self.tenant)
+        collector.profiler = self.window_profiler
+        summary, diff = Counter(), {}
+        try:
+            start = monotonic()
+            sessions = collector.connect_all()
+            self.window_times["source_load_time"] += monotonic() - start
+            windows = self.plan_windows(sessions)
+            self.logger.info("Syncing %s Sites one at a time.", len(windows))
+            if self.dryrun:
+                self.logger.info("As `dryrun` is set, skipping the actual data sync.")
+            for site in sorted(windows):
+                rss_start = get_rss()
+                with self.window_profiler.phase(f"Window: {site}"):
+                    window_summary, window_diff = self.sync_window(
+                        site=site, window=windows.pop(site), sessions=sessions
+                    )
+                    gc.collect()
+                summary.update(window_summary)
+                for model, objects in window_diff.items():
+                    diff.setdefault(model, {}).update(objects)
+                peak = self.window_profiler.phases[f"Window: {site}"]["peak_memory"]
+                rss_end = get_rss()
+                if peak is not None:
+                    self.logger.info(
+                        "Synced Site %s: %s. Peak traced memory %.1f MiB.", site, window_summary, peak / 2**20
+                    )
+                elif rss_start and rss_end:
+                    self.logger.info(
+                        "Synced Site %s: %s. RSS change %+.1f MiB.",
+                        site,
+                        window_summary,
+                        (rss_end - rss_start) / 2**20,
+                    )
+                else:
+                    self.logger.info("Synced Site %s: %s.", site, window_summary)
+            with self.window_profiler.phase("Window: unmatched Prefixes and IP Addresses"):
+                unmatched_summary, unmatched_diff = self.delete_unmatched()
+            summary.update(unmatched_summary)
+            for model, objects in unmatched_diff.items():
+                diff.setdefault(model, {}).update(objects)
+            self.logger.info("Deleted %s unmatched Prefixes and IP Addresses.", unmatched_summary["delete"])
+        finally:
+            if memory_profiling:
+                tracemalloc.stop()
+        if self.sync:
+            self.sync.summary = dict(summary)
+            self.sync.diff = diff
+            for field, seconds in self.window_times.items():
+                setattr(self.sync, field, timedelta(seconds=seconds))
+            self.sync.save()
+
+    def record_phases(self):
+        """Log a table of the phases recorded by the adapters and store them on the Sync record.
+
+        With debug enabled the most repeated queries are logged as well.
+        """
+        from nautobot_ssot_citrix_adm.utils.nautobot import (  # pylint: disable=import-outside-toplevel
+            get_repeated_shapes,
+            render_phase_table,
+            render_shape_table,
+        )
+
+        phases, shapes = {}, Counter()
+        profilers = [adapter.profiler for adapter in [self.source_adapter, self.target_adapter] if adapter is not None]
+        if getattr(self, "window_profiler", None):
+            profilers.append(self.window_profiler)
+        for profiler in profilers:
+            phases.update(profiler.phases)
+            if self.debug:
+                shapes.update(profiler.shapes)
+        if not phases:
+            return
+        self.logger.info("Sync phases:\n\n%s", render_phase_table(phases))
+        repeated = get_repeated_shapes(shapes)
+        if repeated:
+            self.logger.info("Most repeated queries:\n\n%s", render_shape_table(repeated))
+        if self.sync:
+            self.sync.summary = {**(self.sync.summary or {}), "phases": phases}
+            self.sync.save()
+
     def run(  # pylint: disable=arguments-differ, too-many-arguments
-        self, dryrun, memory_profiling, instances, tenant, debug, *args, **kwargs
+        self,
+        dryrun,
+        memory_profiling,
+        instances,
+        tenant,
+        debug,
+        bulk_import,
+        transactional_sync,
+        sharded,
+        datacenter_shards,
+        windowed,
+        save_snapshot,
+        snapshot,
+        *args,
+        **kwargs,
     ):
         """Perform data synchronization."""
+        if windowed and (sharded or save_snapshot or snapshot):
+            raise ValueError("Windowed sync can't be combined with sharded collection or snapshots.")
+        self.instances = instances
+        self.tenant = tenant
+        self.debug = debug
+        self.bulk_import = bulk_import
+        self.transactional_sync = transactional_sync
+        self.sharded = sharded
+        self.datacenter_shards = datacenter_shards
+        self.windowed = windowed
+        self.window_profiler = None
+        self.save_snapshot = save_snapshot
+        self.snapshot = snapshot
+        self.dryrun = dryrun
+        self.memory_profiling = memory_profiling
+        with buffered_job_logging(self):
+            super().run(dryrun=self.dryrun, memory_profiling=self.memory_profiling, *args, **kwargs)
+
+
+class CitrixAdmCollector(Job):
+    """Collect data from a Citrix ADM instance for a sharded Citrix ADM to Nautobot sync."""
+
+    instance = ObjectVar(model=ExternalIntegration, queryset=ExternalIntegration.objects.all(), required=True)
+    tenant = ObjectVar(model=Tenant, queryset=Tenant.objects.all(), required=False)
+    debug = BooleanVar(description="Enable for more verbose debug logging", default=False)
+    shard_index = IntegerVar(default=0, min_value=0)
+    shard_count = IntegerVar(default=1, min_value=1)
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """Meta data for Citrix ADM collector."""
+
+        name = "Citrix ADM Collector"
+        description = "Collect data from a Citrix ADM instance for a sharded Citrix ADM to Nautobot sync."
+        hidden = True
+
+    def run(  # pylint: disable=arguments-differ, too-many-arguments
+        self, instance, tenant, debug, shard_index, shard_count, *args, **kwargs
+    ):
+        """Load data from the Citrix ADM instance and return it serialized for the coordinating Job."""
+        from nautobot_ssot_citrix_adm.diffsync.adapters import citrix_adm  # pylint: disable=import-outside-toplevel
+
+        self.debug = debug
+        adapter = citrix_adm.CitrixAdmAdapter(
+            job=self, instances=[instance], tenant=tenant, shard=(shard_index, shard_count)
+        )
+        adapter.load()
+        return adapter.dump_snapshot()
+
+
+class CitrixAdmDeviceDataSource(DataSource, Job):
+    """Citrix ADM SSoT Data Source for a single ADC or Datacenter."""
+
+    instances = MultiObjectVar(
+        model=ExternalIntegration,
+        queryset=ExternalIntegration.objects.all(),
+        display_field="display",
+        label="Citrix ADM Instances",
+        required=True,
+    )
+    tenant = ObjectVar(model=Tenant, queryset=Tenant.objects.all(), display_field="display_name", required=False)
+    hostname = StringVar(description="Hostname of the ADC to sync.", required=False)
+    datacenter = StringVar(description="Name of the Datacenter to sync the ADCs of.", required=False)
+    debug = BooleanVar(description="Enable for more verbose debug logging", default=False)
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """Meta data for Citrix ADM single ADC or Datacenter sync."""
+
+        name = "Citrix ADM Device to Nautobot"
+        data_source = "Citrix ADM"
+        data_target = "Nautobot"
+        description = "Sync a single ADC or Datacenter from Citrix ADM to Nautobot"
+
+    @classmethod
+    def config_information(cls):
+        """Dictionary describing the configuration of this DataSource."""
+        return {}
+
+    @classmethod
+    def data_mappings(cls):
+        """List describing the data mappings involved in this DataSource."""
+        return ()
+
+    def load_source_adapter(self):
+        """Load the ADC or the ADCs of the Datacenter from Citrix ADM into DiffSync models."""
+        from nautobot_ssot_citrix_adm.diffsync.adapters import citrix_adm  # pylint: disable=import-outside-toplevel
+
+        self.source_adapter = citrix_adm.CitrixAdmAdapter(
+            job=self,
+            sync=self.sync,
+            instances=self.instances,
+            tenant=self.tenant,
+            hostname=self.hostname,
+            datacenter=self.datacenter,
+        )
+        self.source_adapter.load()
+
+    def load_target_adapter(self):
+        """Load the Device or the Devices of the Site and their Interfaces and IP Addresses from Nautobot into DiffSync models.
+
+        In a Datacenter sync, Devices Citrix ADM moved into the Datacenter are loaded wherever they are in Nautobot so
+        they're updated, and Devices Citrix ADM moved to another Datacenter are left out so they aren't deleted.
+        """
+        from nautobot_ssot_citrix_adm.diffsync.adapters import nautobot  # pylint: disable=import-outside-toplevel
+
+        devices = None
+        if self.datacenter:
+            devices = [dev.name for dev in self.source_adapter.get_all("device")] + [
+                name
+                for name in Device.objects.filter(location__name=self.datacenter).values_list("name", flat=True)
+                if name not in self.source_adapter.managed_elsewhere
+            ]
+        self.target_adapter = nautobot.NautobotAdapter(
+            job=self,
+            sync=self.sync,
+            tenant=self.tenant,
+            hostname=self.hostname,
+            datacenter=self.datacenter,
+            devices=devices,
+            prefixes=[prefix.prefix for prefix in self.source_adapter.get_all("prefix")],
+            addresses=[address.address for address in self.source_adapter.get_all("address")],
+        )
+        self.target_adapter.load()
+
+    def run(  # pylint: disable=arguments-differ, too-many-arguments
+        self, dryrun, memory_profiling, instances, tenant, hostname, datacenter, debug, *args, **kwargs
+    ):
+        """Perform data synchronization of the ADC or Datacenter."""
+        if bool(hostname) == bool(datacenter):
+            raise ValueError("Exactly one of hostname or datacenter must be specified.")
         self.instances = instances
         self.tenant = tenant
+        self.hostname = hostname
+        self.datacenter = datacenter
         self.debug = debug
         self.dryrun = dryrun
         self.memory_profiling = memory_profiling
-        super().run(dryrun=self.dryrun, memory_profiling=self.memory_profiling, *args, **kwargs)
+        with buffered_job_logging(self):
+            super().run(dryrun=self.dryrun, memory_profiling=self.memory_profiling, *args, **kwargs)
+
+
+class CitrixAdmEventWorker(Job):
+    """Sync the ADCs queued by Citrix ADM event notifications."""
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """Meta data for Citrix ADM event worker."""
+
+        name = "Citrix ADM Event Worker"
+        description = "Sync the ADCs queued by Citrix ADM event notifications once they're due."
+        hidden = True
+
+    def run(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Claim the due ADCs in batches and enqueue a sync of each until none are due.
+
+        The worker doesn't wait for entries that aren't due yet. It schedules the next worker to start when the
+        earliest of them is due instead and exits.
+        """
+        from nautobot_ssot_citrix_adm.models import EventQueueEntry  # pylint: disable=import-outside-toplevel
+        from nautobot_ssot_citrix_adm.utils.events import (  # pylint: disable=import-outside-toplevel
+            claim_due,
+            complete_claim,
+            release_claims,
+            schedule_worker,
+        )
+
+        job_model = JobModel.objects.get(
+            module_name=CitrixAdmDeviceDataSource.__module__, job_class_name=CitrixAdmDeviceDataSource.__name__
+        )
+        enqueued = 0
+        while True:
+            entries = claim_due()
+            if not entries:
+                break
+            for index, entry in enumerate(entries):
+                try:
+                    JobResult.enqueue_job(
+                        job_model,
+                        self.user,
+                        dryrun=False,
+                        memory_profiling=False,
+                        instances=[str(entry.instance.id)],
+                        tenant=str(entry.tenant.id) if entry.tenant else None,
+                        hostname=entry.hostname,
+                        datacenter="",
+                        debug=False,
+                    )
+                except Exception:
+                    release_claims(entries[index:])
+                    raise
+                complete_claim(entry)
+                enqueued += 1
+                self.logger.info("Enqueued sync of %s after %s events.", entry.hostname, entry.events)
+        next_entry = EventQueueEntry.objects.filter(claimed__isnull=True).order_by("due").first()
+        if next_entry is not None:
+            countdown = max((next_entry.due - timezone.now()).total_seconds(), 1.0)
+            if schedule_worker(self.user, countdown=countdown, exclude=self.job_result):
+                self.logger.info("Scheduled the next event worker in %.0f seconds.", countdown)
+        self.logger.info("Enqueued %s ADC syncs.", enqueued)
+        return enqueued
 
 
 class CitrixAdmDataTarget(DataTarget, Job):
@@ -102,11 +690,15 @@ class CitrixAdmDataTarget(DataTarget, Job):
 
     def load_source_adapter(self):
         """Load data from Nautobot into DiffSync models."""
+        from nautobot_ssot_citrix_adm.diffsync.adapters import nautobot  # pylint: disable=import-outside-toplevel
+
         self.source_adapter = nautobot.NautobotAdapter(job=self, sync=self.sync, tenant=self.tenant)
         self.source_adapter.load()
 
     def load_target_adapter(self):
         """Load data from Citrix ADM into DiffSync models."""
+        from nautobot_ssot_citrix_adm.diffsync.adapters import citrix_adm  # pylint: disable=import-outside-toplevel
+
         self.target_adapter = citrix_adm.CitrixAdmAdapter(
             job=self, sync=self.sync, instances=self.instance, tenant=self.tenant
         )
@@ -121,8 +713,9 @@ class CitrixAdmDataTarget(DataTarget, Job):
         self.debug = debug
         self.dryrun = dryrun
         self.memory_profiling = memory_profiling
-        super().run(dryrun=self.dryrun, memory_profiling=self.memory_profiling, *args, **kwargs)
+        with buffered_job_logging(self):
+            super().run(dryrun=self.dryrun, memory_profiling=self.memory_profiling, *args, **kwargs)
 
 
-jobs = [CitrixAdmDataSource]
+jobs = [CitrixAdmDataSource, CitrixAdmCollector, CitrixAdmDeviceDataSource, CitrixAdmEventWorker]
 register_jobs(*jobs)
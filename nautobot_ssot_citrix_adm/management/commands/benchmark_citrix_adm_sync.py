@@ -0,0 +1,173 @@
+"""Benchmark the Citrix ADM to Nautobot sync end-to-end against a synthetic Citrix ADM."""
+import json
+import os
+import tracemalloc
+from time import perf_counter
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from nautobot.dcim.models import Device
+from nautobot.extras.choices import SecretsGroupAccessTypeChoices, SecretsGroupSecretTypeChoices
+from nautobot.extras.models import ExternalIntegration, JobResult, Secret, SecretsGroup, SecretsGroupAssociation
+from nautobot.extras.models import Job as JobModel
+from nautobot.ipam.models import IPAddress, Prefix
+from nautobot.tenancy.models import Tenant
+from nautobot_ssot.models import Sync
+from nautobot_ssot_citrix_adm.jobs import CitrixAdmDataSource
+from nautobot_ssot_citrix_adm.utils.synthetic import NitroStandIn, SyntheticAdm
+from nautobot_ssot_citrix_adm.utils.nautobot import QueryCounter, render_phase_table
+
+BENCHMARK_NAME = "Citrix ADM Benchmark"
+CREDENTIAL_VARIABLES = {
+    SecretsGroupSecretTypeChoices.TYPE_USERNAME: "NAUTOBOT_SSOT_CITRIX_ADM_BENCHMARK_USERNAME",
+    SecretsGroupSecretTypeChoices.TYPE_PASSWORD: "NAUTOBOT_SSOT_CITRIX_ADM_BENCHMARK_PASSWORD",
+}
+
+
+class Command(BaseCommand):
+    """Benchmark the Citrix ADM to Nautobot sync for the initial load, no change and churn scenarios."""
+
+    help = (
+        "Run the Citrix ADM to Nautobot Job against a local NITRO stand-in serving a synthetic Citrix ADM and report "
+        "the time, database queries and peak memory of each phase for the initial load, no change and churn "
+        f"scenarios. Objects of the {BENCHMARK_NAME} Tenant are deleted before the run."
+    )
+
+    def add_arguments(self, parser):
+        """Add the size of the synthetic Citrix ADM and the Job options."""
+        parser.add_argument("--devices", type=int, default=100, help="Number of ADCs.")
+        parser.add_argument("--datacenters", type=int, default=5, help="Number of Datacenters.")
+        parser.add_argument("--vlans", type=int, default=10, help="Number of VLANs with an IP binding per ADC.")
+        parser.add_argument("--snips", type=int, default=10, help="Number of SNIPs per ADC.")
+        parser.add_argument("--churn", type=float, default=0.05, help="Fraction of ADCs changed for the churn run.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic Citrix ADM.")
+        parser.add_argument("--bulk-import", action="store_true", help="Enable the Bulk Import Job option.")
+        parser.add_argument("--windowed", action="store_true", help="Enable the Windowed Job option.")
+        parser.add_argument("--username", default="citrix-adm-benchmark", help="User running the Job.")
+        parser.add_argument("--output", default="", help="Write the results of all scenarios to this JSON file.")
+
+    def handle(self, *args, **options):
+        """Run the scenarios."""
+        adm = SyntheticAdm(
+            devices=options["devices"],
+            datacenters=options["datacenters"],
+            vlans=options["vlans"],
+            snips=options["snips"],
+            seed=options["seed"],
+        )
+        tenant = Tenant.objects.get_or_create(name=BENCHMARK_NAME)[0]
+        IPAddress.objects.filter(tenant=tenant).delete()
+        Prefix.objects.filter(tenant=tenant).delete()
+        Device.objects.filter(tenant=tenant).delete()
+        user = get_user_model().objects.get_or_create(username=options["username"])[0]
+        job_model = JobModel.objects.get(
+            module_name=CitrixAdmDataSource.__module__, job_class_name=CitrixAdmDataSource.__name__
+        )
+        if not job_model.enabled:
+            job_model.enabled = True
+            job_model.save()
+
+        results = []
+        with NitroStandIn(adm) as nitro:
+            instance = self.create_instance(url=nitro.url)
+            job_kwargs = {
+                "dryrun": False,
+                "memory_profiling": False,
+                "instances": [str(instance.id)],
+                "tenant": str(tenant.id),
+                "debug": False,
+                "bulk_import": options["bulk_import"],
+                "transactional_sync": False,
+                "sharded": False,
+                "datacenter_shards": 1,
+                "windowed": options["windowed"],
+                "save_snapshot": False,
+                "snapshot": None,
+            }
+            for scenario in ["initial load", "no change", "churn"]:
+                if scenario == "churn":
+                    changed = adm.churn(options["churn"])
+                    self.stdout.write(f"Changed {changed} of {len(adm.adcs)} ADCs.")
+                requests = nitro.requests
+                result = self.run_scenario(scenario, job_model=job_model, user=user, job_kwargs=job_kwargs)
+                result["nitro_requests"] = nitro.requests - requests
+                self.report(result)
+                results.append(result)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump({"options": options, "scenarios": results}, output, indent=2, default=str)
+
+    @staticmethod
+    def create_instance(url: str) -> ExternalIntegration:
+        """Create the ExternalIntegration pointing at the NITRO stand-in with credentials from environment variables.
+
+        Args:
+            url (str): Base URL of the NITRO stand-in.
+
+        Returns:
+            ExternalIntegration: Citrix ADM instance to sync from.
+        """
+        secrets_group = SecretsGroup.objects.get_or_create(name=BENCHMARK_NAME)[0]
+        for secret_type, variable in CREDENTIAL_VARIABLES.items():
+            os.environ.setdefault(variable, "benchmark")
+            secret = Secret.objects.update_or_create(
+                name=f"{BENCHMARK_NAME} {secret_type}",
+                defaults={"provider": "environment-variable", "parameters": {"variable": variable}},
+            )[0]
+            SecretsGroupAssociation.objects.update_or_create(
+                secrets_group=secrets_group,
+                access_type=SecretsGroupAccessTypeChoices.TYPE_HTTP,
+                secret_type=secret_type,
+                defaults={"secret": secret},
+            )
+        return ExternalIntegration.objects.update_or_create(
+            name=BENCHMARK_NAME,
+            defaults={"remote_url": url, "verify_ssl": False, "secrets_group": secrets_group},
+        )[0]
+
+    @staticmethod
+    def run_scenario(name: str, job_model: JobModel, user, job_kwargs: dict) -> dict:
+        """Run the Job in this process and collect its measurements.
+
+        Args:
+            name (str): Name of the scenario.
+            job_model (JobModel): Job to run.
+            user (User): User running the Job.
+            job_kwargs (dict): Serialized Job variables.
+
+        Returns:
+            dict: Status, wall time, database queries, peak traced memory, diff summary and phases of the run.
+        """
+        tracemalloc.start()
+        try:
+            with QueryCounter() as queries:
+                start = perf_counter()
+                job_result = JobResult.execute_job(job_model, user, **job_kwargs)
+                wall = perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        sync = Sync.objects.filter(job_result=job_result).first()
+        summary = dict(sync.summary or {}) if sync else {}
+        return {
+            "scenario": name,
+            "status": job_result.status,
+            "wall": wall,
+            "queries": queries.count,
+            "peak_memory": peak,
+            "phases": summary.pop("phases", {}),
+            "summary": summary,
+        }
+
+    def report(self, result: dict):
+        """Write the measurements of a scenario.
+
+        Args:
+            result (dict): Measurements returned by `run_scenario()`.
+        """
+        self.stdout.write(
+            f"\n{result['scenario']}: {result['status']} in {result['wall']:.2f} seconds with {result['queries']} "
+            f"queries, {result['nitro_requests']} NITRO requests and {result['peak_memory'] / 2**20:.1f} MiB peak "
+            f"memory. Diff summary: {result['summary']}\n"
+        )
+        if result["phases"]:
+            self.stdout.write(render_phase_table(result["phases"]))
@@ -0,0 +1,48 @@
+"""Add expression indexes on the System of Record custom field for the models loaded by the Nautobot adapter.
+
+Interfaces are loaded through the System of Record of their Device so they don't need an index of their own.
+"""
+
+from django.db import migrations
+
+INDEXED_MODELS = [("dcim", "Device"), ("ipam", "Prefix"), ("ipam", "IPAddress")]
+
+
+def index_name(db_table):
+    """Return the name of the System of Record index for a table."""
+    return f"{db_table}_ssot_citrix_adm_sor_idx"
+
+
+def create_indexes(apps, schema_editor):
+    """Concurrently create the System of Record expression indexes on PostgreSQL."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for app_label, model_name in INDEXED_MODELS:
+        db_table = apps.get_model(app_label, model_name)._meta.db_table
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(db_table)} ON {db_table} "
+            "((_custom_field_data -> 'system_of_record')) "
+            "WHERE (_custom_field_data -> 'system_of_record') IS NOT NULL"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    """Concurrently drop the System of Record expression indexes on PostgreSQL."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for app_label, model_name in INDEXED_MODELS:
+        db_table = apps.get_model(app_label, model_name)._meta.db_table
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name(db_table)}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("dcim", "__first__"),
+        ("ipam", "__first__"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes, atomic=False),
+    ]
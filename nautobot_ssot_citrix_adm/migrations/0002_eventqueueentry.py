@@ -0,0 +1,55 @@
+"""Add the queue of ADCs to sync after Citrix ADM event notifications."""
+
+import uuid
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("extras", "0101_externalintegration"),
+        ("tenancy", "__first__"),
+        ("nautobot_ssot_citrix_adm", "0001_system_of_record_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventQueueEntry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("hostname", models.CharField(max_length=255)),
+                ("event", models.CharField(blank=True, max_length=255)),
+                ("events", models.PositiveIntegerField(default=1)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("due", models.DateTimeField(db_index=True)),
+                (
+                    "instance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="extras.externalintegration",
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="tenancy.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "event queue entries",
+                "ordering": ["due"],
+                "unique_together": {("instance", "hostname")},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+"""Track when an event queue entry was claimed by the event worker."""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_ssot_citrix_adm", "0002_eventqueueentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventqueueentry",
+            name="claimed",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
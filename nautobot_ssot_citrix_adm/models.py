@@ -0,0 +1,31 @@
+"""Models for the nautobot_ssot_citrix_adm plugin."""
+from django.db import models
+from nautobot.core.models import BaseModel
+
+
+class EventQueueEntry(BaseModel):
+    """ADC waiting to be synced after Citrix ADM sent event notifications about it.
+
+    Repeated events for the same ADC update its entry instead of adding a new one and push back when it's due. An entry
+    is only removed once the sync of its ADC was enqueued, until then it's marked as claimed by the event worker.
+    """
+
+    instance = models.ForeignKey(to="extras.ExternalIntegration", on_delete=models.CASCADE, related_name="+")
+    tenant = models.ForeignKey(to="tenancy.Tenant", on_delete=models.CASCADE, related_name="+", blank=True, null=True)
+    hostname = models.CharField(max_length=255)
+    event = models.CharField(max_length=255, blank=True)
+    events = models.PositiveIntegerField(default=1)
+    created = models.DateTimeField(auto_now_add=True)
+    due = models.DateTimeField(db_index=True)
+    claimed = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        """Meta data for EventQueueEntry."""
+
+        ordering = ["due"]
+        unique_together = [["instance", "hostname"]]
+        verbose_name_plural = "event queue entries"
+
+    def __str__(self):
+        """Return the hostname and when it's due."""
+        return f"{self.hostname} due {self.due.isoformat()}"
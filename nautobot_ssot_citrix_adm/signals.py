@@ -1,64 +1,177 @@
 """Signals triggered when Nautobot starts to perform certain actions."""
 
+import hashlib
+import json
 from nautobot.extras.choices import CustomFieldTypeChoices
 
+PLATFORM_DEFAULTS = {
+    "name": "citrix.adc",
+    "napalm_driver": "netscaler",
+    "network_driver": "citrix_netscaler",
+}
+CUSTOM_FIELDS = {
+    "ha_node": {
+        "key": "ha_node",
+        "type": CustomFieldTypeChoices.TYPE_TEXT,
+        "label": "HA Node",
+    },
+    "os_version": {
+        "key": "os_version",
+        "type": CustomFieldTypeChoices.TYPE_TEXT,
+        "label": "OS Version",
+    },
+    "system_of_record": {
+        "type": CustomFieldTypeChoices.TYPE_TEXT,
+        "key": "system_of_record",
+        "label": "System of Record",
+    },
+    "ssot_last_synchronized": {
+        "type": CustomFieldTypeChoices.TYPE_DATE,
+        "key": "ssot_last_synchronized",
+        "label": "Last sync from System of Record",
+    },
+}
+CUSTOM_FIELD_MODELS = {
+    "ha_node": [("dcim", "device")],
+    "os_version": [("dcim", "device")],
+    "system_of_record": [("dcim", "device"), ("dcim", "interface"), ("ipam", "prefix"), ("ipam", "ipaddress")],
+    "ssot_last_synchronized": [("dcim", "device"), ("dcim", "interface"), ("ipam", "prefix"), ("ipam", "ipaddress")],
+}
+EXPECTED_STATE = {
+    "location_types": {"Region": {"nestable": True}, "Site": {"parent": "Region"}},
+    "location_type_content_types": [["Site", "dcim", "device"]],
+    "platforms": {"citrix.adc": {**PLATFORM_DEFAULTS, "manufacturer": "Citrix"}},
+    "custom_fields": {key: {"type": cf["type"]} for key, cf in CUSTOM_FIELDS.items()},
+    "custom_field_content_types": sorted(
+        [key, app_label, model] for key, models in CUSTOM_FIELD_MODELS.items() for app_label, model in models
+    ),
+}
+
+
+def get_fingerprint(state: dict) -> str:
+    """Hash a bootstrap state dictionary.
+
+    Args:
+        state (dict): Bootstrap state as built by `get_bootstrap_state()` or `EXPECTED_STATE`.
+
+    Returns:
+        str: SHA-256 hex digest of the state.
+    """
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+
+EXPECTED_FINGERPRINT = get_fingerprint(EXPECTED_STATE)
+
+
+def get_bootstrap_state(apps) -> dict:
+    """Read the current state of the objects created by `nautobot_database_ready_callback` in a handful of queries.
+
+    Only the fields and content types the callback sets are read so unrelated changes don't cause a mismatch.
+    CustomFields are compared by key and type only as their labels can be edited by users.
+
+    Args:
+        apps (Apps): Django app registry passed to the callback.
+
+    Returns:
+        dict: Bootstrap state in the same structure as `EXPECTED_STATE`.
+    """
+    # pylint: disable=invalid-name
+    CustomField = apps.get_model("extras", "CustomField")
+    LocationType = apps.get_model("dcim", "LocationType")
+    Platform = apps.get_model("dcim", "Platform")
+
+    location_types = {}
+    for loc_type in LocationType.objects.filter(name__in=["Region", "Site"]).select_related("parent"):
+        if loc_type.name == "Region":
+            location_types[loc_type.name] = {"nestable": loc_type.nestable}
+        else:
+            location_types[loc_type.name] = {"parent": loc_type.parent.name if loc_type.parent else None}
+    platforms = {
+        name: {"name": name, "napalm_driver": napalm_driver, "network_driver": network_driver, "manufacturer": manu}
+        for name, napalm_driver, network_driver, manu in Platform.objects.filter(
+            name=PLATFORM_DEFAULTS["name"]
+        ).values_list("name", "napalm_driver", "network_driver", "manufacturer__name")
+    }
+    custom_fields = {
+        key: {"type": cf_type}
+        for key, cf_type in CustomField.objects.filter(key__in=CUSTOM_FIELDS).values_list("key", "type")
+    }
+    lt_through = LocationType._meta.get_field("content_types").remote_field.through
+    cf_through = CustomField._meta.get_field("content_types").remote_field.through
+    expected_cf_cts = {tuple(row) for row in EXPECTED_STATE["custom_field_content_types"]}
+    return {
+        "location_types": location_types,
+        "location_type_content_types": [
+            list(row)
+            for row in lt_through.objects.filter(
+                locationtype__name="Site", contenttype__app_label="dcim", contenttype__model="device"
+            ).values_list("locationtype__name", "contenttype__app_label", "contenttype__model")
+        ],
+        "platforms": platforms,
+        "custom_fields": custom_fields,
+        "custom_field_content_types": sorted(
+            list(row)
+            for row in cf_through.objects.filter(customfield__key__in=CUSTOM_FIELDS).values_list(
+                "customfield__key", "contenttype__app_label", "contenttype__model"
+            )
+            if row in expected_cf_cts
+        ),
+    }
+
+
+def bulk_add_content_types(model, pairs: list):
+    """Add content types to objects of a model with a single insert into the `content_types` through table.
+
+    Args:
+        model (Model): Model class with a `content_types` ManyToManyField.
+        pairs (list): List of tuples of object and ContentType to be associated.
+    """
+    field = model._meta.get_field("content_types")
+    through = field.remote_field.through
+    through.objects.bulk_create(
+        [
+            through(**{f"{field.m2m_field_name()}_id": obj.pk, f"{field.m2m_reverse_field_name()}_id": ct.pk})
+            for obj, ct in pairs
+        ],
+        ignore_conflicts=True,
+    )
+
 
 def nautobot_database_ready_callback(sender, *, apps, **kwargs):  # pylint: disable=unused-argument
     """Ensure the Citrix Manufacturer is in place for DeviceTypes to use. Adds OS Version CustomField to Devices and System of Record and Last Sync'd to Site, Device, Interface, and IPAddress.
 
     Callback function triggered by the nautobot_database_ready signal when the Nautobot database is fully ready.
+    All writes are skipped when the fingerprint of the current state matches the expected state.
     """
-    # pylint: disable=invalid-name, too-many-locals
+    if get_fingerprint(get_bootstrap_state(apps)) == EXPECTED_FINGERPRINT:
+        return
+    # pylint: disable=invalid-name
     ContentType = apps.get_model("contenttypes", "ContentType")
     CustomField = apps.get_model("extras", "CustomField")
     Manufacturer = apps.get_model("dcim", "Manufacturer")
     LocationType = apps.get_model("dcim", "LocationType")
-    Device = apps.get_model("dcim", "Device")
-    Interface = apps.get_model("dcim", "Interface")
-    Prefix = apps.get_model("ipam", "Prefix")
-    IPAddress = apps.get_model("ipam", "IPAddress")
     Platform = apps.get_model("dcim", "Platform")
 
     region = LocationType.objects.update_or_create(name="Region", defaults={"nestable": True})[0]
     site = LocationType.objects.update_or_create(name="Site", defaults={"parent": region})[0]
-    site.content_types.add(ContentType.objects.get_for_model(Device))
+    device_ct = ContentType.objects.get_for_model(apps.get_model("dcim", "Device"))
+    bulk_add_content_types(LocationType, [(site, device_ct)])
 
     citrix_manu, _ = Manufacturer.objects.update_or_create(name="Citrix")
     Platform.objects.update_or_create(
-        name="citrix.adc",
-        defaults={
-            "name": "citrix.adc",
-            "napalm_driver": "netscaler",
-            "manufacturer": citrix_manu,
-            "network_driver": "citrix_netscaler",
-        },
+        name=PLATFORM_DEFAULTS["name"],
+        defaults={**PLATFORM_DEFAULTS, "manufacturer": citrix_manu},
+    )
+    custom_fields = {}
+    for key in ["ha_node", "os_version"]:
+        custom_fields[key], _ = CustomField.objects.get_or_create(key=key, defaults=CUSTOM_FIELDS[key])
+    for key in ["system_of_record", "ssot_last_synchronized"]:
+        custom_fields[key], _ = CustomField.objects.update_or_create(key=key, defaults=CUSTOM_FIELDS[key])
+    bulk_add_content_types(
+        CustomField,
+        [
+            (custom_fields[key], ContentType.objects.get_for_model(apps.get_model(app_label, model)))
+            for key, models in CUSTOM_FIELD_MODELS.items()
+            for app_label, model in models
+        ],
     )
-    ha_node_cf_dict = {
-        "key": "ha_node",
-        "type": CustomFieldTypeChoices.TYPE_TEXT,
-        "label": "HA Node",
-    }
-    ha_node_field, _ = CustomField.objects.get_or_create(key=ha_node_cf_dict["key"], defaults=ha_node_cf_dict)
-    ha_node_field.content_types.add(ContentType.objects.get_for_model(Device))
-    os_cf_dict = {
-        "key": "os_version",
-        "type": CustomFieldTypeChoices.TYPE_TEXT,
-        "label": "OS Version",
-    }
-    ver_field, _ = CustomField.objects.get_or_create(key=os_cf_dict["key"], defaults=os_cf_dict)
-    ver_field.content_types.add(ContentType.objects.get_for_model(Device))
-    sor_cf_dict = {
-        "type": CustomFieldTypeChoices.TYPE_TEXT,
-        "key": "system_of_record",
-        "label": "System of Record",
-    }
-    sor_custom_field, _ = CustomField.objects.update_or_create(key=sor_cf_dict["key"], defaults=sor_cf_dict)
-    sync_cf_dict = {
-        "type": CustomFieldTypeChoices.TYPE_DATE,
-        "key": "ssot_last_synchronized",
-        "label": "Last sync from System of Record",
-    }
-    sync_custom_field, _ = CustomField.objects.update_or_create(key=sync_cf_dict["key"], defaults=sync_cf_dict)
-    for model in [Device, Interface, Prefix, IPAddress]:
-        sor_custom_field.content_types.add(ContentType.objects.get_for_model(model))
-        sync_custom_field.content_types.add(ContentType.objects.get_for_model(model))
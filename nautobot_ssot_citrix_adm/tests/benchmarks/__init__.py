@@ -0,0 +1 @@
+"""Benchmarks for nautobot_ssot_citrix_adm run with pytest-benchmark."""
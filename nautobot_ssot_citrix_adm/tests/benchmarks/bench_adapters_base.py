@@ -0,0 +1,69 @@
+"""Benchmark loading 100k mixed DiffSync models into an adapter with and without trusted load."""
+from unittest.mock import MagicMock
+import pytest
+from nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm import CitrixAdmAdapter
+
+DATACENTERS = 50
+DEVICES = 1000
+PORTS = 40
+ADDRESSES = 30
+
+
+def build_snapshot() -> dict:
+    """Build a snapshot of about 100k Datacenters, Devices, Ports, Prefixes, IP Addresses and mappings."""
+    snapshot = {"datacenter": [], "device": [], "port": [], "prefix": [], "address": [], "ip_on_intf": []}
+    for idx in range(DATACENTERS):
+        snapshot["datacenter"].append(
+            {"name": f"DC{idx}", "region": "Global", "latitude": 1.5, "longitude": 2.5, "uuid": None}
+        )
+    for dev_idx in range(DEVICES):
+        name = f"SYNTH-ADC{dev_idx}"
+        snapshot["device"].append(
+            {
+                "name": name,
+                "model": "SDX",
+                "role": "Synthetic",
+                "serial": f"SN{dev_idx}",
+                "site": f"DC{dev_idx % DATACENTERS}",
+                "status": "Active",
+                "tenant": None,
+                "version": "NS13.1: Build 37.38.nc",
+                "hanode": None,
+                "uuid": None,
+            }
+        )
+        prefix = f"10.{dev_idx // 256}.{dev_idx % 256}.0/24"
+        snapshot["prefix"].append({"prefix": prefix, "namespace": "Global", "tenant": None, "uuid": None})
+        for port_idx in range(PORTS):
+            snapshot["port"].append(
+                {"name": f"1/{port_idx}", "device": name, "status": "Active", "description": "", "uuid": None}
+            )
+        for addr_idx in range(ADDRESSES):
+            address = f"10.{dev_idx // 256}.{dev_idx % 256}.{addr_idx + 1}/24"
+            snapshot["address"].append(
+                {"address": address, "prefix": prefix, "tenant": None, "tags": ["SNIP"], "uuid": None}
+            )
+            snapshot["ip_on_intf"].append(
+                {"address": address, "device": name, "port": f"1/{addr_idx}", "primary": addr_idx == 0, "uuid": None}
+            )
+    return snapshot
+
+
+SNAPSHOT = build_snapshot()
+
+
+@pytest.mark.benchmark(group="load 100k models")
+@pytest.mark.parametrize("trusted_load", [False, True], ids=["validated", "trusted"])
+def test_load_snapshot(benchmark, trusted_load):
+    """Benchmark loading the models through `new_model()` and `add()` as the adapters' load methods do."""
+    adapters = []
+
+    def setup():
+        adapter = CitrixAdmAdapter(job=MagicMock(debug=False), instances=[])
+        adapter.trusted_load = trusted_load
+        adapters.append(adapter)
+        return (adapter,), {}
+
+    benchmark.pedantic(lambda adapter: adapter.load_snapshot(SNAPSHOT), setup=setup, rounds=3)
+    assert sum(len(objects) for objects in SNAPSHOT.values()) >= 100_000
+    assert len(adapters[-1].get_all("ip_on_intf")) == DEVICES * ADDRESSES
@@ -0,0 +1,38 @@
+"""Benchmark the import time of the modules Nautobot imports when it registers the Jobs and API views."""
+import subprocess  # nosec
+import sys
+
+# Cumulative import time budget in microseconds of each module once Nautobot is set up.
+IMPORT_TIME_BUDGET = {
+    "nautobot_ssot_citrix_adm.jobs": 250_000,
+    "nautobot_ssot_citrix_adm.api.views": 250_000,
+}
+
+IMPORT_SCRIPT = """
+import nautobot
+nautobot.setup()
+import nautobot_ssot.jobs.base
+import nautobot_ssot_citrix_adm.jobs
+import nautobot_ssot_citrix_adm.api.views
+"""
+
+
+def measure_import_times() -> dict:
+    """Import the modules in a fresh interpreter with `-X importtime` and read their cumulative import times."""
+    result = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT], capture_output=True, check=True, text=True
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                import_times[module.strip()] = int(cumulative)
+    return import_times
+
+
+def test_import_time_budget(benchmark):
+    """Benchmark importing the Jobs and API views and validate each stays under its import time budget."""
+    import_times = benchmark.pedantic(measure_import_times, rounds=3)
+    for module, budget in IMPORT_TIME_BUDGET.items():
+        assert import_times[module] < budget, f"{module} took {import_times[module]} us to import."
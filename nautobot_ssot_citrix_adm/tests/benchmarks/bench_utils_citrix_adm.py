@@ -0,0 +1,59 @@
+"""Benchmark the Citrix ADM parsing functions with synthetic ADCs of increasing size."""
+from copy import deepcopy
+from unittest.mock import MagicMock
+import pytest
+from nautobot_ssot_citrix_adm.utils.synthetic import SyntheticAdc
+from nautobot_ssot_citrix_adm.utils.citrix_adm import (
+    parse_hostname_for_role,
+    parse_nsip6s,
+    parse_nsips,
+    parse_version,
+    parse_vlan_bindings,
+)
+
+SCALES = [10, 100, 1000]
+HOSTNAME_MAP = [(rf".*-{role}\d+$", role) for role in ["LB", "WAF", "GSLB", "VPN"]] + [(r"SYNTH-ADC\d+", "Synthetic")]
+JOB = MagicMock(debug=False)
+
+
+@pytest.fixture(name="adc", scope="module", params=SCALES, ids=lambda scale: f"{scale}-per-adc")
+def fixture_adc(request):
+    """Synthetic ADC with the same number of VLANs and SNIPs."""
+    return SyntheticAdc(vlans=request.param, snips=request.param, seed=1)
+
+
+def test_parse_vlan_bindings(benchmark, adc):
+    """Benchmark parse_vlan_bindings()."""
+    ports = benchmark(parse_vlan_bindings, vlan_bindings=adc.vlan_bindings, adc=adc.device, job=JOB)
+    assert len(ports) == len(adc.subnets)
+
+
+def test_parse_nsips(benchmark, adc):
+    """Benchmark parse_nsips() on a fresh copy of the parsed VLAN bindings each round."""
+    ports = parse_vlan_bindings(vlan_bindings=adc.vlan_bindings, adc=adc.device, job=JOB)
+    result = benchmark.pedantic(
+        parse_nsips,
+        setup=lambda: ((), {"nsips": adc.nsips, "ports": deepcopy(ports), "adc": adc.device}),
+        rounds=1 if len(adc.subnets) >= 1000 else 5,
+    )
+    assert len(result) == len(ports) + len(adc.nsips) - 1
+
+
+def test_parse_nsip6s(benchmark, adc):
+    """Benchmark parse_nsip6s() on a fresh copy of the parsed VLAN bindings each round."""
+    ports = parse_vlan_bindings(vlan_bindings=adc.vlan_bindings, adc=adc.device, job=JOB)
+    result = benchmark.pedantic(
+        parse_nsip6s, setup=lambda: ((), {"nsip6s": adc.nsip6s, "ports": deepcopy(ports)}), rounds=10
+    )
+    assert len(result) == len(ports) + len(adc.nsip6s)
+
+
+def test_parse_version(benchmark, adc):
+    """Benchmark parse_version()."""
+    assert benchmark(parse_version, version=adc.device["version"]) == "NS12.1: Build 63.22.nc"
+
+
+def test_parse_hostname_for_role(benchmark, adc):
+    """Benchmark parse_hostname_for_role()."""
+    role = benchmark(parse_hostname_for_role, hostname_map=HOSTNAME_MAP, device_hostname=adc.device["hostname"])
+    assert role == "Synthetic"
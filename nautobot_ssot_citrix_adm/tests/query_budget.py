@@ -0,0 +1,25 @@
+"""Query budget assertions for tests."""
+from contextlib import contextmanager
+from nautobot_ssot_citrix_adm.utils.nautobot import QueryCounter, render_shape_table
+
+
+class QueryBudgetMixin:
+    """Mixin for test cases asserting code stays within a budget of database queries."""
+
+    @contextmanager
+    def assertQueryBudget(self, budget: int):  # pylint: disable=invalid-name
+        """Assert the code run in the context executes at most `budget` queries.
+
+        The failure message lists the most repeated queries to point at the N+1 query responsible.
+
+        Args:
+            budget (int): Maximum number of queries.
+        """
+        with QueryCounter(track_shapes=True) as queries:
+            yield queries
+        self.assertLessEqual(
+            queries.count,
+            budget,
+            msg=f"{queries.count} queries exceed the budget of {budget}. Most repeated queries:\n"
+            f"{render_shape_table(queries.repeated_shapes())}",
+        )
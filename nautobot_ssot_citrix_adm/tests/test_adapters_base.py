@@ -0,0 +1,37 @@
+"""Test the base DiffSync adapter shared by the Citrix ADM and Nautobot adapters."""
+
+from unittest.mock import patch
+from django.test import override_settings
+from nautobot.core.testing import TestCase
+from pydantic import ValidationError
+from nautobot_ssot_citrix_adm.diffsync.adapters.base import BaseAdapter
+from nautobot_ssot_citrix_adm.diffsync.models.base import Port
+
+
+class TestBaseAdapter(TestCase):
+    """Test the BaseAdapter class."""
+
+    def test_new_model_validates_by_default(self):
+        """Validate the new_model() method validates fields unless trusted load is enabled."""
+        adapter = BaseAdapter()
+        self.assertFalse(adapter.trusted_load)
+        with self.assertRaises(ValidationError):
+            adapter.new_model(Port, name="0/1", device="TEST", status=None, description="", uuid=None)
+
+    @override_settings(PLUGINS_CONFIG={"nautobot_ssot_citrix_adm": {"trusted_load": True}})
+    def test_new_model_trusted_load(self):
+        """Validate the new_model() method builds the same model without validation when trusted load is enabled."""
+        adapter = BaseAdapter()
+        values = {"name": "0/1", "device": "TEST", "status": "Active", "description": "", "uuid": None}
+        trusted = adapter.new_model(Port, **values)
+        self.assertEqual(trusted.get_unique_id(), Port(**values).get_unique_id())
+        self.assertEqual(trusted.get_attrs(), Port(**values).get_attrs())
+        self.assertEqual(trusted.model_flags, Port(**values).model_flags)
+
+    @override_settings(PLUGINS_CONFIG={"nautobot_ssot_citrix_adm": {"trusted_load": True}})
+    def test_new_model_trusted_load_skips_validation(self):
+        """Validate the new_model() method doesn't validate fields when trusted load is enabled."""
+        adapter = BaseAdapter()
+        with patch.object(Port, "__init__", side_effect=AssertionError("Port was validated.")):
+            port = adapter.new_model(Port, name="0/1", device="TEST", status=None, description="", uuid=None)
+        self.assertIsNone(port.status)
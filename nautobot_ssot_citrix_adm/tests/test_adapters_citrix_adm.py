@@ -1,5 +1,6 @@
 """Test Citrix ADM adapter."""
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+import requests
 from diffsync.exceptions import ObjectNotFound
 from nautobot.extras.models import JobResult
 from nautobot.core.testing import TransactionTestCase
@@ -59,7 +60,7 @@ class TestCitrixAdmAdapterTestCase(TransactionTestCase):  # pylint: disable=too-
             {"ARIA__West"},
             {site.get_unique_id() for site in self.citrix_adm.get_all("datacenter")},
         )
-        self.job.logger.info.assert_called_with("Attempting to load DC: ARIA")
+        self.job.logger.info.assert_called_with("Attempting to load DC: %s", "ARIA")
 
     def test_load_site_duplicate(self):
         """Test Nautobot SSoT Citrix ADM load_site() function with duplicate site."""
@@ -67,9 +68,7 @@ class TestCitrixAdmAdapterTestCase(TransactionTestCase):  # pylint: disable=too-
         self.job.debug = True
         self.citrix_adm.load_site(site_info=site_info)
         self.citrix_adm.load_site(site_info=site_info)
-        self.job.logger.warning.assert_called_with(
-            "Duplicate Site attempting to be loaded: {'city': 'New York City', 'zipcode': '10018', 'type': '1', 'name': 'NTC Corporate HQ', 'region': 'North', 'country': 'USA', 'longitude': '-73.989429', 'id': '7d29e100-ae0c-4580-ba86-b72df0b6cfd8', 'latitude': '40.753146'}."
-        )
+        self.job.logger.warning.assert_called_with("Duplicate Site attempting to be loaded: %s.", site_info)
 
     def test_load_devices(self):
         """Test the Nautobot SSoT Citrix ADM load_devices() function."""
@@ -81,6 +80,109 @@ class TestCitrixAdmAdapterTestCase(TransactionTestCase):  # pylint: disable=too-
             {dev.get_unique_id() for dev in self.citrix_adm.get_all("device")},
         )
 
+    def test_load_devices_shard(self):
+        """Test the Nautobot SSoT Citrix ADM load_devices() function only loads Devices in its Datacenter shard."""
+        loaded = []
+        for shard_index in range(2):
+            adapter = CitrixAdmAdapter(job=self.job, sync=None, instances=[self.instance], shard=(shard_index, 2))
+            adapter.conn = self.citrix_adm_client
+            adapter.adm_site_map = {dev["datacenter_id"]: SITE_FIXTURE_RECV[1] for dev in DEVICE_FIXTURE_RECV}
+            adapter.load_devices()
+            loaded.append({dev.get_unique_id() for dev in adapter.get_all("device")})
+        self.assertFalse(loaded[0] & loaded[1])
+        self.assertEqual(loaded[0] | loaded[1], {dev["hostname"] for dev in DEVICE_FIXTURE_RECV})
+
+    def test_load_devices_hostname(self):
+        """Test the Nautobot SSoT Citrix ADM load_devices() function only requests and loads the Device with the hostname."""
+        hostname = DEVICE_FIXTURE_RECV[0]["hostname"]
+        adapter = CitrixAdmAdapter(job=self.job, sync=None, instances=[self.instance], hostname=hostname)
+        adapter.conn = self.citrix_adm_client
+        adapter.adm_site_map = {dev["datacenter_id"]: SITE_FIXTURE_RECV[1] for dev in DEVICE_FIXTURE_RECV}
+        adapter.load_devices()
+        self.citrix_adm_client.get_devices.assert_called_once_with(filters={"hostname": hostname})
+        self.assertEqual({dev.get_unique_id() for dev in adapter.get_all("device")}, {hostname})
+
+    def test_load_devices_datacenter(self):
+        """Test the Nautobot SSoT Citrix ADM load_devices() function only loads the Devices of the Datacenter."""
+        site = SITE_FIXTURE_RECV[2]
+        adapter = CitrixAdmAdapter(job=self.job, sync=None, instances=[self.instance], datacenter=site["name"])
+        adapter.conn = self.citrix_adm_client
+        adapter.adm_site_map = {site["id"]: site, DEVICE_FIXTURE_RECV[1]["datacenter_id"]: SITE_FIXTURE_RECV[1]}
+        self.citrix_adm_client.get_devices.return_value = [
+            {**DEVICE_FIXTURE_RECV[0], "datacenter_id": site["id"]},
+            DEVICE_FIXTURE_RECV[1],
+        ]
+        adapter.load_devices()
+        self.citrix_adm_client.get_devices.assert_called_once_with(filters={"datacenter_id": site["id"]})
+        self.assertEqual(
+            {dev.get_unique_id() for dev in adapter.get_all("device")}, {DEVICE_FIXTURE_RECV[0]["hostname"]}
+        )
+        self.assertEqual({dc.name for dc in adapter.get_all("datacenter")}, {site["name"]})
+
+    def test_load_devices_unknown_datacenter(self):
+        """Test the Nautobot SSoT Citrix ADM load_devices() function doesn't request Devices for an unknown Datacenter."""
+        adapter = CitrixAdmAdapter(job=self.job, sync=None, instances=[self.instance], datacenter="Missing")
+        adapter.conn = self.citrix_adm_client
+        adapter.adm_site_map = {site["id"]: site for site in SITE_FIXTURE_RECV}
+        adapter.load_devices()
+        self.citrix_adm_client.get_devices.assert_not_called()
+        self.assertEqual(len(adapter.get_all("device")), 0)
+
+    def test_create_port_map_ha_pair(self):
+        """Test the create_port_map() function only fully polls the primary node of an HA pair."""
+        primary = {**DEVICE_FIXTURE_RECV[0], "ha_master_state": "Primary"}
+        secondary = {
+            **DEVICE_FIXTURE_RECV[0],
+            "hostname": "SECONDARY",
+            "ip_address": primary["ha_ip_address"],
+            "ha_ip_address": primary["ip_address"],
+            "ha_master_state": "Secondary",
+        }
+        self.citrix_adm.adm_device_map = {adc["hostname"]: adc for adc in [secondary, primary]}
+        self.citrix_adm_client.get_vlan_bindings.side_effect = None
+        self.citrix_adm_client.get_vlan_bindings.return_value = VLAN_FIXTURE_RECV[0]
+        self.citrix_adm_client.get_nsip.return_value = [
+            {"ipaddress": primary["ip_address"], "netmask": primary["netmask"], "type": "NSIP"}
+        ]
+        self.citrix_adm_client.get_nsip6.side_effect = None
+        self.citrix_adm_client.get_nsip6.return_value = []
+        self.citrix_adm.create_port_map()
+        self.citrix_adm_client.get_vlan_bindings.assert_called_once_with(primary)
+        self.citrix_adm_client.get_nsip.assert_called_once_with(primary)
+        self.assertEqual(self.citrix_adm_client.get_nsip6.call_count, 2)
+        for adc in [primary, secondary]:
+            self.assertIn(
+                adc["ip_address"],
+                [port["ipaddress"] for port in self.citrix_adm.adm_device_map[adc["hostname"]]["ports"]],
+            )
+        self.assertNotIn(
+            primary["ip_address"], [port["ipaddress"] for port in self.citrix_adm.adm_device_map["SECONDARY"]["ports"]]
+        )
+
+    def test_snapshot_round_trip(self):
+        """Test the dump_snapshot() and load_snapshot() functions restore all loaded objects."""
+        self.citrix_adm.load_site(site_info=SITE_FIXTURE_RECV[2])
+        self.citrix_adm.load_prefix(prefix="10.0.0.0/24")
+        self.citrix_adm.load_address(address="10.0.0.1/24", prefix="10.0.0.0/24", tags=["MGMT"])
+        self.citrix_adm.load_address_to_interface(address="10.0.0.1/24", device="TEST", port="mgmt", primary=True)
+        snapshot = self.citrix_adm.dump_snapshot()
+        restored = CitrixAdmAdapter(job=self.job, sync=None, instances=[])
+        restored.load_snapshot(snapshot)
+        restored.load_snapshot(snapshot)
+        self.assertEqual(restored.dump_snapshot(), snapshot)
+        self.assertFalse(self.citrix_adm.diff_to(restored).has_diffs())
+
+    def test_snapshot_file_round_trip(self):
+        """Test the dump_snapshot_file() and load_snapshot_file() functions restore all loaded objects."""
+        self.citrix_adm.load_site(site_info=SITE_FIXTURE_RECV[2])
+        self.citrix_adm.load_prefix(prefix="10.0.0.0/24")
+        self.citrix_adm.load_address(address="10.0.0.1/24", prefix="10.0.0.0/24", tags=["MGMT"])
+        data = self.citrix_adm.dump_snapshot_file()
+        self.assertEqual(data[:2], b"\x1f\x8b")
+        restored = CitrixAdmAdapter(job=self.job, sync=None, instances=[])
+        restored.load_snapshot_file(data)
+        self.assertEqual(restored.dump_snapshot(), self.citrix_adm.dump_snapshot())
+
     def test_load_devices_duplicate(self):
         """Test the Nautobot SSoT Citrix ADM load_devices() function with duplicate devices."""
         self.citrix_adm.adm_site_map[DEVICE_FIXTURE_RECV[3]["datacenter_id"]] = SITE_FIXTURE_RECV[2]
@@ -88,14 +190,121 @@ class TestCitrixAdmAdapterTestCase(TransactionTestCase):  # pylint: disable=too-
         self.citrix_adm.load_devices()
         self.citrix_adm.load_devices()
         self.job.logger.warning.assert_called_with(
-            "Duplicate Device attempting to be loaded: OGI-MSCI-IMS-Mctdgj-Pqsf-M"
+            "Duplicate Device attempting to be loaded: %s", "OGI-MSCI-IMS-Mctdgj-Pqsf-M"
         )
 
     def test_load_devices_without_hostname(self):
         """Test the Nautobot SSoT Citrix ADM load_devices() function with a device missing hostname."""
         self.citrix_adm_client.get_devices.return_value = [{"hostname": ""}]
         self.citrix_adm.load_devices()
-        self.job.logger.warning.assert_called_with("Device without hostname will not be loaded. {'hostname': ''}")
+        self.job.logger.warning.assert_called_with("Device without hostname will not be loaded. %s", {"hostname": ""})
+
+    def test_assign_devices(self):
+        """Test the assign_devices() function assigns each Device to one instance by priority, then latency."""
+        sessions = []
+        for name, latency in [("Slow", 0.5), ("Fast", 0.1), ("Preferred", 0.9)]:
+            instance = MagicMock()
+            instance.name = name
+            sessions.append({"instance": instance, "devices": DEVICE_FIXTURE_RECV[:2], "latency": latency})
+        sessions[0]["devices"] = DEVICE_FIXTURE_RECV[1:3]
+        with patch.dict(
+            "nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.settings.PLUGINS_CONFIG",
+            {"nautobot_ssot_citrix_adm": {"instance_priority": ["Preferred"]}},
+        ):
+            self.citrix_adm.assign_devices(sessions)
+        self.assertEqual(sessions[2]["assigned"], DEVICE_FIXTURE_RECV[:2])
+        self.assertEqual(sessions[1]["assigned"], [])
+        self.assertEqual(sessions[0]["assigned"], [DEVICE_FIXTURE_RECV[2]])
+        self.job.logger.info.assert_any_call("Skipping %s Devices managed by more than one Citrix ADM instance.", 3)
+
+    def test_assign_devices_matches_hostname_variants_and_nsip(self):
+        """Test the assign_devices() function recognizes an ADC by its FQDN, hostname casing, or NSIP."""
+        first, second = MagicMock(), MagicMock()
+        first.name, second.name = "First", "Second"
+        adc = DEVICE_FIXTURE_RECV[0]
+        sessions = [
+            {"instance": first, "devices": [adc], "latency": 0.1},
+            {
+                "instance": second,
+                "devices": [
+                    {**adc, "hostname": f"{adc['hostname'].lower()}.example.com"},
+                    {**adc, "hostname": "RENAMED-ADC"},
+                    {**DEVICE_FIXTURE_RECV[1], "hostname": "RENAMED-ADC"},
+                ],
+                "latency": 0.2,
+            },
+        ]
+        self.citrix_adm.assign_devices(sessions)
+        self.assertEqual(sessions[0]["assigned"], [adc])
+        self.assertEqual(sessions[1]["assigned"], [])
+        self.job.logger.info.assert_any_call("Skipping %s Devices managed by more than one Citrix ADM instance.", 3)
+
+    @patch("nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.prefetch_credentials")
+    @patch("nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.CitrixNitroClient")
+    def test_load_polls_each_device_once(self, mock_client, mock_prefetch):
+        """Test the load() function only polls a Device managed by several instances through one of them."""
+        clients = []
+        for _ in range(2):
+            client = MagicMock()
+            client.get_sites.return_value = [{**SITE_FIXTURE_RECV[1], "id": DEVICE_FIXTURE_RECV[0]["datacenter_id"]}]
+            client.get_devices.return_value = DEVICE_FIXTURE_RECV[:1]
+            client.get_vlan_bindings.return_value = VLAN_FIXTURE_RECV[0]
+            client.get_nsip.return_value = []
+            client.get_nsip6.return_value = []
+            clients.append(client)
+        mock_client.side_effect = clients
+        second = MagicMock()
+        second.name = "Second"
+        adapter = CitrixAdmAdapter(job=self.job, sync=None, instances=[self.instance, second])
+        adapter.load()
+        self.assertEqual(len(adapter.get_all("device")), 1)
+        self.assertEqual(
+            [client.get_vlan_bindings.call_count for client in clients].count(1), 1, "ADC polled more than once."
+        )
+        for client in clients:
+            self.assertEqual(client.login.call_count, client.logout.call_count)
+        self.assertEqual(sorted(client.logout.call_count for client in clients), [1, 2])
+        mock_prefetch.assert_called_once_with([self.instance.secrets_group, second.secrets_group])
+
+    def test_load_session_logs_out_on_failure(self):
+        """Test the load_session() function logs out of the instance when polling it fails."""
+        client = MagicMock()
+        client.get_vlan_bindings.side_effect = requests.exceptions.RequestException()
+        session = {
+            "instance": self.instance,
+            "conn": client,
+            "site_map": {DEVICE_FIXTURE_RECV[0]["datacenter_id"]: SITE_FIXTURE_RECV[1]},
+            "assigned": DEVICE_FIXTURE_RECV[:1],
+        }
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.citrix_adm.load_session(session)
+        client.login.assert_called_once()
+        client.logout.assert_called_once()
+
+    @patch("nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.invalidate_credentials")
+    @patch("nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.get_credentials")
+    @patch("nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.CitrixNitroClient")
+    def test_connect_login_failure(self, mock_client, mock_credentials, mock_invalidate):
+        """Test the connect() function drops the cached credentials of an instance when its login fails."""
+        mock_credentials.return_value = ("admin", "expired")
+        mock_client.return_value.login.side_effect = requests.exceptions.RequestException()
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.citrix_adm.connect(self.instance)
+        mock_invalidate.assert_called_once_with(self.instance.secrets_group)
+
+    @patch("nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.get_credentials", return_value=("admin", "admin"))
+    @patch("nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.CitrixNitroClient")
+    def test_connect_datacenter_managed_elsewhere(
+        self, mock_client, mock_credentials
+    ):  # pylint: disable=unused-argument
+        """Test the connect() function collects the Devices an instance manages outside of the Datacenter being synced."""
+        mock_client.return_value = self.citrix_adm_client
+        self.citrix_adm_client.get_device_hostnames.return_value = [dev["hostname"] for dev in DEVICE_FIXTURE_RECV]
+        self.citrix_adm.datacenter_name = SITE_FIXTURE_RECV[1]["name"]
+        session = self.citrix_adm.connect(self.instance)
+        in_scope = {dev["hostname"] for dev in session["devices"]}
+        self.assertEqual(self.citrix_adm.managed_elsewhere, {dev["hostname"] for dev in DEVICE_FIXTURE_RECV} - in_scope)
+        self.citrix_adm_client.logout.assert_called_once()
 
     def test_load_ports(self):
         """Test the Nautobot SSoT Citrix ADM load_ports() function."""
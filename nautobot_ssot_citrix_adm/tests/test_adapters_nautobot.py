@@ -1,9 +1,12 @@
 """Test Nautobot adapter."""
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import ProtectedError
-from diffsync.exceptions import ObjectNotFound
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from diffsync.enum import DiffSyncModelFlags
+from diffsync.exceptions import ObjectNotCreated, ObjectNotFound
 from nautobot.dcim.models import (
     Device,
     DeviceType,
@@ -12,15 +15,24 @@ from nautobot.dcim.models import (
     LocationType,
     Manufacturer,
 )
-from nautobot.extras.models import Status, JobResult, Role
+from nautobot.extras.models import Status, JobResult, Role, Tag
 from nautobot.ipam.models import IPAddress, IPAddressToInterface, Namespace, Prefix
 from nautobot.core.testing import TransactionTestCase
 from nautobot.tenancy.models import Tenant
 from nautobot_ssot_citrix_adm.diffsync.adapters.nautobot import NautobotAdapter
+from nautobot_ssot_citrix_adm.diffsync.models.nautobot import (
+    NautobotAddress,
+    NautobotIPAddressOnInterface,
+    NautobotPort,
+    NautobotSubnet,
+)
 from nautobot_ssot_citrix_adm.jobs import CitrixAdmDataSource
+from nautobot_ssot_citrix_adm.tests.query_budget import QueryBudgetMixin
+
+LOAD_QUERY_BUDGET = 20
 
 
-class NautobotDiffSyncTestCase(TransactionTestCase):
+class NautobotDiffSyncTestCase(QueryBudgetMixin, TransactionTestCase):
     """Test the NautobotAdapter class."""
 
     databases = ("default", "job_logs")
@@ -131,7 +143,7 @@ class NautobotDiffSyncTestCase(TransactionTestCase):
             },
             {site.get_unique_id() for site in self.nb_adapter.get_all("datacenter")},
         )
-        self.job.logger.info.assert_called_once_with("Loading Site HQ from Nautobot.")
+        self.job.logger.info.assert_called_once_with("Loading Site %s from Nautobot.", "HQ")
 
     def test_load_devices(self):
         """Test the load_devices() function."""
@@ -140,7 +152,7 @@ class NautobotDiffSyncTestCase(TransactionTestCase):
             {"edge-fw.test.com"},
             {dev.get_unique_id() for dev in self.nb_adapter.get_all("device")},
         )
-        self.job.logger.info.assert_any_call("Loading Device edge-fw.test.com from Nautobot.")
+        self.job.logger.info.assert_any_call("Loading Device %s from Nautobot.", "edge-fw.test.com")
 
     def test_load_ports_success(self):
         """Test the load_ports() function success."""
@@ -157,7 +169,7 @@ class NautobotDiffSyncTestCase(TransactionTestCase):
         self.nb_adapter.get.side_effect = ObjectNotFound
         self.nb_adapter.load_ports()
         self.job.logger.warning.assert_called_once_with(
-            "Unable to find edge-fw.test.com loaded so skipping loading port Management."
+            "Unable to find %s loaded so skipping loading port %s.", "edge-fw.test.com", "Management"
         )
 
     def test_load_addresses(self):
@@ -181,44 +193,243 @@ class NautobotDiffSyncTestCase(TransactionTestCase):
 
     def test_sync_complete(self):
         """Test the sync_complete() method in the NautobotAdapter."""
-        self.nb_adapter.objects_to_delete = {
-            "devices": [MagicMock()],
-            "ports": [MagicMock()],
-            "prefixes": [MagicMock()],
-            "addresses": [MagicMock()],
-        }
-        self.nb_adapter.job = MagicMock()
-        self.nb_adapter.job.logger.info = MagicMock()
-
-        deleted_objs = []
-        for group in ["addresses", "ports", "devices"]:
-            deleted_objs.extend(self.nb_adapter.objects_to_delete[group])
+        self.nb_adapter.objects_to_delete["addresses"] = list(IPAddress.objects.all())
+        self.nb_adapter.objects_to_delete["prefixes"] = list(Prefix.objects.all())
+        self.nb_adapter.objects_to_delete["ports"] = list(Interface.objects.all())
+        self.nb_adapter.objects_to_delete["devices"] = list(Device.objects.all())
 
         self.nb_adapter.sync_complete(diff=MagicMock(), source=MagicMock())
 
-        for obj in deleted_objs:
-            self.assertTrue(obj.delete.called)
+        self.assertFalse(IPAddress.objects.exists())
+        self.assertFalse(Prefix.objects.exists())
+        self.assertFalse(Interface.objects.exists())
+        self.assertFalse(Device.objects.exists())
         self.assertEqual(len(self.nb_adapter.objects_to_delete["addresses"]), 0)
         self.assertEqual(len(self.nb_adapter.objects_to_delete["prefixes"]), 0)
         self.assertEqual(len(self.nb_adapter.objects_to_delete["ports"]), 0)
         self.assertEqual(len(self.nb_adapter.objects_to_delete["devices"]), 0)
-        self.assertTrue(self.nb_adapter.job.logger.info.called)
-        self.assertTrue(self.nb_adapter.job.logger.info.call_count, 4)
-        self.assertTrue(self.nb_adapter.job.logger.info.call_args_list[0].startswith("Deleting"))
-        self.assertTrue(self.nb_adapter.job.logger.info.call_args_list[1].startswith("Deleting"))
-        self.assertTrue(self.nb_adapter.job.logger.info.call_args_list[2].startswith("Deleting"))
-        self.assertTrue(self.nb_adapter.job.logger.info.call_args_list[3].startswith("Deleting"))
+        self.job.logger.info.assert_any_call("Deleted %s %s, skipped %s protected %s.", 2, "addresses", 0, "addresses")
+        self.job.logger.info.assert_any_call("Deleted %s %s, skipped %s protected %s.", 2, "prefixes", 0, "prefixes")
+        self.job.logger.info.assert_any_call("Deleted %s %s, skipped %s protected %s.", 1, "ports", 0, "ports")
+        self.job.logger.info.assert_any_call("Deleted %s %s, skipped %s protected %s.", 1, "devices", 0, "devices")
 
     def test_sync_complete_protected_error(self):
         """
-        Tests that ProtectedError exception is handled when deleting objects from Nautobot.
+        Tests that only protected objects are skipped when deleting objects from Nautobot.
         """
-        mock_dev = MagicMock()
-        mock_dev.delete.side_effect = ProtectedError(msg="Cannot delete protected object.", protected_objects=mock_dev)
-        self.nb_adapter.objects_to_delete["devices"].append(mock_dev)
+        empty_pf = Prefix.objects.create(
+            prefix="10.9.9.0/24", namespace=Namespace.objects.get(name="Global"), status=self.status_active
+        )
+        mgmt4_pf = Prefix.objects.get(network="10.1.1.0", prefix_length=24)
+        mgmt6_pf = Prefix.objects.get(ip_version=6)
+        self.nb_adapter.objects_to_delete["prefixes"] = [mgmt4_pf, mgmt6_pf, empty_pf]
         self.nb_adapter.sync_complete(source=self.nb_adapter, diff=MagicMock())
-        self.job.logger.info.assert_called()
-        self.job.logger.info.calls[1].starts_with("Deletion failed protected object")
+        self.assertFalse(Prefix.objects.filter(id=empty_pf.id).exists())
+        self.assertTrue(Prefix.objects.filter(id=mgmt4_pf.id).exists())
+        self.assertTrue(Prefix.objects.filter(id=mgmt6_pf.id).exists())
+        self.job.logger.info.assert_any_call("Deletion failed protected object: %s", mgmt4_pf)
+        self.job.logger.info.assert_any_call("Deletion failed protected object: %s", mgmt6_pf)
+        self.job.logger.info.assert_any_call("Deleted %s %s, skipped %s protected %s.", 1, "prefixes", 2, "prefixes")
+
+    def test_bulk_create_objects(self):
+        """Test the bulk_create_objects() method creates queued objects in dependency order."""
+        self.nb_adapter.bulk_import = True
+        self.nb_adapter.warm_ref_cache()
+        NautobotSubnet.create(self.nb_adapter, {"prefix": "10.2.2.0/24", "namespace": "Global"}, {"tenant": None})
+        NautobotAddress.create(
+            self.nb_adapter, {"address": "10.2.2.1/24", "prefix": "10.2.2.0/24"}, {"tenant": None, "tags": ["MGMT"]}
+        )
+        NautobotPort.create(
+            self.nb_adapter, {"name": "0/1", "device": "edge-fw.test.com"}, {"status": "Active", "description": ""}
+        )
+        NautobotIPAddressOnInterface.create(
+            self.nb_adapter,
+            {"address": "10.2.2.1/24", "device": "edge-fw.test.com", "port": "0/1"},
+            {"primary": True},
+        )
+        self.assertFalse(Prefix.objects.filter(network="10.2.2.0").exists())
+
+        self.nb_adapter.bulk_create_objects()
+        self.nb_adapter.assign_tags()
+        new_pf = Prefix.objects.get(network="10.2.2.0", prefix_length=24)
+        new_ip = IPAddress.objects.get(host="10.2.2.1")
+        self.assertEqual(new_ip.parent, new_pf)
+        self.assertEqual(
+            new_ip._custom_field_data["system_of_record"], "Citrix ADM"
+        )  # pylint: disable=protected-access
+        self.assertEqual(list(new_ip.tags.names()), ["MGMT"])
+        new_port = Interface.objects.get(name="0/1", device__name="edge-fw.test.com")
+        self.assertTrue(IPAddressToInterface.objects.filter(ip_address=new_ip, interface=new_port).exists())
+        self.assertEqual(len(self.nb_adapter.objects_to_create), 0)
+        self.nb_adapter.assign_primary_ips()
+        self.assertEqual(Device.objects.get(name="edge-fw.test.com").primary_ip4, new_ip)
+
+    def test_bulk_create_objects_failed_dependencies(self):
+        """Test objects depending on a queued object that failed validation are dropped instead of bulk created."""
+        self.nb_adapter.bulk_import = True
+        self.nb_adapter.warm_ref_cache()
+        NautobotSubnet.create(self.nb_adapter, {"prefix": "10.1.0.0/16", "namespace": "Global"}, {"tenant": None})
+        NautobotSubnet.create(self.nb_adapter, {"prefix": "10.1.1.0/24", "namespace": "Global"}, {"tenant": None})
+        NautobotAddress.create(
+            self.nb_adapter, {"address": "10.1.1.5/24", "prefix": "10.1.1.0/24"}, {"tenant": None, "tags": ["MGMT"]}
+        )
+        NautobotPort.create(
+            self.nb_adapter, {"name": "0/1", "device": "edge-fw.test.com"}, {"status": "Active", "description": ""}
+        )
+        NautobotIPAddressOnInterface.create(
+            self.nb_adapter,
+            {"address": "10.1.1.5/24", "device": "edge-fw.test.com", "port": "0/1"},
+            {"primary": True},
+        )
+
+        self.nb_adapter.bulk_create_objects()
+        self.assertEqual(Prefix.objects.filter(network="10.1.1.0", prefix_length=24).count(), 1)
+        self.assertEqual(
+            Prefix.objects.get(network="10.1.1.0", prefix_length=24).parent,
+            Prefix.objects.get(network="10.1.0.0", prefix_length=16),
+        )
+        self.assertFalse(IPAddress.objects.filter(host="10.1.1.5").exists())
+        self.assertTrue(Interface.objects.filter(name="0/1", device__name="edge-fw.test.com").exists())
+        self.assertFalse(IPAddressToInterface.objects.filter(interface__name="0/1").exists())
+        self.assertEqual(self.nb_adapter.tags_to_assign, [])
+        self.assertEqual(self.nb_adapter.primary_ips, [])
+
+    def test_chunked_operation_failure_undoes_side_effects(self):
+        """Test a create failing in a transaction chunk leaves no side effects behind while a later sibling is kept."""
+        adapter = NautobotAdapter(job=self.job, sync=None, transactional_sync=True)
+        adapter.warm_ref_cache()
+        validated_save = IPAddress.validated_save
+
+        def fail_first(ip_obj, *args, **kwargs):
+            if ip_obj.host == "10.1.1.2":
+                raise ValidationError("Invalid IP Address.")
+            return validated_save(ip_obj, *args, **kwargs)
+
+        stale_ip = IPAddress.objects.get(host="10.1.1.1")
+        tenant = Tenant.objects.create(name="Rolled Back")
+        adapter.address_map["10.1.1.2/24"] = stale_ip
+        adapter.chunker.begin()
+        with patch.object(IPAddress, "validated_save", autospec=True, side_effect=fail_first):
+            with self.assertRaises(ObjectNotCreated):
+                NautobotAddress.create(
+                    adapter,
+                    {"address": "10.1.1.2/24", "prefix": "10.1.1.0/24"},
+                    {"tenant": "Rolled Back", "tags": ["MGMT"]},
+                )
+            NautobotAddress.create(
+                adapter, {"address": "10.1.1.3/24", "prefix": "10.1.1.0/24"}, {"tenant": None, "tags": ["MGMT"]}
+            )
+        adapter.chunker.commit()
+        self.assertEqual(list(adapter.address_map), ["10.1.1.2/24", "10.1.1.3/24"])
+        self.assertIs(adapter.address_map["10.1.1.2/24"], stale_ip)
+        with self.assertNumQueries(0):
+            adapter.ref_cache.get(Status, name="Active")
+        misses = adapter.ref_cache.misses
+        self.assertEqual(adapter.ref_cache.get(Tenant, name="Rolled Back"), tenant)
+        self.assertEqual(adapter.ref_cache.misses, misses + 1)
+        self.assertEqual([addr.host for addr, _ in adapter.tags_to_assign], ["10.1.1.3"])
+        self.assertFalse(IPAddress.objects.filter(host="10.1.1.2").exists())
+        self.assertEqual(adapter.address_map["10.1.1.3/24"], IPAddress.objects.get(host="10.1.1.3"))
+
+    def test_chunked_operation_queries(self):
+        """Test the queries of a create are charged to its operation in the sync phase."""
+        self.nb_adapter.warm_ref_cache()
+        with self.nb_adapter.profiler.phase("Nautobot: sync"):
+            with CaptureQueriesContext(connection) as queries:
+                NautobotAddress.create(
+                    self.nb_adapter,
+                    {"address": "10.1.1.2/24", "prefix": "10.1.1.0/24"},
+                    {"tenant": None, "tags": ["MGMT"]},
+                )
+        stats = self.nb_adapter.profiler.phases["Nautobot: create address"]
+        self.assertEqual(stats["calls"], 1)
+        self.assertEqual(stats["queries"], len(queries))
+        self.assertEqual(self.nb_adapter.profiler.phases["Nautobot: sync"]["queries"], len(queries))
+
+    def test_queue_unmatched_deletes(self):
+        """Test Prefixes and IP Addresses no window loaded from Citrix ADM are queued for deletion unless loaded by Tenant."""
+        v6_address = "2001:db8:3333:4444:5555:6666:7777:8888/128"
+        diff = self.nb_adapter.queue_unmatched_deletes(prefixes={("10.1.1.0/24", "Global")}, addresses={"10.1.1.1/24"})
+        self.assertEqual(
+            diff,
+            {"address": {f"{v6_address}__{v6_address}": {"-": {}}}, "prefix": {f"{v6_address}__Global": {"-": {}}}},
+        )
+        for grouping in ["addresses", "prefixes"]:
+            self.nb_adapter.delete_objects(grouping)
+        self.assertFalse(IPAddress.objects.filter(host="2001:db8:3333:4444:5555:6666:7777:8888").exists())
+        self.assertFalse(Prefix.objects.filter(network="2001:db8:3333:4444:5555:6666:7777:8888").exists())
+        self.assertTrue(IPAddress.objects.filter(host="10.1.1.1").exists())
+        adapter = NautobotAdapter(job=self.job, sync=None, tenant=Tenant.objects.get(name="Test"))
+        self.assertEqual(adapter.queue_unmatched_deletes(prefixes=set(), addresses=set()), {})
+        self.assertEqual(adapter.objects_to_delete["prefixes"], [])
+
+    def test_assign_primary_ips(self):
+        """Test primary IPs are collected during the sync and assigned by the assign_primary_ips() method."""
+        self.nb_adapter.warm_ref_cache()
+        device = Device.objects.get(name="edge-fw.test.com")
+        device.primary_ip4 = None
+        device.validated_save()
+        NautobotPort.create(
+            self.nb_adapter, {"name": "0/1", "device": "edge-fw.test.com"}, {"status": "Active", "description": ""}
+        )
+        self.assertIn(("edge-fw.test.com", "0/1"), self.nb_adapter.port_map)
+        NautobotIPAddressOnInterface.create(
+            self.nb_adapter,
+            {"address": "10.1.1.1/24", "device": "edge-fw.test.com", "port": "0/1"},
+            {"primary": True},
+        )
+        self.assertIsNone(Device.objects.get(name="edge-fw.test.com").primary_ip4)
+        self.assertEqual(len(self.nb_adapter.primary_ips), 1)
+        self.nb_adapter.assign_primary_ips()
+        self.assertEqual(Device.objects.get(name="edge-fw.test.com").primary_ip4.host, "10.1.1.1")
+        self.assertEqual(self.nb_adapter.primary_ips, [])
+
+    def test_assign_tags(self):
+        """Test Tags collected from IP Address creates and updates are assigned by the assign_tags() method."""
+        self.nb_adapter.warm_ref_cache()
+        NautobotAddress.create(
+            self.nb_adapter, {"address": "10.1.1.2/24", "prefix": "10.1.1.0/24"}, {"tenant": None, "tags": ["NSIP"]}
+        )
+        existing_ip = IPAddress.objects.get(host="10.1.1.1")
+        existing_ip.tags.set([Tag.objects.get_or_create(name="MIP")[0]])
+        NautobotAddress(
+            address="10.1.1.1/24",
+            prefix="10.1.1.0/24",
+            tenant="Test",
+            tags=["MIP"],
+            uuid=existing_ip.id,
+            diffsync=self.nb_adapter,
+        ).update({"tags": ["MGMT", "NSIP"]})
+        self.nb_adapter.assign_tags()
+        self.assertEqual(list(IPAddress.objects.get(host="10.1.1.2").tags.names()), ["NSIP"])
+        self.assertEqual(sorted(IPAddress.objects.get(host="10.1.1.1").tags.names()), ["MGMT", "NSIP"])
+        self.assertIn(ContentType.objects.get_for_model(Device), Tag.objects.get(name="MGMT").content_types.all())
+        self.assertEqual(self.nb_adapter.tags_to_assign, [])
+
+    def test_diff_from_skips_unchanged_devices(self):
+        """Test the diff_from() method skips Device subtrees with matching content hashes."""
+        self.nb_adapter.load()
+        source = NautobotAdapter(job=self.job, sync=None)
+        source.load()
+        self.assertEqual(source.device_hashes, self.nb_adapter.device_hashes)
+        source.get("port", {"name": "Management", "device": "edge-fw.test.com"}).description = "Changed"
+        diff = self.nb_adapter.diff_from(source)
+        self.assertFalse(diff.has_diffs())
+        self.job.logger.info.assert_any_call("Skipping diff of %s unchanged Devices out of %s.", 1, 1)
+        self.assertFalse(self.nb_adapter.get("device", "edge-fw.test.com").model_flags & DiffSyncModelFlags.IGNORE)
+
+        source.compute_device_hashes()
+        self.assertNotEqual(source.device_hashes, self.nb_adapter.device_hashes)
+        diff = self.nb_adapter.diff_from(source)
+        self.assertTrue(diff.has_diffs())
+
+    def test_warm_ref_cache(self):
+        """Test the warm_ref_cache() method loads reference objects into the cache."""
+        self.nb_adapter.warm_ref_cache()
+        self.assertEqual(self.nb_adapter.ref_cache.get(Location, name="HQ"), self.hq_site)
+        self.assertEqual(self.nb_adapter.ref_cache.get(Status, name="Active"), self.status_active)
+        self.assertEqual(self.nb_adapter.ref_cache.hits, 2)
+        self.assertEqual(self.nb_adapter.ref_cache.misses, 0)
 
     def test_load(self):
         """Test the load() function."""
@@ -233,3 +444,93 @@ class NautobotDiffSyncTestCase(TransactionTestCase):
         self.nb_adapter.load_ports.assert_called_once()
         self.nb_adapter.load_prefixes.assert_called_once()
         self.nb_adapter.load_addresses.assert_called_once()
+
+    def add_devices(self, count: int):
+        """Add Devices with an Interface, Prefix and primary IP Address each to be loaded."""
+        device = Device.objects.get(name="edge-fw.test.com")
+        namespace = Namespace.objects.get(name="Global")
+        for idx in range(count):
+            new_dev = Device.objects.create(
+                name=f"extra-{idx}",
+                device_type=device.device_type,
+                role=device.role,
+                location=self.hq_site,
+                status=self.status_active,
+                tenant=device.tenant,
+                _custom_field_data={"os_version": "1.2.3", "system_of_record": "Citrix ADM"},
+            )
+            intf = Interface.objects.create(name="0/1", type="virtual", device=new_dev, status=self.status_active)
+            prefix = Prefix.objects.create(
+                prefix=f"10.2.{idx}.0/24",
+                namespace=namespace,
+                status=self.status_active,
+                tenant=device.tenant,
+                _custom_field_data={"system_of_record": "Citrix ADM"},
+            )
+            addr = IPAddress.objects.create(
+                address=f"10.2.{idx}.1/24",
+                parent=prefix,
+                status=self.status_active,
+                tenant=device.tenant,
+                _custom_field_data={"system_of_record": "Citrix ADM"},
+            )
+            addr.tags.add(Tag.objects.get_or_create(name="MGMT")[0])
+            IPAddressToInterface.objects.create(ip_address=addr, interface=intf)
+            new_dev.primary_ip4 = addr
+            new_dev.save()
+
+    def test_load_query_count_is_constant(self):
+        """Validate the number of queries of each loader doesn't grow with the number of objects loaded."""
+        with self.assertQueryBudget(LOAD_QUERY_BUDGET):
+            self.nb_adapter.load()
+        self.add_devices(count=5)
+        adapter = NautobotAdapter(job=self.job, sync=None)
+        with self.assertQueryBudget(LOAD_QUERY_BUDGET):
+            adapter.load()
+        self.assertEqual(len(adapter.get_all("ip_on_intf")), len(self.nb_adapter.get_all("ip_on_intf")) + 5)
+        for phase, stats in self.nb_adapter.profiler.phases.items():
+            self.assertEqual(adapter.profiler.phases[phase]["queries"], stats["queries"], msg=phase)
+
+    def test_load_hostname_scope(self):
+        """Validate only the subtree of the Device with the hostname is loaded and shared objects aren't deleted."""
+        self.add_devices(count=2)
+        adapter = NautobotAdapter(job=self.job, sync=None, hostname="extra-1")
+        adapter.load()
+        self.assertEqual({dev.get_unique_id() for dev in adapter.get_all("device")}, {"extra-1"})
+        self.assertEqual({port.get_unique_id() for port in adapter.get_all("port")}, {"0/1__extra-1"})
+        self.assertEqual({pf.prefix for pf in adapter.get_all("prefix")}, {"10.2.1.0/24"})
+        self.assertEqual({addr.address for addr in adapter.get_all("address")}, {"10.2.1.1/24"})
+        self.assertEqual({mapping.device for mapping in adapter.get_all("ip_on_intf")}, {"extra-1"})
+        for model in ["datacenter", "prefix", "address"]:
+            for obj in adapter.get_all(model):
+                self.assertTrue(obj.model_flags & DiffSyncModelFlags.SKIP_UNMATCHED_DST, msg=model)
+
+    def test_load_datacenter_scope(self):
+        """Validate only the Devices of the Site are loaded."""
+        self.add_devices(count=1)
+        adapter = NautobotAdapter(job=self.job, sync=None, datacenter="HQ")
+        adapter.load()
+        self.assertEqual({dev.get_unique_id() for dev in adapter.get_all("device")}, {"edge-fw.test.com", "extra-0"})
+        adapter = NautobotAdapter(job=self.job, sync=None, datacenter="Missing")
+        adapter.load()
+        self.assertEqual(len(adapter.get_all("device")), 0)
+
+    def test_load_devices_scope(self):
+        """Validate the named Devices are loaded with the Prefixes and IP Addresses known to the source."""
+        self.add_devices(count=3)
+        IPAddressToInterface.objects.filter(interface__device__name="extra-2").delete()
+        adapter = NautobotAdapter(
+            job=self.job,
+            sync=None,
+            devices=["extra-0"],
+            prefixes=["10.2.2.0/24"],
+            addresses=["10.2.2.1/24"],
+        )
+        adapter.load()
+        self.assertEqual({dev.get_unique_id() for dev in adapter.get_all("device")}, {"extra-0"})
+        self.assertEqual({pf.prefix for pf in adapter.get_all("prefix")}, {"10.2.0.0/24", "10.2.2.0/24"})
+        self.assertEqual({addr.address for addr in adapter.get_all("address")}, {"10.2.0.1/24", "10.2.2.1/24"})
+        self.assertEqual({mapping.device for mapping in adapter.get_all("ip_on_intf")}, {"extra-0"})
+        adapter = NautobotAdapter(job=self.job, sync=None, devices=[])
+        adapter.load()
+        self.assertEqual(len(adapter.get_all("device")), 0)
@@ -1,11 +1,15 @@
 """Unit tests for nautobot_ssot_citrix_adm."""
+from unittest.mock import patch
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from nautobot.extras.models import ExternalIntegration, JobResult
+from nautobot.extras.models import Job as JobModel
 from nautobot.users.models import Token
+from nautobot_ssot_citrix_adm.jobs import CitrixAdmDeviceDataSource
 
 User = get_user_model()
 
@@ -26,3 +30,57 @@ class PlaceholderAPITest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["count"], 0)
+
+
+class DeviceSyncAPITest(TestCase):
+    """Test the single ADC or Datacenter sync endpoint."""
+
+    def setUp(self):
+        """Create a superuser, token and Citrix ADM instance and enable the Job."""
+        self.user = User.objects.create(username="testuser", is_superuser=True)
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.instance = ExternalIntegration.objects.create(name="Test ADM", remote_url="https://adm.example.com")
+        self.job_model = JobModel.objects.get(
+            module_name=CitrixAdmDeviceDataSource.__module__, job_class_name=CitrixAdmDeviceDataSource.__name__
+        )
+        self.job_model.enabled = True
+        self.job_model.save()
+        self.url = reverse("plugins-api:nautobot_ssot_citrix_adm-api:sync")
+
+    @patch("nautobot_ssot_citrix_adm.api.views.JobResult.enqueue_job")
+    def test_sync_hostname(self, mock_enqueue):
+        """Verify a sync of an ADC is enqueued."""
+        mock_enqueue.return_value = JobResult.objects.create(name="Test", task_name="fake task", worker="default")
+        response = self.client.post(self.url, {"instances": [str(self.instance.id)], "hostname": "adc1"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["job_result"]["id"], str(mock_enqueue.return_value.id))
+        mock_enqueue.assert_called_once_with(
+            self.job_model,
+            self.user,
+            dryrun=False,
+            memory_profiling=False,
+            instances=[str(self.instance.id)],
+            tenant=None,
+            hostname="adc1",
+            datacenter="",
+            debug=False,
+        )
+
+    @patch("nautobot_ssot_citrix_adm.api.views.JobResult.enqueue_job")
+    def test_sync_requires_one_scope(self, mock_enqueue):
+        """Verify exactly one of hostname or datacenter is required."""
+        for data in [{}, {"hostname": "adc1", "datacenter": "DC1"}]:
+            response = self.client.post(self.url, {"instances": [str(self.instance.id)], **data}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_enqueue.assert_not_called()
+
+    @patch("nautobot_ssot_citrix_adm.api.views.JobResult.enqueue_job")
+    def test_sync_job_disabled(self, mock_enqueue):
+        """Verify a sync isn't enqueued when the Job is disabled."""
+        self.job_model.enabled = False
+        self.job_model.save()
+        response = self.client.post(self.url, {"instances": [str(self.instance.id)], "hostname": "adc1"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        mock_enqueue.assert_not_called()
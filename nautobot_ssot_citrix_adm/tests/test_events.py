@@ -0,0 +1,160 @@
+"""Test the event driven sync of ADCs."""
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+from django.contrib.auth import get_user_model
+from django.test import LiveServerTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from nautobot.core.testing import TransactionTestCase
+from nautobot.extras.models import ExternalIntegration, JobResult
+from nautobot.extras.models import Job as JobModel
+from nautobot.users.models import Token
+from nautobot_ssot_citrix_adm.jobs import CitrixAdmEventWorker
+from nautobot_ssot_citrix_adm.models import EventQueueEntry
+from nautobot_ssot_citrix_adm.utils.synthetic import EventNotifierStandIn, SyntheticAdc
+from nautobot_ssot_citrix_adm.utils.events import claim_due, complete_claim, enqueue_device, parse_events
+
+PLUGIN_SETTINGS = {"nautobot_ssot_citrix_adm": {"event_debounce": 30, "event_max_delay": 60, "event_batch_size": 2}}
+User = get_user_model()
+
+
+@override_settings(PLUGINS_CONFIG=PLUGIN_SETTINGS)
+class TestEventQueue(TransactionTestCase):
+    """Test the event queue functions."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Create a Citrix ADM instance."""
+        super().setUp()
+        self.instance = ExternalIntegration.objects.create(name="Test ADM", remote_url="https://adm.example.com")
+
+    def test_parse_events(self):
+        """Validate single events, lists and wrapped events are parsed and events without an ADC are dropped."""
+        self.assertEqual(parse_events({"hostname": "adc1", "category": "configSaved"}), [("adc1", "configSaved")])
+        self.assertEqual(
+            parse_events({"events": [{"source": "10.0.0.1", "type": "entityup"}, {"source": "ADM"}, "junk"]}),
+            [("10.0.0.1", "entityup")],
+        )
+        self.assertEqual(parse_events({"event": {"device_name": "adc2"}}), [("adc2", "")])
+
+    def test_enqueue_device_debounces(self):
+        """Validate repeated events update one entry and push it back up to the maximum delay."""
+        first = enqueue_device(instance=self.instance, hostname="adc1", event="configSaved")
+        with patch(
+            "nautobot_ssot_citrix_adm.utils.events.timezone.now", return_value=first.created + timedelta(seconds=50)
+        ):
+            second = enqueue_device(instance=self.instance, hostname="adc1", event="entityup")
+        self.assertEqual(EventQueueEntry.objects.count(), 1)
+        self.assertEqual(second.events, 2)
+        self.assertEqual(second.event, "entityup")
+        self.assertEqual(second.due, first.created + timedelta(seconds=60))
+
+    def test_claim_due(self):
+        """Validate only due entries are claimed, in batches, and stay queued until they're completed."""
+        for idx in range(3):
+            enqueue_device(instance=self.instance, hostname=f"adc{idx}")
+        EventQueueEntry.objects.exclude(hostname="adc2").update(due=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(claim_due(), [])
+        EventQueueEntry.objects.update(due=timezone.now() - timedelta(seconds=1))
+        claimed = claim_due()
+        self.assertEqual(len(claimed), 2)
+        self.assertEqual([entry.hostname for entry in claim_due()], ["adc2"])
+        self.assertEqual(claim_due(), [])
+        self.assertEqual(EventQueueEntry.objects.filter(claimed__isnull=False).count(), 3)
+        for entry in claimed:
+            complete_claim(entry)
+        self.assertEqual(list(EventQueueEntry.objects.values_list("hostname", flat=True)), ["adc2"])
+
+    def test_claim_due_expired_claim(self):
+        """Validate an entry claimed by a worker that never completed it is claimed again after the claim timeout."""
+        enqueue_device(instance=self.instance, hostname="adc0")
+        EventQueueEntry.objects.update(
+            due=timezone.now() - timedelta(seconds=1), claimed=timezone.now() - timedelta(seconds=601)
+        )
+        self.assertEqual([entry.hostname for entry in claim_due()], ["adc0"])
+
+    def test_complete_claim_with_new_events(self):
+        """Validate an entry that received events after it was claimed is released instead of removed."""
+        enqueue_device(instance=self.instance, hostname="adc0")
+        EventQueueEntry.objects.update(due=timezone.now() - timedelta(seconds=1))
+        entry = claim_due()[0]
+        enqueue_device(instance=self.instance, hostname="adc0", event="entityup")
+        complete_claim(entry)
+        remaining = EventQueueEntry.objects.get(hostname="adc0")
+        self.assertIsNone(remaining.claimed)
+        self.assertEqual(remaining.events, 2)
+
+    @patch("nautobot_ssot_citrix_adm.utils.events.schedule_worker")
+    @patch("nautobot_ssot_citrix_adm.jobs.JobResult.enqueue_job")
+    def test_worker(self, mock_enqueue, mock_schedule):
+        """Validate the worker enqueues a sync per due ADC and schedules a worker for entries that aren't due yet."""
+        for idx in range(3):
+            enqueue_device(instance=self.instance, hostname=f"adc{idx}")
+        EventQueueEntry.objects.exclude(hostname="adc2").update(due=timezone.now() - timedelta(seconds=1))
+        job = CitrixAdmEventWorker()
+        job.job_result = JobResult.objects.create(name=job.class_path, task_name="fake task", worker="default")
+        job.logger.info = MagicMock()
+        self.assertEqual(job.run(), 2)
+        self.assertEqual([call.kwargs["hostname"] for call in mock_enqueue.call_args_list], ["adc0", "adc1"])
+        self.assertEqual(mock_enqueue.call_args.kwargs["instances"], [str(self.instance.id)])
+        self.assertEqual(list(EventQueueEntry.objects.values_list("hostname", flat=True)), ["adc2"])
+        self.assertGreater(mock_schedule.call_args.kwargs["countdown"], 1.0)
+        self.assertEqual(mock_schedule.call_args.kwargs["exclude"], job.job_result)
+
+    @patch("nautobot_ssot_citrix_adm.jobs.JobResult.enqueue_job")
+    def test_worker_enqueue_failure(self, mock_enqueue):
+        """Validate entries whose sync couldn't be enqueued are returned to the queue."""
+        for idx in range(2):
+            enqueue_device(instance=self.instance, hostname=f"adc{idx}")
+        EventQueueEntry.objects.update(due=timezone.now() - timedelta(seconds=1))
+        mock_enqueue.side_effect = [None, RuntimeError("Broker unavailable.")]
+        job = CitrixAdmEventWorker()
+        job.job_result = JobResult.objects.create(name=job.class_path, task_name="fake task", worker="default")
+        job.logger.info = MagicMock()
+        with self.assertRaises(RuntimeError):
+            job.run()
+        remaining = EventQueueEntry.objects.get()
+        self.assertEqual(remaining.hostname, "adc1")
+        self.assertIsNone(remaining.claimed)
+
+
+@override_settings(PLUGINS_CONFIG=PLUGIN_SETTINGS)
+class TestEventReceiver(LiveServerTestCase):
+    """Test the event receiver with notifications sent over HTTP."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Create a user, Citrix ADM instance and notifier and enable the event worker."""
+        user = User.objects.create(username="adm", is_superuser=True)
+        self.instance = ExternalIntegration.objects.create(name="Test ADM", remote_url="https://adm.example.com")
+        self.notifier = EventNotifierStandIn(
+            url=self.live_server_url
+            + reverse("plugins-api:nautobot_ssot_citrix_adm-api:events", kwargs={"instance": self.instance.id}),
+            token=Token.objects.create(user=user).key,
+        )
+        JobModel.objects.filter(job_class_name=CitrixAdmEventWorker.__name__).update(enabled=True)
+
+    @patch("nautobot_ssot_citrix_adm.utils.events.JobResult.enqueue_job")
+    def test_events_are_deduplicated(self, mock_enqueue):
+        """Validate a burst of events queues each ADC once and starts one worker."""
+        adcs = [SyntheticAdc(index=idx, vlans=1, snips=1) for idx in range(2)]
+        response = self.notifier.notify(
+            [self.notifier.event(adcs[0]), self.notifier.event(adcs[1]), self.notifier.event(adcs[0], "entityup")]
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["queued"], ["SYNTH-ADC00000", "SYNTH-ADC00001"])
+        self.assertEqual(
+            dict(EventQueueEntry.objects.values_list("hostname", "events")), {"SYNTH-ADC00000": 2, "SYNTH-ADC00001": 1}
+        )
+        mock_enqueue.assert_called_once()
+
+    @patch("nautobot_ssot_citrix_adm.utils.events.JobResult.enqueue_job")
+    def test_unknown_address_is_ignored(self, mock_enqueue):
+        """Validate an event only identifying an ADC by an address unknown to Nautobot is ignored."""
+        response = self.notifier.notify([self.notifier.event(SyntheticAdc(vlans=1, snips=1), by_address=True)])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["ignored"], ["10.0.0.1"])
+        self.assertFalse(EventQueueEntry.objects.exists())
+        mock_enqueue.assert_not_called()
@@ -0,0 +1,260 @@
+"""Test the Citrix ADM SSoT Jobs module."""
+
+import gzip
+import json
+import subprocess  # nosec
+import sys
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from nautobot.core.testing import TransactionTestCase
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import JobResult
+from nautobot_ssot_citrix_adm.jobs import CitrixAdmDataSource, CitrixAdmDeviceDataSource, get_free_worker_slots
+
+IMPORT_SCRIPT = """
+import sys
+import nautobot
+nautobot.setup()
+import nautobot_ssot.jobs.base
+import nautobot_ssot_citrix_adm.jobs
+import nautobot_ssot_citrix_adm.api.views
+print(",".join(sys.modules))
+"""
+
+# Modules that are only imported once a Job runs or an API view handles a request.
+LAZY_MODULES = [
+    "nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm",
+    "nautobot_ssot_citrix_adm.diffsync.adapters.nautobot",
+    "nautobot_ssot_citrix_adm.utils.citrix_adm",
+    "nautobot_ssot_citrix_adm.utils.nautobot",
+]
+
+
+class TestJobsImports(unittest.TestCase):
+    """Test importing the Jobs module and API views doesn't import the adapters and their dependencies."""
+
+    def test_lazy_modules_not_imported(self):
+        """Validate the adapters and Citrix ADM client aren't in sys.modules after importing the Jobs and API views."""
+        result = subprocess.run(  # nosec
+            [sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, check=True, text=True
+        )
+        modules = result.stdout.strip().splitlines()[-1].split(",")
+        self.assertIn("nautobot_ssot_citrix_adm.jobs", modules)
+        self.assertIn("nautobot_ssot_citrix_adm.api.views", modules)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, modules)
+
+
+@override_settings(
+    PLUGINS_CONFIG={"nautobot_ssot_citrix_adm": {"shard_timeout": 1, "shard_poll_interval": 0, "hostname_mapping": []}}
+)
+class TestCitrixAdmDataSourceLoad(TransactionTestCase):
+    """Test loading the source adapter in the CitrixAdmDataSource Job."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Configure shared objects for test cases."""
+        super().setUp()
+        self.job = CitrixAdmDataSource()
+        self.job.job_result = JobResult.objects.create(
+            name=self.job.class_path, task_name="fake task", worker="default"
+        )
+        self.job.logger.info = MagicMock()
+        self.job.logger.warning = MagicMock()
+        self.instance = MagicMock()
+        self.instance.id = "b0a8bb8b-4d43-4dd6-9e0a-3b4a5c5a0f5e"
+        self.instance.name = "ADM"
+        self.job.instances = [self.instance]
+        self.job.tenant = None
+        self.job.debug = False
+        self.job.sharded = True
+        self.job.datacenter_shards = 2
+        self.job.save_snapshot = False
+        self.job.snapshot = None
+        self.job.sync = None
+        self.snapshot = {
+            "device": [
+                {
+                    "name": "ADC1",
+                    "model": "SDX",
+                    "role": "Load-Balancer",
+                    "serial": "1234",
+                    "site": "HQ",
+                    "status": "Active",
+                    "tenant": None,
+                    "version": "13.1",
+                    "hanode": None,
+                    "ports": [],
+                    "uuid": None,
+                }
+            ]
+        }
+
+    @patch("nautobot_ssot_citrix_adm.jobs.get_free_worker_slots", return_value=2)
+    @patch("nautobot_ssot_citrix_adm.jobs.JobModel")
+    @patch("nautobot_ssot_citrix_adm.jobs.JobResult.enqueue_job")
+    def test_load_sharded(self, mock_enqueue, mock_job_model, mock_slots):  # pylint: disable=unused-argument
+        """Validate finished collector Jobs are merged and unfinished shards are collected inline."""
+        finished = JobResult.objects.create(
+            name="collector", task_name="fake task", worker="default", status=JobResultStatusChoices.STATUS_SUCCESS
+        )
+        finished.result = self.snapshot
+        finished.save()
+        unfinished = JobResult.objects.create(name="collector", task_name="fake task", worker="default")
+        mock_enqueue.side_effect = [finished, unfinished]
+        self.job.load_shard_inline = MagicMock()
+        self.job.load_source_adapter()
+        self.assertEqual(mock_enqueue.call_count, 2)
+        self.assertEqual(self.job.source_adapter.get("device", "ADC1").model, "SDX")
+        self.job.load_shard_inline.assert_called_once_with(instance=self.instance, shard_index=1)
+        self.assertIn("ADC1", self.job.source_adapter.device_hashes)
+
+    @patch("nautobot_ssot_citrix_adm.jobs.get_free_worker_slots", return_value=1)
+    @patch("nautobot_ssot_citrix_adm.jobs.JobResult.enqueue_job")
+    def test_load_sharded_without_free_workers(self, mock_enqueue, mock_slots):  # pylint: disable=unused-argument
+        """Validate no collector Jobs are enqueued when there aren't enough idle workers to run all shards."""
+        self.job.source_adapter = MagicMock()
+        with self.assertRaises(RuntimeError):
+            self.job.load_sharded()
+        mock_enqueue.assert_not_called()
+
+    @patch("nautobot_ssot_citrix_adm.jobs.app")
+    def test_get_free_worker_slots(self, mock_app):
+        """Validate only idle processes of workers consuming the queue are counted."""
+        inspect = mock_app.control.inspect.return_value
+        inspect.stats.return_value = {
+            "w1": {"pool": {"max-concurrency": 4}},
+            "w2": {"pool": {"max-concurrency": 8}},
+        }
+        inspect.active.return_value = {"w1": [{"id": "coordinator"}]}
+        inspect.reserved.return_value = {"w1": [{"id": "queued"}]}
+        inspect.active_queues.return_value = {"w1": [{"name": "default"}], "w2": [{"name": "other"}]}
+        self.assertEqual(get_free_worker_slots("default"), 2)
+        inspect.active_queues.return_value = None
+        self.assertEqual(get_free_worker_slots("default"), 0)
+
+    def test_load_source_adapter_from_snapshot(self):
+        """Validate a snapshot file is loaded instead of connecting to Citrix ADM."""
+        self.job.snapshot = ContentFile(gzip.compress(json.dumps(self.snapshot).encode()), name="snapshot.json.gz")
+        self.job.load_sharded = MagicMock()
+        self.job.create_file = MagicMock()
+        self.job.load_source_adapter()
+        self.job.load_sharded.assert_not_called()
+        self.job.create_file.assert_not_called()
+        self.assertEqual(self.job.source_adapter.get("device", "ADC1").model, "SDX")
+        self.assertIn("ADC1", self.job.source_adapter.device_hashes)
+
+    def test_load_source_adapter_save_snapshot(self):
+        """Validate the loaded data is attached to the Job Result when save_snapshot is enabled."""
+        self.job.save_snapshot = True
+        self.job.create_file = MagicMock()
+
+        def load_sharded():
+            self.job.source_adapter.load_snapshot(self.snapshot)
+
+        self.job.load_sharded = load_sharded
+        self.job.load_source_adapter()
+        filename, content = self.job.create_file.call_args.args
+        self.assertEqual(filename, f"citrix_adm_snapshot_{self.job.job_result.id}.json.gz")
+        self.assertEqual(json.loads(gzip.decompress(content)), self.job.source_adapter.dump_snapshot())
+
+    @patch("nautobot_ssot_citrix_adm.jobs.Device")
+    def test_plan_windows(self, mock_device):
+        """Validate ADCs are grouped by their Datacenter and Devices no longer in Citrix ADM by their Site."""
+        mock_device.objects.filter.return_value.values_list.return_value = [("ADC1", "HQ"), ("OLD", "DR")]
+        sessions = [
+            {
+                "site_map": {"1": {"name": "HQ"}, "2": {"name": "DR"}},
+                "assigned": [{"hostname": "ADC1", "datacenter_id": "2"}, {"hostname": "ADC2", "datacenter_id": "1"}],
+            }
+        ]
+        windows = self.job.plan_windows(sessions)
+        self.assertEqual(windows["HQ"]["adcs"][0], [{"hostname": "ADC2", "datacenter_id": "1"}])
+        self.assertEqual(windows["HQ"]["orphans"], [])
+        self.assertEqual(windows["DR"]["adcs"][0], [{"hostname": "ADC1", "datacenter_id": "2"}])
+        self.assertEqual(windows["DR"]["orphans"], ["OLD"])
+
+    def test_sync_windows(self):
+        """Validate each Site is synced separately and the results of the windows are combined."""
+        session = {"conn": MagicMock()}
+        self.job.windowed = True
+        self.job.dryrun = False
+        self.job.plan_windows = MagicMock(return_value={"HQ": {}, "DR": {}})
+        self.job.sync_window = MagicMock(
+            side_effect=[({"create": 1}, {"device": {"ADC1": {}}}), ({"create": 2}, {"device": {"ADC2": {}}})]
+        )
+        self.job.delete_unmatched = MagicMock(return_value=({"delete": 1}, {"prefix": {"10.0.0.0/24__Global": {}}}))
+        self.job.sync = MagicMock()
+        with patch(
+            "nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.CitrixAdmAdapter.connect_all",
+            return_value=[session],
+        ):
+            self.job.sync_data(memory_profiling=True)
+        self.assertEqual([call.kwargs["site"] for call in self.job.sync_window.call_args_list], ["DR", "HQ"])
+        self.assertEqual(self.job.sync.summary["create"], 3)
+        self.assertEqual(self.job.sync.summary["delete"], 1)
+        self.assertEqual(
+            self.job.sync.diff, {"device": {"ADC1": {}, "ADC2": {}}, "prefix": {"10.0.0.0/24__Global": {}}}
+        )
+        self.assertIsInstance(self.job.sync.source_load_time, timedelta)
+        self.assertIn("Window: HQ", self.job.sync.summary["phases"])
+        self.assertEqual(
+            [call.args[1] for call in self.job.logger.info.call_args_list if call.args[0].startswith("Synced Site")],
+            ["DR", "HQ"],
+        )
+
+    @patch("nautobot_ssot_citrix_adm.jobs.get_rss", side_effect=[100 * 2**20, 96 * 2**20])
+    def test_sync_windows_rss_change(self, mock_rss):  # pylint: disable=unused-argument
+        """Validate the RSS change of a window is logged instead of a peak when memory isn't traced."""
+        self.job.windowed = True
+        self.job.dryrun = False
+        self.job.plan_windows = MagicMock(return_value={"HQ": {}})
+        self.job.sync_window = MagicMock(return_value=({"create": 1}, {}))
+        self.job.delete_unmatched = MagicMock(return_value=({"delete": 0}, {}))
+        self.job.sync = MagicMock()
+        with patch(
+            "nautobot_ssot_citrix_adm.diffsync.adapters.citrix_adm.CitrixAdmAdapter.connect_all", return_value=[]
+        ):
+            self.job.sync_data(memory_profiling=False)
+        self.job.logger.info.assert_any_call("Synced Site %s: %s. RSS change %+.1f MiB.", "HQ", {"create": 1}, -4.0)
+
+    def test_record_phases(self):
+        """Validate the phases of both adapters are logged and stored on the Sync record."""
+        self.job.source_adapter = MagicMock()
+        self.job.source_adapter.profiler.phases = {"ADM: login": {"calls": 1}}
+        self.job.target_adapter = MagicMock()
+        self.job.target_adapter.profiler.phases = {"Nautobot: diff": {"calls": 1}}
+        self.job.sync = MagicMock()
+        self.job.sync.summary = {"create": 1}
+        with patch("nautobot_ssot_citrix_adm.utils.nautobot.render_phase_table", return_value="table"):
+            self.job.record_phases()
+        self.job.logger.info.assert_called_once_with("Sync phases:\n\n%s", "table")
+        self.assertEqual(
+            self.job.sync.summary,
+            {"create": 1, "phases": {"ADM: login": {"calls": 1}, "Nautobot: diff": {"calls": 1}}},
+        )
+        self.job.sync.save.assert_called_once()
+
+
+class TestCitrixAdmDeviceDataSource(unittest.TestCase):
+    """Test the CitrixAdmDeviceDataSource Job."""
+
+    @patch("nautobot_ssot_citrix_adm.diffsync.adapters.nautobot.NautobotAdapter")
+    @patch("nautobot_ssot_citrix_adm.jobs.Device")
+    def test_load_target_adapter_datacenter(self, mock_device, mock_adapter):
+        """Validate Devices moved into the Datacenter are loaded and Devices moved out of it are left out."""
+        mock_device.objects.filter.return_value.values_list.return_value = ["ADC1", "MOVED-OUT", "GONE"]
+        moved_in, stays = MagicMock(), MagicMock()
+        moved_in.name, stays.name = "MOVED-IN", "ADC1"
+        job = CitrixAdmDeviceDataSource()
+        job.hostname, job.datacenter, job.tenant, job.sync = "", "HQ", None, None
+        job.source_adapter = MagicMock()
+        job.source_adapter.get_all.side_effect = lambda model: [moved_in, stays] if model == "device" else []
+        job.source_adapter.managed_elsewhere = {"MOVED-OUT"}
+        job.load_target_adapter()
+        mock_device.objects.filter.assert_called_once_with(location__name="HQ")
+        self.assertEqual(sorted(set(mock_adapter.call_args.kwargs["devices"])), ["ADC1", "GONE", "MOVED-IN"])
@@ -0,0 +1,35 @@
+"""Test the management commands of nautobot_ssot_citrix_adm."""
+import json
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from nautobot.core.testing import TransactionTestCase
+from nautobot.extras.choices import JobResultStatusChoices
+
+
+class TestBenchmarkCitrixAdmSync(TransactionTestCase):
+    """Test the benchmark_citrix_adm_sync management command."""
+
+    databases = ("default", "job_logs")
+
+    def test_benchmark_scenarios(self):
+        """Validate the initial load, no change and churn scenarios run against the NITRO stand-in."""
+        with tempfile.NamedTemporaryFile(suffix=".json") as output:
+            call_command(
+                "benchmark_citrix_adm_sync",
+                devices=4,
+                datacenters=2,
+                vlans=2,
+                snips=1,
+                churn=0.5,
+                output=output.name,
+                stdout=StringIO(),
+            )
+            results = json.load(output)["scenarios"]
+        self.assertEqual([result["scenario"] for result in results], ["initial load", "no change", "churn"])
+        for result in results:
+            self.assertEqual(result["status"], JobResultStatusChoices.STATUS_SUCCESS)
+            self.assertGreater(result["nitro_requests"], 0)
+            self.assertIn("Nautobot: diff", result["phases"])
+        self.assertGreater(results[0]["summary"]["create"], results[1]["summary"]["create"])
+        self.assertGreater(results[2]["summary"]["update"], results[1]["summary"]["update"])
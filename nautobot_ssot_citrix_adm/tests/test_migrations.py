@@ -0,0 +1,50 @@
+"""Test the System of Record expression indexes are used by the Nautobot adapter queries."""
+
+from unittest import skipUnless
+from django.db import connection
+from nautobot.core.testing import TestCase
+from nautobot.dcim.models import Device, Interface
+from nautobot.ipam.models import IPAddress, Prefix
+from nautobot_ssot_citrix_adm.diffsync.adapters.nautobot import NautobotAdapter
+from nautobot_ssot_citrix_adm.jobs import CitrixAdmDataSource
+
+
+def index_name(model):
+    """Return the name of the System of Record index for a model."""
+    return f"{model._meta.db_table}_ssot_citrix_adm_sor_idx"
+
+
+@skipUnless(connection.vendor == "postgresql", "System of Record indexes are only created on PostgreSQL.")
+class TestSystemOfRecordIndexes(TestCase):
+    """Test the System of Record expression indexes."""
+
+    def setUp(self):
+        """Disable sequential scans so the plans show whether an index can be used."""
+        super().setUp()
+        self.adapter = NautobotAdapter(job=CitrixAdmDataSource(), sync=None)
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+
+    def tearDown(self):
+        """Restore sequential scans."""
+        with connection.cursor() as cursor:
+            cursor.execute("RESET enable_seqscan")
+        super().tearDown()
+
+    def test_indexes_used(self):
+        """Validate the querysets the Nautobot adapter loads Citrix ADM objects with use the indexes."""
+        querysets = {
+            "devices": (self.adapter.get_devices(), Device),
+            "interfaces": (self.adapter.get_interfaces(), Device),
+            "prefixes": (self.adapter.get_prefixes(), Prefix),
+            "addresses": (self.adapter.get_addresses(), IPAddress),
+        }
+        for name, (queryset, indexed_model) in querysets.items():
+            with self.subTest(queryset=name):
+                self.assertIn(index_name(indexed_model), queryset.explain())
+
+    def test_no_interface_index(self):
+        """Validate Interfaces have no System of Record index of their own as they're loaded through their Device."""
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, Interface._meta.db_table)
+        self.assertNotIn(index_name(Interface), indexes)
@@ -1,11 +1,12 @@
 """Test the Nautobot CRUD functions for all DiffSync models."""
 from unittest.mock import MagicMock
-from diffsync import DiffSync
+from diffsync.exceptions import ObjectNotCreated
 from django.test import override_settings
 from nautobot.dcim.models import Location, LocationType
 from nautobot.extras.models import Status
 from nautobot.core.testing import TransactionTestCase
 
+from nautobot_ssot_citrix_adm.diffsync.adapters.nautobot import NautobotAdapter
 from nautobot_ssot_citrix_adm.diffsync.models.nautobot import NautobotDatacenter
 
 
@@ -15,8 +16,7 @@ class TestNautobotDatacenter(TransactionTestCase):
     def setUp(self):
         """Configure shared objects."""
         super().setUp()
-        self.diffsync = DiffSync()
-        self.diffsync.job = MagicMock()
+        self.diffsync = NautobotAdapter(job=MagicMock())
         self.diffsync.job.logger.warning = MagicMock()
         self.status_active = Status.objects.get(name="Active")
         self.test_dc = NautobotDatacenter(name="Test", region="", latitude=None, longitude=None, uuid=None)
@@ -42,13 +42,26 @@ class TestNautobotDatacenter(TransactionTestCase):
         self.assertEqual(site_obj.parent, self.global_region)
         self.assertEqual(float(site_obj.latitude), attrs["latitude"])
         self.assertEqual(float(site_obj.longitude), attrs["longitude"])
+        self.assertEqual(self.diffsync.ref_cache.get(Location, name="HQ"), site_obj)
+
+    def test_create_transactional_sync_failure(self):
+        """Validate a failed create with transactional sync is rolled back and raised as ObjectNotCreated."""
+        self.site_obj.delete()
+        diffsync = NautobotAdapter(job=MagicMock(), transactional_sync=True)
+        diffsync.chunker.begin()
+        with self.assertRaises(ObjectNotCreated):
+            NautobotDatacenter.create(
+                diffsync, {"name": "HQ", "region": "New Region"}, {"latitude": 1234.5, "longitude": 0}
+            )
+        diffsync.chunker.commit()
+        self.assertFalse(Location.objects.filter(name__in=["HQ", "New Region"]).exists())
 
     def test_create_with_duplicate_site(self):
         """Validate the NautobotDatacenter create() method handling of duplicate Site."""
         ids = {"name": "HQ", "region": ""}
         attrs = {}
         NautobotDatacenter.create(self.diffsync, ids, attrs)
-        self.diffsync.job.logger.warning.assert_called_with("Site HQ already exists so skipping creation.")
+        self.diffsync.job.logger.warning.assert_called_with("Site %s already exists so skipping creation.", "HQ")
 
     @override_settings(PLUGINS_CONFIG={"nautobot_ssot_citrix_adm": {"update_sites": True}})
     def test_update(self):
@@ -72,5 +85,5 @@ class TestNautobotDatacenter(TransactionTestCase):
         self.test_dc.diffsync.job.logger.warning = MagicMock()
         NautobotDatacenter.update(self=self.test_dc, attrs={})
         self.test_dc.diffsync.job.logger.warning.assert_called_once_with(
-            "Update sites setting is disabled so skipping updating Test."
+            "Update sites setting is disabled so skipping updating %s.", "Test"
         )
@@ -0,0 +1,50 @@
+"""Test the nautobot_database_ready callback."""
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from nautobot.core.testing import TestCase
+from nautobot.dcim.models import Interface
+from nautobot.extras.choices import CustomFieldTypeChoices
+from nautobot.extras.models import CustomField
+from nautobot_ssot_citrix_adm.signals import (
+    EXPECTED_FINGERPRINT,
+    get_bootstrap_state,
+    get_fingerprint,
+    nautobot_database_ready_callback,
+)
+
+
+class TestNautobotDatabaseReadyCallback(TestCase):
+    """Test the nautobot_database_ready_callback function."""
+
+    def test_fingerprint_matches_after_bootstrap(self):
+        """Validate the callback skips all writes when the bootstrap state is already in place."""
+        self.assertEqual(get_fingerprint(get_bootstrap_state(apps)), EXPECTED_FINGERPRINT)
+        with CaptureQueriesContext(connection) as queries:
+            nautobot_database_ready_callback(sender=None, apps=apps)
+        self.assertTrue(all(query["sql"].startswith("SELECT") for query in queries.captured_queries))
+
+    def test_callback_restores_missing_content_type(self):
+        """Validate the callback repairs the bootstrap state when it no longer matches the fingerprint."""
+        sor_field = CustomField.objects.get(key="system_of_record")
+        sor_field.content_types.remove(ContentType.objects.get_for_model(Interface))
+        self.assertNotEqual(get_fingerprint(get_bootstrap_state(apps)), EXPECTED_FINGERPRINT)
+        nautobot_database_ready_callback(sender=None, apps=apps)
+        self.assertIn(ContentType.objects.get_for_model(Interface), sor_field.content_types.all())
+        self.assertEqual(get_fingerprint(get_bootstrap_state(apps)), EXPECTED_FINGERPRINT)
+
+    def test_fingerprint_ignores_custom_field_label(self):
+        """Validate editing the label of a CustomField doesn't cause the callback to write."""
+        CustomField.objects.filter(key="os_version").update(label="Software Version")
+        self.assertEqual(get_fingerprint(get_bootstrap_state(apps)), EXPECTED_FINGERPRINT)
+        nautobot_database_ready_callback(sender=None, apps=apps)
+        self.assertEqual(CustomField.objects.get(key="os_version").label, "Software Version")
+
+    def test_callback_restores_custom_field_type(self):
+        """Validate the callback repairs a System of Record CustomField whose type was changed."""
+        CustomField.objects.filter(key="system_of_record").update(type=CustomFieldTypeChoices.TYPE_INTEGER)
+        self.assertNotEqual(get_fingerprint(get_bootstrap_state(apps)), EXPECTED_FINGERPRINT)
+        nautobot_database_ready_callback(sender=None, apps=apps)
+        self.assertEqual(CustomField.objects.get(key="system_of_record").type, CustomFieldTypeChoices.TYPE_TEXT)
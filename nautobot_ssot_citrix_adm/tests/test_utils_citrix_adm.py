@@ -18,6 +18,9 @@ from nautobot_ssot_citrix_adm.tests.fixtures import (
     NSIP_FIXTURE_RECV,
 )
 from nautobot_ssot_citrix_adm.utils.citrix_adm import (
+    get_adc_keys,
+    get_ha_pairs,
+    mirror_ha_node,
     parse_hostname_for_role,
     parse_version,
     CitrixNitroClient,
@@ -159,6 +162,14 @@ class TestCitrixAdmClient(TestCase):
         expected = self.client.get_devices()
         self.assertEqual(DEVICE_FIXTURE_RECV, expected)
 
+    @patch("nautobot_ssot_citrix_adm.utils.citrix_adm.requests.request")
+    def test_get_devices_filtered(self, mock_request):
+        """Validate the get_devices() method filters the devices in Citrix ADM."""
+        mock_request.return_value.json.return_value = {"errorcode": 0, "managed_device": [DEVICE_FIXTURE_RECV[0]]}
+        expected = self.client.get_devices(filters={"hostname": "adc 1/a"})
+        self.assertEqual(expected, [DEVICE_FIXTURE_RECV[0]])
+        self.assertTrue(mock_request.call_args.kwargs["url"].endswith(",ha_master_state&filter=hostname:adc%201%2Fa"))
+
     @patch.object(CitrixNitroClient, "request")
     def test_get_devices_failure(self, mock_request):
         """Validate functionality of the get_devices() method failure."""
@@ -181,7 +192,7 @@ class TestCitrixAdmClient(TestCase):
         adc = {"hostname": "test", "ip_address": ""}
         mock_request.return_value = {}
         actual = self.client.get_nsip(adc)
-        self.log.logger.warning.assert_called_once_with("Error getting nsip from test")
+        self.log.logger.warning.assert_called_once_with("Error getting nsip from %s", "test")
         self.assertEqual(actual, {})
 
     @patch.object(CitrixNitroClient, "request")
@@ -199,7 +210,7 @@ class TestCitrixAdmClient(TestCase):
         adc = {"hostname": "test", "ip_address": ""}
         mock_request.return_value = {}
         actual = self.client.get_nsip6(adc)
-        self.log.logger.warning.assert_called_once_with("Error getting nsip6 from test")
+        self.log.logger.warning.assert_called_once_with("Error getting nsip6 from %s", "test")
         self.assertEqual(actual, {})
 
     @patch.object(CitrixNitroClient, "request")
@@ -217,7 +228,7 @@ class TestCitrixAdmClient(TestCase):
         adc = {"hostname": "test", "ip_address": ""}
         mock_request.return_value = {}
         actual = self.client.get_vlan_bindings(adc)
-        self.log.logger.warning.assert_called_once_with("Error getting vlan bindings from test")
+        self.log.logger.warning.assert_called_once_with("Error getting vlan bindings from %s", "test")
         self.assertEqual(actual, {})
 
     def test_parse_hostname_for_role_success(self):
@@ -268,3 +279,48 @@ class TestCitrixAdmClient(TestCase):
         expected = [{"ipaddress": "fe80::1234:5678:9abc:dev1", "netmask": "64", "port": "L0/1", "vlan": "1"}]
         actual = parse_nsip6s(nsip6s=nsip6s, ports=ports)
         self.assertEqual(actual, expected)
+
+    def test_get_adc_keys(self):
+        """Validate an ADC is identified by its normalized hostname and NSIP."""
+        self.assertEqual(
+            get_adc_keys({"hostname": " ADC1.Example.com", "ip_address": "10.0.0.1"}),
+            {"hostname:adc1", "ip:10.0.0.1"},
+        )
+        self.assertEqual(get_adc_keys({"hostname": "", "ip_address": ""}), set())
+
+    def test_get_ha_pairs(self):
+        """Validate ADCs are grouped into HA pairs with the primary node first."""
+        node_a = {"ip_address": "10.0.0.2", "ha_ip_address": "10.0.0.1", "instance_state": "Up"}
+        node_b = {"ip_address": "10.0.0.1", "ha_ip_address": "10.0.0.2", "instance_state": "Up"}
+        standalone = {"ip_address": "10.0.0.3", "ha_ip_address": "10.0.0.9", "instance_state": "Up"}
+        self.assertEqual(get_ha_pairs([node_a, standalone, node_b]), [(node_b, node_a), (standalone, None)])
+        node_a["ha_master_state"] = "Primary"
+        self.assertEqual(get_ha_pairs([node_b, node_a]), [(node_a, node_b)])
+        node_a["ha_master_state"], node_a["instance_state"] = "", "Down"
+        self.assertEqual(get_ha_pairs([node_a, node_b]), [(node_b, node_a)])
+        node_a["ha_master_state"], node_b["ha_master_state"] = None, None
+        self.assertEqual(get_ha_pairs([node_a, node_b]), [(node_b, node_a)])
+
+    def test_mirror_ha_node(self):
+        """Validate the secondary node gets the bindings and NSIPs of the primary node with its own NSIP."""
+        primary = {"ip_address": "10.0.0.1", "netmask": "255.255.255.0"}
+        secondary = {"ip_address": "10.0.0.2", "netmask": "255.255.255.0"}
+        vlan_bindings = [
+            {
+                "id": "10",
+                "vlan_interface_binding": [{"id": "10", "ifnum": "1/1"}],
+                "vlan_nsip_binding": [
+                    {"id": "10", "ipaddress": "10.0.0.1", "netmask": "255.255.255.0"},
+                    {"id": "10", "ipaddress": "10.0.0.5", "netmask": "255.255.255.0"},
+                ],
+            }
+        ]
+        nsips = [
+            {"ipaddress": "10.0.0.1", "netmask": "255.255.255.0", "type": "NSIP"},
+            {"ipaddress": "10.0.0.5", "netmask": "255.255.255.0", "type": "SNIP"},
+        ]
+        bindings, mirrored = mirror_ha_node(vlan_bindings, nsips, primary=primary, secondary=secondary)
+        self.assertEqual([nsip["ipaddress"] for nsip in bindings[0]["vlan_nsip_binding"]], ["10.0.0.2", "10.0.0.5"])
+        self.assertEqual([nsip["ipaddress"] for nsip in mirrored], ["10.0.0.2", "10.0.0.5"])
+        self.assertEqual(vlan_bindings[0]["vlan_nsip_binding"][0]["ipaddress"], "10.0.0.1")
+        self.assertEqual(nsips[0]["ipaddress"], "10.0.0.1")
@@ -0,0 +1,78 @@
+"""Tests of the Citrix ADM credentials cache."""
+import os
+from unittest.mock import patch
+from nautobot.core.testing import TestCase
+from nautobot.extras.choices import SecretsGroupAccessTypeChoices, SecretsGroupSecretTypeChoices
+from nautobot.extras.models import Secret, SecretsGroup, SecretsGroupAssociation
+from nautobot_ssot_citrix_adm.utils.credentials import (
+    clear_credentials_cache,
+    get_credentials,
+    invalidate_credentials,
+    prefetch_credentials,
+)
+
+PLUGIN_SETTINGS = "nautobot_ssot_citrix_adm.utils.credentials.settings.PLUGINS_CONFIG"
+
+
+class TestCredentialsCache(TestCase):
+    """Test the credentials cache functions."""
+
+    def setUp(self):
+        """Create SecretsGroups with environment variable Secrets."""
+        super().setUp()
+        clear_credentials_cache()
+        self.addCleanup(clear_credentials_cache)
+        self.groups = []
+        for name in ["ADM1", "ADM2"]:
+            group = SecretsGroup.objects.create(name=name)
+            for secret_type in [
+                SecretsGroupSecretTypeChoices.TYPE_USERNAME,
+                SecretsGroupSecretTypeChoices.TYPE_PASSWORD,
+            ]:
+                variable = f"CITRIX_ADM_TEST_{name}_{secret_type}".upper()
+                patcher = patch.dict(os.environ, {variable: f"{name}-{secret_type}"})
+                patcher.start()
+                self.addCleanup(patcher.stop)
+                SecretsGroupAssociation.objects.create(
+                    secrets_group=group,
+                    access_type=SecretsGroupAccessTypeChoices.TYPE_HTTP,
+                    secret_type=secret_type,
+                    secret=Secret.objects.create(
+                        name=f"{name} {secret_type}",
+                        provider="environment-variable",
+                        parameters={"variable": variable},
+                    ),
+                )
+            self.groups.append(group)
+
+    def test_get_credentials_is_cached(self):
+        """Validate credentials are only resolved once until they're invalidated."""
+        with patch.object(SecretsGroup, "get_secret_value", autospec=True, side_effect=["user", "pass"]) as mock_get:
+            self.assertEqual(get_credentials(self.groups[0]), ("user", "pass"))
+            self.assertEqual(get_credentials(self.groups[0]), ("user", "pass"))
+            self.assertEqual(mock_get.call_count, 2)
+            invalidate_credentials(self.groups[0])
+            mock_get.side_effect = ["user", "rotated"]
+            self.assertEqual(get_credentials(self.groups[0]), ("user", "rotated"))
+
+    def test_get_credentials_ttl(self):
+        """Validate a TTL of 0 disables the cache."""
+        with patch.dict(PLUGIN_SETTINGS, {"nautobot_ssot_citrix_adm": {"secrets_cache_ttl": 0}}):
+            with patch.object(SecretsGroup, "get_secret_value", autospec=True, return_value="value") as mock_get:
+                get_credentials(self.groups[0])
+                get_credentials(self.groups[0])
+        self.assertEqual(mock_get.call_count, 4)
+
+    def test_prefetch_credentials(self):
+        """Validate the credentials of all SecretsGroups are cached by a prefetch."""
+        prefetch_credentials(self.groups)
+        with patch.object(SecretsGroup, "get_secret_value", autospec=True) as mock_get:
+            self.assertEqual(get_credentials(self.groups[1]), ("ADM2-username", "ADM2-password"))
+        mock_get.assert_not_called()
+
+    def test_prefetch_credentials_error(self):
+        """Validate a Secret that can't be resolved is left for get_credentials() to raise its error."""
+        Secret.objects.filter(name="ADM1 password").update(parameters={"variable": "CITRIX_ADM_TEST_MISSING"})
+        prefetch_credentials(self.groups[:1])
+        with self.assertRaises(Exception):
+            get_credentials(self.groups[0])
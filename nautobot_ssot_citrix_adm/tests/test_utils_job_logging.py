@@ -0,0 +1,91 @@
+"""Tests of the buffered Job logging."""
+import logging
+from unittest.mock import MagicMock, patch
+from nautobot.core.testing import TransactionTestCase
+from nautobot.extras.models import JobLogEntry, JobResult
+from nautobot_ssot_citrix_adm.utils.job_logging import BufferedJobLogHandler, buffered_job_logging
+
+
+class TestBufferedJobLogHandler(TransactionTestCase):
+    """Test the BufferedJobLogHandler and buffered_job_logging()."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Setup a JobResult and a logger for it."""
+        super().setUp()
+        self.job_result = JobResult.objects.create(name="Citrix ADM Test")
+        self.logger = logging.getLogger(f"{__name__}.{self.job_result.id}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.job = MagicMock(logger=self.logger, job_result=self.job_result)
+
+    def test_entries_are_buffered_until_batch_size(self):
+        """Test entries are only written once a batch is full or the handler is flushed."""
+        handler = BufferedJobLogHandler(job_result=self.job_result, batch_size=3, category_limit=0)
+        self.logger.addHandler(handler)
+        for num in range(4):
+            self.logger.info("Loading Device %s from Nautobot.", f"dev{num}")
+        self.assertEqual(JobLogEntry.objects.filter(job_result=self.job_result).count(), 3)
+        handler.close()
+        self.logger.removeHandler(handler)
+        self.assertEqual(
+            list(JobLogEntry.objects.filter(job_result=self.job_result).values_list("message", flat=True)),
+            [f"Loading Device dev{num} from Nautobot." for num in range(4)],
+        )
+
+    def test_errors_are_flushed(self):
+        """Test an error writes the buffered entries right away."""
+        handler = BufferedJobLogHandler(job_result=self.job_result, batch_size=100)
+        self.logger.addHandler(handler)
+        self.logger.info("Loading Site %s from Nautobot.", "HQ")
+        self.logger.error("Error getting sites from Citrix ADM.")
+        self.logger.removeHandler(handler)
+        self.assertEqual(
+            list(JobLogEntry.objects.filter(job_result=self.job_result).values_list("log_level", flat=True)),
+            ["info", "error"],
+        )
+
+    def test_categories_are_capped(self):
+        """Test entries over the limit of a template are summarized."""
+        with patch.dict(
+            "nautobot_ssot_citrix_adm.utils.job_logging.settings.PLUGINS_CONFIG",
+            {"nautobot_ssot_citrix_adm": {"log_batch_size": 10, "log_category_limit": 2}},
+        ):
+            with buffered_job_logging(self.job) as handler:
+                for num in range(5):
+                    self.logger.info("Loading Device %s from Citrix ADM.", f"adc{num}")
+                self.logger.info("Loading data from %s.", "ADM")
+        self.assertEqual(handler.counts, {})
+        self.assertEqual(
+            list(JobLogEntry.objects.filter(job_result=self.job_result).values_list("message", flat=True)),
+            [
+                "Loading Device adc0 from Citrix ADM.",
+                "Loading Device adc1 from Citrix ADM.",
+                "Loading data from ADM.",
+                '3 more messages like "Loading Device %s from Citrix ADM." were suppressed.',
+            ],
+        )
+        self.assertNotIn(handler, self.logger.handlers)
+        self.assertEqual(self.logger.filters, [])
+
+    def test_warnings_and_errors_are_not_capped(self):
+        """Test warnings and errors are written whatever the limit of their template."""
+        handler = BufferedJobLogHandler(job_result=self.job_result, batch_size=100, category_limit=1)
+        self.logger.addHandler(handler)
+        for num in range(3):
+            self.logger.warning("%s is using VLAN 1 for NSIP.", f"adc{num}")
+            self.logger.error("Failed to create Device %s.", f"adc{num}")
+        handler.close()
+        self.logger.removeHandler(handler)
+        self.assertEqual(handler.suppressed, {})
+        self.assertEqual(
+            list(JobLogEntry.objects.filter(job_result=self.job_result).values_list("log_level", flat=True)),
+            ["warning", "error"] * 3,
+        )
+
+    def test_skip_db_logging_is_respected(self):
+        """Test records logged with skip_db_logging aren't written by the buffer either."""
+        with buffered_job_logging(self.job):
+            self.logger.info("Console only.", extra={"skip_db_logging": True})
+        self.assertFalse(JobLogEntry.objects.filter(job_result=self.job_result).exists())
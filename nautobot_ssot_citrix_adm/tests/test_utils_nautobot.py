@@ -1,13 +1,26 @@
 """Tests to validate utility functions for Nautobot."""
 import sys
+import tracemalloc
 from unittest import skip
 from unittest.mock import MagicMock
 from django.contrib.contenttypes.models import ContentType
 from nautobot.dcim.models import Device, DeviceType, Location, LocationType, Manufacturer, Platform
-from nautobot.extras.models import Relationship, RelationshipAssociation, Role, Status
+from nautobot.extras.models import Relationship, RelationshipAssociation, Role, Status, Tag
 from nautobot.core.testing import TransactionTestCase
 from nautobot_device_lifecycle_mgmt.models import SoftwareLCM
-from nautobot_ssot_citrix_adm.utils.nautobot import add_software_lcm, assign_version_to_device
+from nautobot_ssot_citrix_adm.utils.nautobot import (
+    JournaledDict,
+    PhaseProfiler,
+    QueryCounter,
+    ReferenceCache,
+    SoftwareVersionRegistry,
+    TransactionChunker,
+    add_software_lcm,
+    get_software_versions,
+    get_sql_shape,
+    reconcile_software_relationships,
+    render_phase_table,
+)
 
 
 class TestUtilsNautobot(TransactionTestCase):  # pylint: disable=too-many-instance-attributes
@@ -50,34 +63,224 @@ class TestUtilsNautobot(TransactionTestCase):  # pylint: disable=too-many-instan
         result = add_software_lcm(self.diffsync, self.platform.name, version)
         soft_lcm = SoftwareLCM.objects.get(device_platform=self.platform, version=version)
         self.assertEqual(result, soft_lcm.id)
-        self.diffsync.job.logger.info.assert_called_once_with("Creating Version 2.0 for Test.")
+        self.diffsync.job.logger.info.assert_called_once_with("Creating Version %s for %s.", "2.0", "Test")
 
-    def test_assign_version_to_device_new_relationship(self):
-        """Test the assign_version_to_device() function with a new Relationship."""
-        assign_version_to_device(self.diffsync, self.device, self.software_lcm.id)
-        relationship = Relationship.objects.get(label="Software on Device")
-        association = RelationshipAssociation.objects.get(relationship=relationship, destination_id=self.device.id)
-        self.assertEqual(association.source_type, ContentType.objects.get_for_model(SoftwareLCM))
-        self.assertEqual(association.source_id, self.software_lcm.id)
-        self.assertEqual(association.destination_type, ContentType.objects.get_for_model(Device))
-        self.assertEqual(association.destination_id, self.device.id)
+    def test_software_version_registry(self):
+        """Validate the SoftwareVersionRegistry serves warmed versions and only creates missing versions once."""
+        registry = SoftwareVersionRegistry(diffsync=self.diffsync)
+        registry.warm(platform_name="Test")
+        with self.assertNumQueries(0):
+            self.assertEqual(registry.get_or_create(platform_name="Test", version="1.0"), self.software_lcm.id)
+        new_ver = registry.get_or_create(platform_name="Test", version="2.0")
+        self.assertEqual(registry.get_or_create(platform_name="Test", version="2.0"), new_ver)
+        self.diffsync.job.logger.info.assert_called_once_with("Creating Version %s for %s.", "2.0", "Test")
 
-    def test_assign_version_to_device_existing_relationship(self):
-        """Test the assign_version_to_device() function when Device already has a RelationshipAssociation."""
+    def test_reconcile_software_relationships(self):
+        """Validate only Devices with a changed version have their RelationshipAssociation replaced."""
         self.diffsync.job.logger.warning = MagicMock()
-        assign_version_to_device(self.diffsync, self.device, self.software_lcm.id)
-        version = "3.0"
-        result = add_software_lcm(self.diffsync, self.platform.name, version)
-        assign_version_to_device(self.diffsync, self.device, result)
+        reconcile_software_relationships(self.diffsync, {self.device.id: self.software_lcm.id})
         relationship = Relationship.objects.get(label="Software on Device")
+        original = RelationshipAssociation.objects.get(relationship=relationship, destination_id=self.device.id)
+        reconcile_software_relationships(self.diffsync, {self.device.id: self.software_lcm.id})
+        self.assertTrue(RelationshipAssociation.objects.filter(id=original.id).exists())
+        self.diffsync.job.logger.warning.assert_not_called()
+
+        new_ver = add_software_lcm(self.diffsync, self.platform.name, "3.0")
+        reconcile_software_relationships(self.diffsync, {self.device.id: new_ver})
         association = RelationshipAssociation.objects.get(relationship=relationship, destination_id=self.device.id)
-        self.assertEqual(association.source_type, ContentType.objects.get_for_model(SoftwareLCM))
-        self.assertEqual(association.source_id, result)
+        self.assertEqual(association.source_id, new_ver)
         self.assertEqual(association.destination_type, ContentType.objects.get_for_model(Device))
-        self.assertEqual(association.destination_id, self.device.id)
         self.diffsync.job.logger.warning.assert_called_once_with(
-            "Deleting Software Version Relationships for Test to assign a new version."
+            "Deleting %s Software Version Relationships to assign new versions.", 1
+        )
+
+    def test_reference_cache_warm_and_get(self):
+        """Validate the ReferenceCache serves warmed objects without counting a miss."""
+        cache = ReferenceCache()
+        cache.warm(queryset=Status.objects.all())
+        self.assertEqual(cache.get(Status, name="Active"), self.active_status)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 0)
+
+    def test_reference_cache_warm_with_foreign_key(self):
+        """Validate the ReferenceCache keys warmed objects by primary key of related objects."""
+        cache = ReferenceCache()
+        cache.warm(queryset=DeviceType.objects.all(), fields=("model", "manufacturer"))
+        result, created = cache.get_or_create(DeviceType, model="SDX", manufacturer=self.manufacturer)
+        self.assertEqual(result, self.device_type)
+        self.assertFalse(created)
+        self.assertEqual(cache.hits, 1)
+
+    def test_reference_cache_miss(self):
+        """Validate the ReferenceCache falls back to the database and caches the result."""
+        cache = ReferenceCache()
+        self.assertEqual(cache.get(Platform, name="Test"), self.platform)
+        self.assertEqual(cache.get(Platform, name="Test"), self.platform)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 1)
+        with self.assertRaises(Platform.DoesNotExist):
+            cache.get(Platform, name="Missing")
+
+    def test_reference_cache_get_or_create(self):
+        """Validate the ReferenceCache creates missing objects and caches them."""
+        cache = ReferenceCache()
+        role, created = cache.get_or_create(Role, name="New Role")
+        self.assertTrue(created)
+        self.assertEqual(cache.get_or_create(Role, name="New Role"), (role, False))
+        self.assertEqual(cache.hits, 1)
+
+    def test_transaction_chunker_commits_at_boundary(self):
+        """Validate the TransactionChunker only starts a new chunk at a boundary once the chunk is full."""
+        chunker = TransactionChunker(job=self.diffsync.job, chunk_size=2)
+        chunker.begin()
+        for name, boundary in [("A", True), ("B", False), ("C", False), ("D", True)]:
+            with chunker.operation(boundary=boundary):
+                Tag.objects.create(name=name)
+        chunker.commit()
+        self.assertEqual(chunker.chunks, 2)
+        self.assertEqual(Tag.objects.filter(name__in=["A", "B", "C", "D"]).count(), 4)
+        self.assertEqual(
+            self.diffsync.job.logger.info.call_args_list[0][0][:3],
+            ("Committed transaction chunk %s with %s operations in %.2f seconds.", 1, 3),
+        )
+
+    def test_transaction_chunker_failed_operation(self):
+        """Validate a failed operation only rolls back its own savepoint."""
+        chunker = TransactionChunker(job=self.diffsync.job, chunk_size=10)
+        chunker.begin()
+        with chunker.operation(boundary=True):
+            Tag.objects.create(name="Kept")
+        with self.assertRaises(ValueError):
+            with chunker.operation(boundary=True):
+                Tag.objects.create(name="Rolled Back")
+                raise ValueError("Failed")
+        chunker.commit()
+        self.assertTrue(Tag.objects.filter(name="Kept").exists())
+        self.assertFalse(Tag.objects.filter(name="Rolled Back").exists())
+
+    def test_journaled_dict(self):
+        """Validate a JournaledDict restores the keys changed since its journal was opened."""
+        journaled = JournaledDict(kept="old", replaced="old", removed="old")
+        journaled.begin_journal()
+        journaled["replaced"] = "new"
+        journaled["replaced"] = "newer"
+        journaled["added"] = "new"
+        del journaled["removed"]
+        journaled.undo_journal()
+        self.assertEqual(journaled, {"kept": "old", "replaced": "old", "removed": "old"})
+        journaled.begin_journal()
+        journaled["added"] = "new"
+        journaled.end_journal()
+        journaled.undo_journal()
+        self.assertEqual(journaled["added"], "new")
+
+    def test_reference_cache_journal(self):
+        """Validate undoing the ReferenceCache journal only evicts the entries added since it was opened."""
+        cache = ReferenceCache()
+        cache.warm(queryset=Status.objects.all())
+        cache.begin_journal()
+        tag, _ = cache.get_or_create(Tag, name="Journaled")
+        cache.undo_journal()
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.get(Status, name="Active"), self.active_status)
+        with self.assertNumQueries(1):
+            self.assertEqual(cache.get(Tag, name="Journaled"), tag)
+
+    def test_phase_profiler(self):
+        """Validate the PhaseProfiler accumulates repeated phases and records nested phases separately."""
+        profiler = PhaseProfiler()
+        tracemalloc.start()
+        try:
+            buffer = bytearray(4 * 2**20)
+            del buffer
+            for idx in range(2):
+                with profiler.phase("outer"):
+                    Tag.objects.filter(name="Missing").exists()
+                    with profiler.phase("inner"):
+                        buffer = bytearray(2**20)
+                        Tag.objects.create(name=f"Profiled {idx}")
+                        del buffer
+            overall_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertGreaterEqual(overall_peak, 4 * 2**20, "tracemalloc's peak was reset.")
+        self.assertEqual(profiler.phases["outer"]["calls"], 2)
+        self.assertEqual(profiler.phases["inner"]["calls"], 2)
+        self.assertEqual(profiler.phases["outer"]["queries"], profiler.phases["inner"]["queries"] + 2)
+        self.assertGreaterEqual(profiler.phases["inner"]["peak_memory"], 2**20)
+        self.assertGreaterEqual(profiler.phases["outer"]["peak_memory"], profiler.phases["inner"]["peak_memory"])
+        self.assertGreaterEqual(profiler.phases["outer"]["wall"], profiler.phases["inner"]["wall"])
+
+    def test_phase_profiler_without_tracing(self):
+        """Validate the PhaseProfiler doesn't record peak memory unless tracemalloc is tracing."""
+        profiler = PhaseProfiler()
+        with profiler.phase("load"):
+            Tag.objects.count()
+        self.assertIsNone(profiler.phases["load"]["peak_memory"])
+        self.assertEqual(profiler.phases["load"]["queries"], 1)
+        table = render_phase_table(profiler.phases).splitlines()
+        self.assertEqual(len(table), 3)
+        self.assertTrue(table[2].startswith("| load | 1 |"))
+        self.assertIn("| - | 1 |", table[2])
+
+    def test_phase_profiler_operation(self):
+        """Validate the queries of an operation are charged to it by the enclosing phase."""
+        profiler = PhaseProfiler()
+        with profiler.phase("Nautobot: sync"):
+            Tag.objects.count()
+            for name in ["A", "B"]:
+                with profiler.operation("Nautobot: create tag"):
+                    Tag.objects.create(name=name)
+        operation = profiler.phases["Nautobot: create tag"]
+        self.assertEqual(operation["calls"], 2)
+        self.assertEqual(operation["queries"], profiler.phases["Nautobot: sync"]["queries"] - 1)
+        self.assertGreater(operation["queries"], 0)
+        self.assertGreater(operation["db_time"], 0)
+        self.assertIsNone(profiler.current_operation)
+        self.assertGreaterEqual(operation["cpu"], 0)
+        self.assertIsNone(operation["peak_memory"])
+        table = render_phase_table(profiler.phases).splitlines()
+        self.assertTrue(table[2].startswith("| Nautobot: create tag | 2 |"))
+        self.assertIn("| n/a |", table[2])
+        self.assertEqual(table[-1], "Peak memory is not tracked per create, update and delete operation (n/a).")
+
+    def test_get_sql_shape(self):
+        """Validate queries that only differ in the number of parameters have the same shape."""
+        self.assertEqual(
+            get_sql_shape('SELECT "id" FROM "tag" WHERE "id" IN (%s, %s, %s) AND "name" IN (%s)'),
+            'SELECT "id" FROM "tag" WHERE "id" IN (...) AND "name" IN (...)',
+        )
+        self.assertEqual(
+            get_sql_shape('INSERT INTO "tag" ("name", "color") VALUES (%s, %s), (%s, %s), (%s, %s)'),
+            'INSERT INTO "tag" ("name", "color") VALUES (%s, %s), ...',
+        )
+
+    def test_query_counter_repeated_shapes(self):
+        """Validate the QueryCounter records time spent in the database and repeated queries by shape."""
+        with QueryCounter(track_shapes=True) as queries:
+            for name in ["A", "B", "C"]:
+                list(Tag.objects.filter(name=name))
+            Tag.objects.count()
+        self.assertEqual(queries.count, 4)
+        self.assertGreater(queries.time, 0)
+        repeated = queries.repeated_shapes()
+        self.assertEqual(len(repeated), 1)
+        self.assertEqual(repeated[0][1], 3)
+        self.assertIn('"name" = %s', repeated[0][0])
+
+    def test_get_software_versions(self):
+        """Validate the assigned Software Versions of all Devices are read in a fixed number of queries."""
+        reconcile_software_relationships(
+            diffsync=self.diffsync,
+            assignments={
+                self.device.id: add_software_lcm(diffsync=self.diffsync, platform_name="Test", version="1.0.0")
+            },
         )
+        with QueryCounter() as queries:
+            versions = get_software_versions()
+        self.assertEqual(versions[self.device.id], "1.0.0")
+        self.assertLessEqual(queries.count, 3)
+        self.assertEqual(get_software_versions(devices=Device.objects.exclude(id=self.device.id)), {})
 
     @skip("TODO")
     def test_device_lifecycle_management_import_fails(self):
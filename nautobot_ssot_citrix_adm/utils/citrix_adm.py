@@ -1,6 +1,7 @@
 """Utility functions for working with Citrix ADM."""
 import re
-from typing import List, Union, Optional, Tuple
+from typing import List, Union, Optional, Set, Tuple
+from urllib.parse import quote
 import requests
 from netutils.ip import netmask_to_cidr, is_ip_within, ipaddress_interface
 
@@ -107,7 +108,7 @@ class CitrixNitroClient:
             _result = _result.json()
             if _result.get("errorcode") == 0:
                 return _result
-            self.log.logger.warning(f"Failure with request: {_result['message']}")
+            self.log.logger.warning("Failure with request: %s", _result["message"])
         return {}
 
     def get_sites(self):
@@ -122,20 +123,39 @@ class CitrixNitroClient:
         self.log.logger.error("Error getting sites from Citrix ADM.")
         return {}
 
-    def get_devices(self):
-        """Gather all devices registered to MAS/ADM instance."""
+    def get_devices(self, filters: Optional[dict] = None):
+        """Gather all devices registered to MAS/ADM instance.
+
+        Args:
+            filters (Optional[dict], optional): Attributes and values to filter the devices on in Citrix ADM, ie `{"hostname": "adc1"}`. Defaults to None.
+        """
         self.log.logger.info("Getting devices from Citrix ADM.")
         endpoint = "config"
         objecttype = "managed_device"
         params = {
-            "attrs": "ip_address,hostname,gateway,mgmt_ip_address,description,serialnumber,type,display_name,netmask,datacenter_id,version,instance_state,ha_ip_address"
+            "attrs": "ip_address,hostname,gateway,mgmt_ip_address,description,serialnumber,type,display_name,netmask,datacenter_id,version,instance_state,ha_ip_address,ha_master_state"
         }
+        if filters:
+            params = f"attrs={params['attrs']}&filter=" + ",".join(
+                f"{key}:{quote(str(value), safe='')}" for key, value in filters.items()
+            )
         result = self.request("GET", endpoint, objecttype, params=params)
         if result:
             return result[objecttype]
         self.log.logger.error("Error getting devices from Citrix ADM.")
         return {}
 
+    def get_device_hostnames(self) -> List[str]:
+        """Gather the hostnames of all devices registered to MAS/ADM instance without their other attributes."""
+        endpoint = "config"
+        objecttype = "managed_device"
+        params = {"attrs": "hostname"}
+        result = self.request("GET", endpoint, objecttype, params=params)
+        if result:
+            return [dev["hostname"] for dev in result[objecttype] if dev.get("hostname")]
+        self.log.logger.error("Error getting devices from Citrix ADM.")
+        return []
+
     def get_nsip(self, adc):
         """Gather all nsip addresses from ADC instance using ADM as proxy."""
         endpoint = "config"
@@ -147,7 +167,7 @@ class CitrixNitroClient:
         result = self.request("GET", endpoint, objecttype, params=params)
         if result:
             return result[objecttype]
-        self.log.logger.warning(f"Error getting nsip from {adc['hostname']}")
+        self.log.logger.warning("Error getting nsip from %s", adc["hostname"])
         return {}
 
     def get_nsip6(self, adc):
@@ -161,7 +181,7 @@ class CitrixNitroClient:
         result = self.request("GET", endpoint, objecttype, params=params)
         if result:
             return result[objecttype]
-        self.log.logger.warning(f"Error getting nsip6 from {adc['hostname']}")
+        self.log.logger.warning("Error getting nsip6 from %s", adc["hostname"])
 
         return {}
 
@@ -176,11 +196,96 @@ class CitrixNitroClient:
         result = self.request("GET", endpoint, objecttype, params=params)
         if result:
             return result[objecttype]
-        self.log.logger.warning(f"Error getting vlan bindings from {adc['hostname']}")
+        self.log.logger.warning("Error getting vlan bindings from %s", adc["hostname"])
 
         return {}
 
 
+def get_ha_pairs(adcs: List[dict]) -> List[Tuple[dict, Optional[dict]]]:
+    """Group ADCs into HA pairs of a primary and secondary node.
+
+    Two ADCs are a pair when the `ha_ip_address` of each is the `ip_address` of the other. The node ADM reports as
+    `ha_master_state` Primary is polled, falling back to a node that is Up and then to the lowest IP Address. ADCs
+    without their peer in `adcs` are returned on their own.
+
+    Args:
+        adcs (List[dict]): ADCs as returned by `get_devices()`.
+
+    Returns:
+        List[Tuple[dict, Optional[dict]]]: Primary node and secondary node, or None for standalone ADCs, in the order of `adcs`.
+    """
+    by_ip = {adc["ip_address"]: adc for adc in adcs if adc.get("ip_address")}
+    paired, pairs = set(), []
+    for adc in adcs:
+        if adc.get("ip_address") in paired:
+            continue
+        peer = by_ip.get(adc.get("ha_ip_address"))
+        if not peer or peer is adc or peer.get("ha_ip_address") != adc["ip_address"]:
+            pairs.append((adc, None))
+            continue
+        primary, secondary = sorted(
+            [adc, peer],
+            key=lambda node: (
+                (node.get("ha_master_state") or "").lower() != "primary",
+                node.get("instance_state") != "Up",
+                ipaddress_interface(node["ip_address"], "packed"),
+            ),
+        )
+        paired.update([adc["ip_address"], peer["ip_address"]])
+        pairs.append((primary, secondary))
+    return pairs
+
+
+def get_adc_keys(adc: dict) -> Set[str]:
+    """Get the keys identifying an ADC across Citrix ADM instances.
+
+    Instances can report the same ADC with a different hostname casing or as FQDN instead of short name, so the
+    hostname is lowercased and stripped of its domain. The NSIP, the `ip_address` of the ADC, is used as well.
+
+    Args:
+        adc (dict): ADC as returned by `get_devices()`.
+
+    Returns:
+        Set[str]: Normalized hostname and NSIP of the ADC, whichever are known.
+    """
+    keys = set()
+    hostname = (adc.get("hostname") or "").strip().lower().split(".")[0]
+    if hostname:
+        keys.add(f"hostname:{hostname}")
+    if adc.get("ip_address"):
+        keys.add(f"ip:{adc['ip_address']}")
+    return keys
+
+
+def mirror_ha_node(vlan_bindings: List[dict], nsips: List[dict], primary: dict, secondary: dict) -> Tuple[list, list]:
+    """Derive the VLAN bindings and NSIPs of the secondary node of an HA pair from the primary node.
+
+    The configuration of the nodes is synchronized so only their NSIP differs. It's replaced with the NSIP of the secondary
+    node from its `managed_device` record.
+
+    Args:
+        vlan_bindings (List[dict]): VLAN bindings of the primary node.
+        nsips (List[dict]): NSIPs of the primary node.
+        primary (dict): Primary node as returned by `get_devices()`.
+        secondary (dict): Secondary node as returned by `get_devices()`.
+
+    Returns:
+        Tuple[list, list]: VLAN bindings and NSIPs of the secondary node.
+    """
+    own_nsip = {"ipaddress": secondary["ip_address"], "netmask": secondary["netmask"]}
+    mirrored_bindings = []
+    for binding in vlan_bindings:
+        binding = dict(binding)
+        if binding.get("vlan_nsip_binding"):
+            binding["vlan_nsip_binding"] = [
+                {**nsip, **own_nsip} if nsip["ipaddress"] == primary["ip_address"] else nsip
+                for nsip in binding["vlan_nsip_binding"]
+            ]
+        mirrored_bindings.append(binding)
+    mirrored_nsips = [{**nsip, **own_nsip} if nsip["type"] == "NSIP" else nsip for nsip in nsips]
+    return mirrored_bindings, mirrored_nsips
+
+
 def parse_version(version: str):
     """Parse Device version from string.
 
@@ -236,7 +341,7 @@ def parse_vlan_bindings(vlan_bindings: List[dict], adc: dict, job) -> List[dict]
                     ports.append(record)
         else:
             if job.debug:
-                job.logger.warning(f"{adc['hostname']}: VLAN {binding['id']} has no interface binding: {binding}.")
+                job.logger.warning("%s: VLAN %s has no interface binding: %s.", adc["hostname"], binding["id"], binding)
 
     # Account for NSIP in VLAN 1 which is not returned by get_vlan_bindings()
     if vlan_bindings:
@@ -249,7 +354,7 @@ def parse_vlan_bindings(vlan_bindings: List[dict], adc: dict, job) -> List[dict]
             ports.append(record)
 
             if job.debug:
-                job.logger.warning(f"{adc['hostname']} is using VLAN 1 for NSIP.")
+                job.logger.warning("%s is using VLAN 1 for NSIP.", adc["hostname"])
 
     return ports
 
@@ -0,0 +1,118 @@
+"""Cache of the Citrix ADM credentials resolved from SecretsGroups."""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic
+from typing import Iterable, Optional, Tuple
+from django.conf import settings
+from django.db import connections
+from nautobot.extras.choices import SecretsGroupAccessTypeChoices, SecretsGroupSecretTypeChoices
+from nautobot.extras.models import SecretsGroup, SecretsGroupAssociation
+
+CREDENTIAL_TYPES = [SecretsGroupSecretTypeChoices.TYPE_USERNAME, SecretsGroupSecretTypeChoices.TYPE_PASSWORD]
+
+_cache = {}
+_lock = Lock()
+
+
+def get_cache_ttl() -> int:
+    """Read the number of seconds resolved credentials are cached for from the plugin settings.
+
+    Returns:
+        int: TTL of cached credentials, 0 when caching is disabled.
+    """
+    return settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"].get("secrets_cache_ttl", 300)
+
+
+def _get_cached(key: tuple) -> Optional[str]:
+    """Return a cached secret value unless it's missing or expired."""
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[1] > monotonic():
+            return entry[0]
+        _cache.pop(key, None)
+    return None
+
+
+def _set_cached(key: tuple, value: str):
+    """Cache a secret value for the configured TTL."""
+    ttl = get_cache_ttl()
+    if ttl > 0:
+        with _lock:
+            _cache[key] = (value, monotonic() + ttl)
+
+
+def get_credentials(secrets_group: SecretsGroup) -> Tuple[str, str]:
+    """Return the HTTP username and password of a SecretsGroup, resolving them only when they're not cached.
+
+    Args:
+        secrets_group (SecretsGroup): SecretsGroup of a Citrix ADM instance.
+
+    Returns:
+        Tuple[str, str]: Username and password.
+    """
+    values = []
+    for secret_type in CREDENTIAL_TYPES:
+        key = (secrets_group.pk, SecretsGroupAccessTypeChoices.TYPE_HTTP, secret_type)
+        value = _get_cached(key)
+        if value is None:
+            value = secrets_group.get_secret_value(
+                access_type=SecretsGroupAccessTypeChoices.TYPE_HTTP, secret_type=secret_type
+            )
+            _set_cached(key, value)
+        values.append(value)
+    return values[0], values[1]
+
+
+def _resolve(association: SecretsGroupAssociation) -> Optional[str]:
+    """Resolve the Secret of an association in a worker thread, None when its provider fails."""
+    try:
+        return association.secret.get_value()
+    except Exception:  # pylint: disable=broad-except
+        return None
+    finally:
+        connections.close_all()
+
+
+def prefetch_credentials(secrets_groups: Iterable[SecretsGroup]):
+    """Resolve the credentials of several SecretsGroups concurrently and cache them.
+
+    Credentials that are already cached are skipped. Secrets that can't be resolved aren't cached so the error is
+    raised when `get_credentials()` is called for them.
+
+    Args:
+        secrets_groups (Iterable[SecretsGroup]): SecretsGroups of the selected Citrix ADM instances.
+    """
+    if get_cache_ttl() <= 0:
+        return
+    associations = [
+        association
+        for association in SecretsGroupAssociation.objects.filter(
+            secrets_group__in=[group.pk for group in secrets_groups],
+            access_type=SecretsGroupAccessTypeChoices.TYPE_HTTP,
+            secret_type__in=CREDENTIAL_TYPES,
+        ).select_related("secret")
+        if _get_cached((association.secrets_group_id, association.access_type, association.secret_type)) is None
+    ]
+    if not associations:
+        return
+    with ThreadPoolExecutor(max_workers=len(associations)) as executor:
+        for association, value in zip(associations, executor.map(_resolve, associations)):
+            if value is not None:
+                _set_cached((association.secrets_group_id, association.access_type, association.secret_type), value)
+
+
+def invalidate_credentials(secrets_group: SecretsGroup):
+    """Drop the cached credentials of a SecretsGroup, such as after they were refused by Citrix ADM.
+
+    Args:
+        secrets_group (SecretsGroup): SecretsGroup whose credentials are dropped.
+    """
+    with _lock:
+        for secret_type in CREDENTIAL_TYPES:
+            _cache.pop((secrets_group.pk, SecretsGroupAccessTypeChoices.TYPE_HTTP, secret_type), None)
+
+
+def clear_credentials_cache():
+    """Drop all cached credentials."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,196 @@
+"""Queue of ADCs to sync after Citrix ADM event notifications."""
+from datetime import timedelta
+from typing import List, Optional, Tuple, Union
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from nautobot.dcim.models import Device
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import ExternalIntegration, JobResult
+from nautobot.extras.models import Job as JobModel
+from nautobot.tenancy.models import Tenant
+from nautobot_ssot_citrix_adm.models import EventQueueEntry
+
+HOSTNAME_KEYS = ["hostname", "host_name", "device_name", "devicename", "instance_name"]
+ADDRESS_KEYS = ["ip_address", "source", "device_ip", "instance_ip", "mgmt_ip_address"]
+EVENT_KEYS = ["category", "event_type", "eventtype", "type", "name"]
+
+
+def get_event_settings() -> Tuple[timedelta, timedelta, int, timedelta]:
+    """Read the debounce, maximum delay, batch size and claim timeout of the event queue from the plugin settings.
+
+    Returns:
+        Tuple[timedelta, timedelta, int, timedelta]: Debounce, maximum delay, batch size and claim timeout.
+    """
+    plugin_settings = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"]
+    return (
+        timedelta(seconds=plugin_settings.get("event_debounce", 30)),
+        timedelta(seconds=plugin_settings.get("event_max_delay", 300)),
+        plugin_settings.get("event_batch_size", 50),
+        timedelta(seconds=plugin_settings.get("event_claim_timeout", 600)),
+    )
+
+
+def parse_events(payload: Union[dict, list]) -> List[Tuple[str, str]]:
+    """Extract the ADCs and event categories from a Citrix ADM event notification.
+
+    The payload can be a single event, a list of events or an object with the events under `event` or `events`. An ADC
+    is identified by its hostname or, when only its address is sent, by the Device with that IP Address in Nautobot.
+
+    Args:
+        payload (Union[dict, list]): Decoded body of the notification.
+
+    Returns:
+        List[Tuple[str, str]]: Hostname or IP Address and event category of each event, in order of appearance.
+    """
+    from netutils.ip import is_ip  # pylint: disable=import-outside-toplevel
+
+    if isinstance(payload, dict):
+        for key in ["events", "event"]:
+            if isinstance(payload.get(key), (dict, list)):
+                return parse_events(payload[key])
+        payload = [payload]
+    events = []
+    for event in payload if isinstance(payload, list) else []:
+        if not isinstance(event, dict):
+            continue
+        category = next((str(event[key]) for key in EVENT_KEYS if event.get(key)), "")
+        device = next((str(event[key]) for key in HOSTNAME_KEYS if event.get(key)), "")
+        if not device:
+            device = next((str(event[key]) for key in ADDRESS_KEYS if event.get(key) and is_ip(str(event[key]))), "")
+        if device:
+            events.append((device, category))
+    return events
+
+
+def resolve_hostnames(devices: List[str]) -> dict:
+    """Map the IP Addresses in a list of hostnames and IP Addresses to the names of the Devices they're assigned to.
+
+    Args:
+        devices (List[str]): Hostnames and IP Addresses of ADCs.
+
+    Returns:
+        dict: Hostname of each hostname or IP Address that could be resolved.
+    """
+    from netutils.ip import is_ip  # pylint: disable=import-outside-toplevel
+
+    hostnames = {device: device for device in devices if not is_ip(device)}
+    addresses = {device for device in devices if is_ip(device)}
+    if addresses:
+        for name, host in Device.objects.filter(
+            interfaces__ip_addresses__host__in=addresses, _custom_field_data__system_of_record="Citrix ADM"
+        ).values_list("name", "interfaces__ip_addresses__host"):
+            hostnames.setdefault(host, name)
+    return hostnames
+
+
+def enqueue_device(
+    instance: ExternalIntegration, hostname: str, event: str = "", tenant: Optional[Tenant] = None
+) -> EventQueueEntry:
+    """Add an ADC to the event queue or push back its entry if it's already queued.
+
+    An entry is due `event_debounce` seconds after the last event about the ADC but no later than `event_max_delay`
+    seconds after the first one, so an ADC sending a steady stream of events is still synced.
+
+    Args:
+        instance (ExternalIntegration): Citrix ADM instance managing the ADC.
+        hostname (str): Hostname of the ADC.
+        event (str, optional): Category of the event. Defaults to "".
+        tenant (Tenant, optional): Tenant to sync the ADC with. Defaults to None.
+
+    Returns:
+        EventQueueEntry: Created or updated queue entry.
+    """
+    debounce, max_delay, _, _ = get_event_settings()
+    now = timezone.now()
+    with transaction.atomic():
+        entry, created = EventQueueEntry.objects.select_for_update().get_or_create(
+            instance=instance, hostname=hostname, defaults={"event": event, "tenant": tenant, "due": now + debounce}
+        )
+        if not created:
+            entry.events += 1
+            entry.event = event or entry.event
+            entry.tenant = tenant
+            entry.due = min(now + debounce, entry.created + max_delay)
+            entry.save()
+    return entry
+
+
+def claim_due(limit: Optional[int] = None) -> List[EventQueueEntry]:
+    """Claim the entries that are due and return them.
+
+    Claimed entries stay in the queue until `complete_claim()` removes them once their sync was enqueued, so no event
+    is lost when the worker fails in between. Entries claimed longer than the `event_claim_timeout` setting ago are
+    claimed again, and rows locked by another worker are skipped so concurrent workers never claim the same entry.
+
+    Args:
+        limit (int, optional): Maximum number of entries to claim. Defaults to the `event_batch_size` setting.
+
+    Returns:
+        List[EventQueueEntry]: Claimed entries, the longest waiting first.
+    """
+    _, _, batch_size, claim_timeout = get_event_settings()
+    if limit is None:
+        limit = batch_size
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            EventQueueEntry.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(Q(claimed__isnull=True) | Q(claimed__lt=now - claim_timeout), due__lte=now)
+            .select_related("instance", "tenant")
+            .order_by("due")[:limit]
+        )
+        EventQueueEntry.objects.filter(id__in=[entry.id for entry in entries]).update(claimed=now)
+    for entry in entries:
+        entry.claimed = now
+    return entries
+
+
+def complete_claim(entry: EventQueueEntry):
+    """Remove a claimed entry from the queue once the sync of its ADC was enqueued.
+
+    An entry that received more events since it was claimed is released instead, so it's synced again when due.
+
+    Args:
+        entry (EventQueueEntry): Entry returned by `claim_due()`.
+    """
+    if not EventQueueEntry.objects.filter(id=entry.id, events=entry.events).delete()[0]:
+        release_claims([entry])
+
+
+def release_claims(entries: List[EventQueueEntry]):
+    """Return claimed entries to the queue, such as when their sync couldn't be enqueued.
+
+    Args:
+        entries (List[EventQueueEntry]): Entries returned by `claim_due()`.
+    """
+    EventQueueEntry.objects.filter(id__in=[entry.id for entry in entries]).update(claimed=None)
+
+
+def schedule_worker(
+    user, countdown: Optional[float] = None, exclude: Optional[JobResult] = None
+) -> Optional[JobResult]:
+    """Enqueue the event worker Job unless it's disabled or already pending or running.
+
+    Args:
+        user (User): User to run the worker as.
+        countdown (float, optional): Seconds to delay the start of the worker by. Defaults to None.
+        exclude (JobResult, optional): JobResult of the worker scheduling its successor. Defaults to None.
+
+    Returns:
+        Optional[JobResult]: JobResult of the enqueued worker, None when no worker was enqueued.
+    """
+    from nautobot_ssot_citrix_adm.jobs import CitrixAdmEventWorker  # pylint: disable=import-outside-toplevel
+
+    job_model = JobModel.objects.filter(
+        module_name=CitrixAdmEventWorker.__module__, job_class_name=CitrixAdmEventWorker.__name__, enabled=True
+    ).first()
+    if job_model is None:
+        return None
+    pending = JobResult.objects.filter(job_model=job_model).exclude(status__in=JobResultStatusChoices.READY_STATES)
+    if exclude is not None:
+        pending = pending.exclude(id=exclude.id)
+    if pending.exists():
+        return None
+    return JobResult.enqueue_job(job_model, user, celery_kwargs={"countdown": countdown} if countdown else None)
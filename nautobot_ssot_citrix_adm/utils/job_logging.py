@@ -0,0 +1,152 @@
+"""Buffered and rate-limited logging of Job log entries."""
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from django.conf import settings
+from nautobot.core.utils.logging import sanitize
+from nautobot.extras.constants import JOB_LOGS
+from nautobot.extras.models import JobLogEntry
+
+
+class BufferDatabaseLogging(logging.Filter):
+    """Hand the records of a Job logger to a BufferedJobLogHandler instead of Nautobot's database handler.
+
+    Records that already skip database logging are left alone so they're not written by the buffer either.
+    """
+
+    def filter(self, record):
+        """Mark the record as buffered and skip Nautobot's own JobLogEntry for it."""
+        record.buffered = not getattr(record, "skip_db_logging", False)
+        record.skip_db_logging = True
+        return True
+
+
+class BufferedJobLogHandler(logging.Handler):
+    """Write Job log records as JobLogEntry objects in batched inserts.
+
+    Records are aggregated by log level and message template, the unformatted `msg` of the record, so a per-object
+    message logged as `logger.info("Loading Device %s.", name)` counts as one category. Once a category reaches
+    `category_limit` further records of it are only counted and a single "N more suppressed" entry is written when the
+    handler is closed. Warnings and errors are never suppressed, and errors are flushed right away so they're visible
+    while the Job is still running.
+    """
+
+    def __init__(self, job_result, batch_size: int = 500, category_limit: int = 100):
+        """Initialize the handler.
+
+        Args:
+            job_result (JobResult): JobResult the log entries belong to.
+            batch_size (int, optional): Number of entries written per insert. Defaults to 500.
+            category_limit (int, optional): Number of entries written per log level and template below WARNING, 0
+                for no limit. Defaults to 100.
+        """
+        super().__init__()
+        self.job_result = job_result
+        self.batch_size = batch_size
+        self.category_limit = category_limit
+        self.buffer = []
+        self.counts = Counter()
+        self.groupings = {}
+
+    def emit(self, record):
+        """Buffer the record unless it's below WARNING and its category is over the limit."""
+        if not getattr(record, "buffered", True):
+            return
+        if self.category_limit and record.levelno < logging.WARNING:
+            category = (record.levelname.lower(), str(record.msg))
+            self.counts[category] += 1
+            if self.counts[category] > self.category_limit:
+                self.groupings.setdefault(category, getattr(record, "grouping", record.funcName))
+                return
+        try:
+            self.buffer.append(self.build_entry(record))
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+            return
+        if len(self.buffer) >= self.batch_size or record.levelno >= logging.ERROR:
+            self.flush()
+
+    def build_entry(self, record) -> JobLogEntry:
+        """Build the JobLogEntry for a record the same way Nautobot's database handler does.
+
+        Args:
+            record (LogRecord): Record to build the entry for.
+
+        Returns:
+            JobLogEntry: Unsaved log entry.
+        """
+        obj = getattr(record, "object", None)
+        return JobLogEntry(
+            job_result=self.job_result,
+            log_level=record.levelname.lower(),
+            grouping=getattr(record, "grouping", record.funcName),
+            message=sanitize(record.getMessage()),
+            created=datetime.fromtimestamp(record.created, tz=timezone.utc),
+            log_object=str(obj)[:200] if obj is not None else None,
+            absolute_url=obj.get_absolute_url() if hasattr(obj, "get_absolute_url") else None,
+        )
+
+    @property
+    def suppressed(self) -> dict:
+        """Number of records not written per category."""
+        return {
+            category: count - self.category_limit
+            for category, count in self.counts.items()
+            if self.category_limit and count > self.category_limit
+        }
+
+    def flush(self):
+        """Write the buffered entries."""
+        self.acquire()
+        try:
+            if self.buffer:
+                JobLogEntry.objects.using(JOB_LOGS).bulk_create(self.buffer, batch_size=self.batch_size)
+                self.buffer = []
+        finally:
+            self.release()
+
+    def close(self):
+        """Write a summary entry for each category over the limit and flush the buffer."""
+        now = datetime.now(tz=timezone.utc)
+        for (level, template), count in self.suppressed.items():
+            self.buffer.append(
+                JobLogEntry(
+                    job_result=self.job_result,
+                    log_level=level,
+                    grouping=self.groupings[(level, template)],
+                    message=sanitize(f'{count} more messages like "{template}" were suppressed.'),
+                    created=now,
+                )
+            )
+        self.counts.clear()
+        self.flush()
+        super().close()
+
+
+@contextmanager
+def buffered_job_logging(job):
+    """Buffer the JobLogEntry objects of a Job's logger while the context is active.
+
+    Args:
+        job (Job): Running Job whose log entries are buffered.
+
+    Yields:
+        BufferedJobLogHandler: Handler buffering the entries.
+    """
+    plugin_settings = settings.PLUGINS_CONFIG["nautobot_ssot_citrix_adm"]
+    logger = getattr(job.logger, "logger", job.logger)
+    handler = BufferedJobLogHandler(
+        job_result=job.job_result,
+        batch_size=plugin_settings.get("log_batch_size", 500),
+        category_limit=plugin_settings.get("log_category_limit", 100),
+    )
+    log_filter = BufferDatabaseLogging()
+    logger.addFilter(log_filter)
+    logger.addHandler(handler)
+    try:
+        yield handler
+    finally:
+        logger.removeHandler(handler)
+        logger.removeFilter(log_filter)
+        handler.close()
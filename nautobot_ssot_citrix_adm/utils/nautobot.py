@@ -1,9 +1,18 @@
 """Utility functions for working with Nautobot."""
-from typing import List
+import re
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter, process_time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
+from diffsync.exceptions import ObjectCrudException, ObjectNotCreated, ObjectNotDeleted, ObjectNotUpdated
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Model, QuerySet
 from nautobot.dcim.models import Device, Platform
-from nautobot.extras.models import Relationship, RelationshipAssociation
+from nautobot.extras.models import Relationship, RelationshipAssociation, Tag, TaggedItem
 from taggit.managers import TaggableManager
 
 try:
@@ -13,6 +22,57 @@ try:
 except ImportError:
     LIFECYCLE_MGMT = False
 
+MISSING = object()
+
+
+class JournaledDict(dict):
+    """Dict that records the previous value of each key set or removed while journaling so the changes can be undone.
+
+    Only item assignment, `del` and `pop()` are journaled, which is how the adapter's maps are written to.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the dict without an open journal."""
+        super().__init__(*args, **kwargs)
+        self.journal = None
+
+    def _record(self, key):
+        """Record the value of a key before its first change since the journal was opened."""
+        if self.journal is not None and key not in self.journal:
+            self.journal[key] = super().get(key, MISSING)
+
+    def __setitem__(self, key, value):
+        """Set a key, recording its previous value."""
+        self._record(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        """Remove a key, recording its previous value."""
+        self._record(key)
+        super().__delitem__(key)
+
+    def pop(self, key, *default):
+        """Remove a key and return its value, recording it."""
+        self._record(key)
+        return super().pop(key, *default)
+
+    def begin_journal(self):
+        """Start recording changes."""
+        self.journal = {}
+
+    def end_journal(self):
+        """Stop recording changes, keeping them."""
+        self.journal = None
+
+    def undo_journal(self):
+        """Restore the keys changed since the journal was opened and stop recording changes."""
+        journal, self.journal = self.journal or {}, None
+        for key, value in journal.items():
+            if value is MISSING:
+                super().pop(key, None)
+            else:
+                super().__setitem__(key, value)
+
 
 def add_software_lcm(diffsync, platform_name: str, version: str):
     """Add OS Version as SoftwareLCM if Device Lifecycle Plugin found.
@@ -29,7 +89,7 @@ def add_software_lcm(diffsync, platform_name: str, version: str):
     try:
         os_ver = SoftwareLCM.objects.get(device_platform=platform, version=version)
     except SoftwareLCM.DoesNotExist:
-        diffsync.job.logger.info(f"Creating Version {version} for {platform_name}.")
+        diffsync.job.logger.info("Creating Version %s for %s.", version, platform_name)
         os_ver = SoftwareLCM(
             device_platform=platform,
             version=version,
@@ -38,25 +98,105 @@ def add_software_lcm(diffsync, platform_name: str, version: str):
     return os_ver.id
 
 
-def assign_version_to_device(diffsync, device: Device, software_lcm: UUID):
-    """Add Relationship between Device and SoftwareLCM."""
-    try:
-        software_relation = Relationship.objects.get(label="Software on Device")
-        relationship = RelationshipAssociation.objects.get(relationship=software_relation, destination_id=device.id)
+class SoftwareVersionRegistry:
+    """Per-run registry of SoftwareLCM versions keyed by platform name and version."""
+
+    def __init__(self, diffsync):
+        """Initialize the registry with empty lookup tables.
+
+        Args:
+            diffsync (DiffSyncAdapter): DiffSync adapter with Job for logging.
+        """
+        self.diffsync = diffsync
+        self.versions = JournaledDict()
+
+    def warm(self, platform_name: str):
+        """Bulk load all SoftwareLCM versions of a platform into the registry.
+
+        Args:
+            platform_name (str): Name of platform to load versions for.
+        """
+        for os_ver in SoftwareLCM.objects.filter(device_platform__name=platform_name):
+            self.versions[(platform_name, os_ver.version)] = os_ver.id
+
+    def get_or_create(self, platform_name: str, version: str) -> UUID:
+        """Get the SoftwareLCM for a platform and version, creating it if it doesn't exist.
+
+        Args:
+            platform_name (str): Name of platform to associate version to.
+            version (str): The software version to be found or created for specified platform.
+
+        Returns:
+            UUID: UUID of the OS Version that is being found or created.
+        """
+        key = (platform_name, version)
+        if key not in self.versions:
+            self.versions[key] = add_software_lcm(diffsync=self.diffsync, platform_name=platform_name, version=version)
+        return self.versions[key]
+
+
+def reconcile_software_relationships(diffsync, assignments: Dict[UUID, UUID], batch_size: Optional[int] = None):
+    """Bring the Software on Device RelationshipAssociations of Devices in line with their assigned versions.
+
+    Associations already pointing at the assigned version are left alone, others are removed with a single
+    QuerySet delete and the missing ones are bulk created.
+
+    Args:
+        diffsync (DiffSyncAdapter): DiffSync adapter with Job for logging.
+        assignments (Dict[UUID, UUID]): Mapping of Device UUID to UUID of the SoftwareLCM to be assigned to it.
+        batch_size (int, optional): Number of RelationshipAssociations to insert per query. Defaults to None.
+    """
+    if not assignments:
+        return
+    software_relation = Relationship.objects.get(label="Software on Device")
+    unchanged, to_delete = set(), []
+    for assoc in RelationshipAssociation.objects.filter(
+        relationship=software_relation, destination_id__in=list(assignments)
+    ):
+        if assoc.source_id == assignments[assoc.destination_id]:
+            unchanged.add(assoc.destination_id)
+        else:
+            to_delete.append(assoc.id)
+    if to_delete:
         diffsync.job.logger.warning(
-            f"Deleting Software Version Relationships for {device.name} to assign a new version."
+            "Deleting %s Software Version Relationships to assign new versions.", len(to_delete)
         )
-        relationship.delete()
-    except RelationshipAssociation.DoesNotExist:
-        pass
-    new_assoc = RelationshipAssociation(
-        relationship=software_relation,
-        source_type=ContentType.objects.get_for_model(SoftwareLCM),
-        source_id=software_lcm,
-        destination_type=ContentType.objects.get_for_model(Device),
-        destination_id=device.id,
+        RelationshipAssociation.objects.filter(id__in=to_delete).delete()
+    source_type = ContentType.objects.get_for_model(SoftwareLCM)
+    destination_type = ContentType.objects.get_for_model(Device)
+    new_assocs = RelationshipAssociation.objects.bulk_create(
+        [
+            RelationshipAssociation(
+                relationship=software_relation,
+                source_type=source_type,
+                source_id=software_lcm,
+                destination_type=destination_type,
+                destination_id=device_id,
+            )
+            for device_id, software_lcm in assignments.items()
+            if device_id not in unchanged
+        ],
+        batch_size=batch_size,
     )
-    new_assoc.validated_save()
+    diffsync.job.logger.info("Assigned Software Versions to %s Devices.", len(new_assocs))
+
+
+def get_software_versions(devices: Optional[QuerySet] = None) -> Dict[UUID, str]:
+    """Get the version of the SoftwareLCM assigned to each Device through the Software on Device Relationship.
+
+    Args:
+        devices (QuerySet, optional): Devices to limit the lookup to. Defaults to None for all Devices.
+
+    Returns:
+        Dict[UUID, str]: Version keyed by UUID of the Device it's assigned to.
+    """
+    software_relation = Relationship.objects.get(label="Software on Device")
+    associations = RelationshipAssociation.objects.filter(relationship=software_relation)
+    if devices is not None:
+        associations = associations.filter(destination_id__in=devices.values("id"))
+    sources = dict(associations.values_list("destination_id", "source_id"))
+    versions = dict(SoftwareLCM.objects.filter(id__in=set(sources.values())).values_list("id", "version"))
+    return {device_id: versions[source_id] for device_id, source_id in sources.items() if source_id in versions}
 
 
 def get_tag_strings(list_tags: TaggableManager) -> List[str]:
@@ -70,7 +210,557 @@ def get_tag_strings(list_tags: TaggableManager) -> List[str]:
     Returns:
         List[str]: List of string values matching the Tags passed in.
     """
-    _strings = list(list_tags.names())
+    _strings = [tag.name for tag in list_tags.all()]
     if len(_strings) > 1:
         _strings.sort()
     return _strings
+
+
+def bulk_add_tags(tagged_objects: List[Tuple[Model, List[str]]], batch_size: Optional[int] = None):
+    """Assign Tags to objects by bulk creating the TaggedItem rows instead of calling `tags.set()` per object.
+
+    Missing Tags are created and, matching `tags.set()` usage elsewhere in the models, each Tag is registered for
+    Devices.
+
+    Args:
+        tagged_objects (List[Tuple[Model, List[str]]]): List of saved objects and the names of the Tags to assign them.
+        batch_size (int, optional): Number of TaggedItems to insert per query. Defaults to None.
+    """
+    tag_names = {name for _, names in tagged_objects for name in names}
+    if not tag_names:
+        return
+    tags = {tag.name: tag for tag in Tag.objects.filter(name__in=tag_names)}
+    for name in tag_names - set(tags):
+        tags[name] = Tag.objects.create(name=name)
+    device_ct = ContentType.objects.get_for_model(Device)
+    for tag in tags.values():
+        tag.content_types.add(device_ct)
+    TaggedItem.objects.bulk_create(
+        [
+            TaggedItem(content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk, tag=tags[name])
+            for obj, names in tagged_objects
+            for name in names
+        ],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+
+
+class ReferenceCache:
+    """Per-run cache of reference objects, ie Status, Role, Platform, etc, used by the Nautobot DiffSync models.
+
+    Objects are keyed by model and the lookup kwargs used to find them so that repeated lookups for the
+    same object only hit the database once per sync. Model instances used as lookup values are keyed by primary key.
+    """
+
+    def __init__(self):
+        """Initialize the cache with empty lookup tables and counters."""
+        self._cache = defaultdict(dict)
+        self._journal = None
+        self.hits = 0
+        self.misses = 0
+
+    def _store(self, model, key: Tuple, obj: Model):
+        """Cache an object, recording the entry it replaces while journaling."""
+        if self._journal is not None and (model, key) not in self._journal:
+            self._journal[(model, key)] = self._cache[model].get(key, MISSING)
+        self._cache[model][key] = obj
+
+    def begin_journal(self):
+        """Start recording the entries added to the cache."""
+        self._journal = {}
+
+    def end_journal(self):
+        """Stop recording the entries added to the cache, keeping them."""
+        self._journal = None
+
+    def undo_journal(self):
+        """Evict the entries added since the journal was opened, restoring those they replaced."""
+        journal, self._journal = self._journal or {}, None
+        for (model, key), obj in journal.items():
+            if obj is MISSING:
+                self._cache[model].pop(key, None)
+            else:
+                self._cache[model][key] = obj
+
+    @staticmethod
+    def _make_key(lookup: dict) -> Tuple:
+        """Convert lookup kwargs into a hashable key.
+
+        Args:
+            lookup (dict): Lookup kwargs as passed to `QuerySet.get()`.
+
+        Returns:
+            Tuple: Sorted tuple of field names and values with model instances replaced by their primary key.
+        """
+        return tuple(sorted((field, val.pk if isinstance(val, Model) else val) for field, val in lookup.items()))
+
+    def warm(self, queryset: QuerySet, fields: Iterable[str] = ("name",)):
+        """Bulk load objects from a QuerySet into the cache keyed by specified fields.
+
+        Keys that match more than one object are dropped so lookups for them fall through to the
+        database and behave exactly as the equivalent `get()` would.
+
+        Args:
+            queryset (QuerySet): QuerySet of objects to be cached.
+            fields (Iterable[str], optional): Fields to key the objects by. Defaults to ("name",).
+        """
+        model = queryset.model
+        attnames = [model._meta.get_field(field).attname for field in fields]
+        duplicates = set()
+        for obj in queryset:
+            key = tuple(sorted(zip(fields, (getattr(obj, attname) for attname in attnames))))
+            if key in self._cache[model]:
+                duplicates.add(key)
+            self._cache[model][key] = obj
+        for key in duplicates:
+            del self._cache[model][key]
+
+    def add(self, obj: Model, **lookup):
+        """Add an object to the cache, typically right after it has been created.
+
+        Args:
+            obj (Model): The object to be cached.
+            lookup: Lookup kwargs the object should be found with.
+        """
+        self._store(obj._meta.model, self._make_key(lookup), obj)
+
+    def get(self, model, **lookup) -> Model:
+        """Get object from the cache or from the database if not cached.
+
+        Args:
+            model (Model): Django model class for object to be found.
+            lookup: Lookup kwargs to find object with.
+
+        Raises:
+            model.DoesNotExist: If object can't be found.
+
+        Returns:
+            Model: The object matching the lookup kwargs.
+        """
+        key = self._make_key(lookup)
+        if key in self._cache[model]:
+            self.hits += 1
+            return self._cache[model][key]
+        self.misses += 1
+        obj = model.objects.get(**lookup)
+        self._store(model, key, obj)
+        return obj
+
+    def get_or_create(self, model, defaults: Optional[dict] = None, **lookup) -> Tuple[Model, bool]:
+        """Get object from the cache or get or create it in the database if not cached.
+
+        Args:
+            model (Model): Django model class for object to be found or created.
+            defaults (dict, optional): Additional values to use if object needs to be created. Defaults to None.
+            lookup: Lookup kwargs to find object with.
+
+        Returns:
+            Tuple[Model, bool]: The object matching the lookup kwargs and whether it was created.
+        """
+        key = self._make_key(lookup)
+        if key in self._cache[model]:
+            self.hits += 1
+            return self._cache[model][key], False
+        self.misses += 1
+        obj, created = model.objects.get_or_create(defaults=defaults, **lookup)
+        self._store(model, key, obj)
+        return obj, created
+
+    def clear(self, reset_counters: bool = True):
+        """Empty the cache and optionally reset the hit and miss counters.
+
+        Args:
+            reset_counters (bool, optional): Whether to reset the hit and miss counters. Defaults to True.
+        """
+        self._cache.clear()
+        if reset_counters:
+            self.hits = 0
+            self.misses = 0
+
+
+class TransactionChunker:
+    """Group the writes of a sync into `transaction.atomic` chunks with a savepoint per DiffSync operation.
+
+    A chunk is committed once it holds at least `chunk_size` operations, but only at the start of a top-level
+    object so that a Device and its Interfaces always end up in the same chunk.
+    """
+
+    def __init__(self, job, chunk_size: int):
+        """Initialize the chunker.
+
+        Args:
+            job (Job): Nautobot Job used for logging.
+            chunk_size (int): Minimum number of operations per chunk before it's committed.
+        """
+        self.job = job
+        self.chunk_size = chunk_size
+        self.chunks = 0
+        self.operations = 0
+        self._atomic = None
+        self._started = None
+
+    def begin(self):
+        """Open a new transaction chunk."""
+        self._atomic = transaction.atomic()
+        self._atomic.__enter__()  # pylint: disable=unnecessary-dunder-call
+        self._started = perf_counter()
+        self.chunks += 1
+        self.operations = 0
+
+    def commit(self):
+        """Commit the current transaction chunk and log how long it took."""
+        if not self._atomic:
+            return
+        self._atomic.__exit__(None, None, None)  # pylint: disable=unnecessary-dunder-call
+        self._atomic = None
+        self.job.logger.info(
+            "Committed transaction chunk %s with %s operations in %.2f seconds.",
+            self.chunks,
+            self.operations,
+            perf_counter() - self._started,
+        )
+
+    def rollback(self, err: Exception):
+        """Roll back the current transaction chunk.
+
+        Args:
+            err (Exception): Exception that caused the rollback.
+        """
+        if not self._atomic:
+            return
+        self._atomic.__exit__(type(err), err, err.__traceback__)  # pylint: disable=unnecessary-dunder-call
+        self._atomic = None
+        self.job.logger.error(
+            "Rolled back transaction chunk %s with %s operations after %.2f seconds.",
+            self.chunks,
+            self.operations,
+            perf_counter() - self._started,
+        )
+
+    @contextmanager
+    def operation(self, boundary: bool = False):
+        """Run a single operation in a savepoint of the current chunk.
+
+        Args:
+            boundary (bool, optional): Whether the operation starts a new top-level object, ie the chunk can be committed before it. Defaults to False.
+        """
+        if boundary and self.operations >= self.chunk_size:
+            self.commit()
+            self.begin()
+        self.operations += 1
+        with transaction.atomic():
+            yield
+
+
+SQL_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+SQL_VALUES_ROWS = re.compile(r"(\((?:%s, )*%s\))(?:, \1)+")
+CRUD_EXCEPTIONS = {"create": ObjectNotCreated, "update": ObjectNotUpdated, "delete": ObjectNotDeleted}
+
+
+def mark_side_effects(containers: Iterable[Any]) -> List[Tuple[Any, Optional[int]]]:
+    """Mark the containers an operation records its side effects in so they can be undone.
+
+    Containers with a journal, i.e. JournaledDicts and the ReferenceCache, start recording their changes, for the other
+    dicts and lists their size is recorded.
+
+    Args:
+        containers (Iterable[Any]): Journaled containers, dicts and lists the operation may change.
+
+    Returns:
+        List[Tuple[Any, Optional[int]]]: Each container with its current size, None for journaled containers.
+    """
+    marks = []
+    for container in containers:
+        if hasattr(container, "begin_journal"):
+            container.begin_journal()
+            marks.append((container, None))
+        else:
+            marks.append((container, len(container)))
+    return marks
+
+
+def undo_side_effects(marks: List[Tuple[Any, Optional[int]]]):
+    """Undo the changes made to containers since they were marked by `mark_side_effects()`.
+
+    Journaled containers restore the entries that were changed, entries added to other dicts and lists are removed.
+
+    Args:
+        marks (List[Tuple[Any, Optional[int]]]): Containers with their size before the operation.
+    """
+    for container, size in marks:
+        if size is None:
+            container.undo_journal()
+        elif isinstance(container, dict):
+            for key in list(container)[size:]:
+                del container[key]
+        else:
+            del container[size:]
+
+
+def release_side_effects(marks: List[Tuple[Any, Optional[int]]]):
+    """Keep the changes made to containers since they were marked by `mark_side_effects()`.
+
+    Args:
+        marks (List[Tuple[Any, Optional[int]]]): Containers with their size before the operation.
+    """
+    for container, size in marks:
+        if size is None:
+            container.end_journal()
+
+
+def chunked_operation(func):
+    """Run a DiffSync model create, update, or delete in a savepoint when the adapter uses a TransactionChunker.
+
+    A failing operation only rolls back its own savepoint and is re-raised as the matching DiffSync CRUD exception
+    so the rest of the sync can continue. The changes it made to the adapter's maps, queues and reference cache are
+    undone so nothing points at the rolled back rows while the entries from earlier operations are kept.
+
+    Each operation is recorded per operation and model in the adapter's PhaseProfiler, which charges the queries run
+    by it in the enclosing sync phase to it.
+    """
+
+    @wraps(func)
+    def wrapper(obj, *args, **kwargs):
+        if isinstance(obj, type):
+            diffsync = kwargs["diffsync"] if "diffsync" in kwargs else args[0]
+        else:
+            diffsync = obj.diffsync
+        chunker = getattr(diffsync, "chunker", None)
+        with diffsync.profiler.operation(f"Nautobot: {func.__name__} {obj.get_type()}"):
+            if not chunker:
+                return func(obj, *args, **kwargs)
+            marks = mark_side_effects(diffsync.side_effect_containers())
+            try:
+                with chunker.operation(boundary=obj.get_type() in diffsync.top_level):
+                    return func(obj, *args, **kwargs)
+            except ObjectCrudException:
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                undo_side_effects(marks)
+                diffsync.job.logger.warning("Rolled back failed %s of %s: %s", func.__name__, obj.get_type(), err)
+                raise CRUD_EXCEPTIONS[func.__name__](err) from err
+            finally:
+                release_side_effects(marks)
+
+    return wrapper
+
+
+def get_sql_shape(sql: str) -> str:
+    """Reduce SQL to its shape so queries that only differ in the number of parameters are grouped together.
+
+    Args:
+        sql (str): SQL of a query with its parameter placeholders.
+
+    Returns:
+        str: SQL with `IN` lists and repeated `VALUES` rows collapsed.
+    """
+    sql = SQL_IN_LIST.sub("IN (...)", sql)
+    return SQL_VALUES_ROWS.sub(r"\1, ...", sql)
+
+
+class QueryCounter:
+    """Context manager counting the queries executed on the default database connection and the time spent on them.
+
+    With `track_shapes` each query is also counted by its SQL shape to find queries that are repeated per object.
+    With a `profiler` each query is also charged to the operation the profiler is currently in, if any.
+    """
+
+    def __init__(self, track_shapes: bool = False, profiler: Optional["PhaseProfiler"] = None):
+        """Initialize the counter.
+
+        Args:
+            track_shapes (bool, optional): Whether to count queries by SQL shape. Defaults to False.
+            profiler (PhaseProfiler, optional): Profiler to charge queries to its operation. Defaults to None.
+        """
+        self.count = 0
+        self.time = 0.0
+        self.shapes = Counter() if track_shapes else None
+        self.profiler = profiler
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count the query and execute it."""
+        self.count += 1
+        if self.shapes is not None:
+            self.shapes[get_sql_shape(sql)] += 1
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - start
+            self.time += elapsed
+            if self.profiler is not None and self.profiler.current_operation is not None:
+                stats = self.profiler.phases[self.profiler.current_operation]
+                stats["queries"] += 1
+                stats["db_time"] += elapsed
+
+    def __enter__(self):
+        """Start counting queries."""
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()  # pylint: disable=unnecessary-dunder-call
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop counting queries."""
+        self._wrapper.__exit__(exc_type, exc_value, traceback)  # pylint: disable=unnecessary-dunder-call
+
+    def repeated_shapes(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get the most repeated SQL shapes.
+
+        Args:
+            limit (int, optional): Maximum number of shapes to return. Defaults to 10.
+
+        Returns:
+            List[Tuple[str, int]]: SQL shapes executed more than once with their count, most repeated first.
+        """
+        return get_repeated_shapes(self.shapes or Counter(), limit=limit)
+
+
+def get_repeated_shapes(shapes: Counter, limit: int = 10) -> List[Tuple[str, int]]:
+    """Get the most repeated SQL shapes of a Counter.
+
+    Args:
+        shapes (Counter): Number of queries per SQL shape.
+        limit (int, optional): Maximum number of shapes to return. Defaults to 10.
+
+    Returns:
+        List[Tuple[str, int]]: SQL shapes executed more than once with their count, most repeated first.
+    """
+    return [(shape, count) for shape, count in shapes.most_common(limit) if count > 1]
+
+
+class PhaseProfiler:
+    """Record the wall time, CPU time, peak traced memory and database queries of named phases of a sync.
+
+    Repeated phases are accumulated. Peak memory is only recorded while tracemalloc is tracing, ie with memory
+    profiling enabled, and is the growth above the traced memory at the start of the phase. tracemalloc's peak is never
+    reset so it stays intact for nautobot-ssot's memory profiling, which means the peak is exact when a phase sets a
+    new overall peak and the growth at its end otherwise. With `track_shapes` the queries of all phases are also
+    counted by SQL shape in `shapes`.
+
+    Operations too frequent to profile as phases, ie the DiffSync CRUD operations, are recorded with `operation()`,
+    which adds up their calls, wall time and CPU time. The queries they run are charged to them by the QueryCounter of
+    the outermost phase. Their memory isn't tracked as a tracemalloc snapshot per object would be too expensive.
+    """
+
+    def __init__(self, track_shapes: bool = False):
+        """Initialize the phase table.
+
+        Args:
+            track_shapes (bool, optional): Whether to count queries by SQL shape. Defaults to False.
+        """
+        self.track_shapes = track_shapes
+        self.phases = {}
+        self.shapes = Counter()
+        self.current_operation = None
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record a phase of the sync.
+
+        Args:
+            name (str): Name of the phase.
+        """
+        tracing = tracemalloc.is_tracing()
+        start, peak_before = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        # Shapes and operation queries are only counted by the outermost phase so nested phases don't count a query
+        # twice.
+        outermost = not self._depth
+        queries = QueryCounter(track_shapes=self.track_shapes and outermost, profiler=self if outermost else None)
+        self._depth += 1
+        wall, cpu = perf_counter(), process_time()
+        try:
+            with queries:
+                yield
+        finally:
+            self._depth -= 1
+            stats = self.phases.setdefault(
+                name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "peak_memory": None, "queries": 0, "db_time": 0.0}
+            )
+            stats["calls"] += 1
+            stats["wall"] += perf_counter() - wall
+            stats["cpu"] += process_time() - cpu
+            stats["queries"] += queries.count
+            stats["db_time"] += queries.time
+            if queries.shapes:
+                self.shapes.update(queries.shapes)
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                growth = (peak if peak > peak_before else current) - start
+                stats["peak_memory"] = max(stats["peak_memory"] or 0, growth, 0)
+
+    @contextmanager
+    def operation(self, name: str):
+        """Record a call of an operation, charging the queries it runs in an enclosing phase to it.
+
+        Args:
+            name (str): Name of the operation.
+        """
+        stats = self.phases.setdefault(
+            name,
+            {
+                "calls": 0,
+                "wall": 0.0,
+                "cpu": 0.0,
+                "peak_memory": None,
+                "queries": 0,
+                "db_time": 0.0,
+                "operation": True,
+            },
+        )
+        outer, self.current_operation = self.current_operation, name
+        wall, cpu = perf_counter(), process_time()
+        try:
+            yield
+        finally:
+            self.current_operation = outer
+            stats["calls"] += 1
+            stats["wall"] += perf_counter() - wall
+            stats["cpu"] += process_time() - cpu
+
+
+def render_phase_table(phases: Dict[str, dict]) -> str:
+    """Render recorded phases as a Markdown table for the Job log.
+
+    Peak memory isn't tracked for operations, such as the DiffSync CRUD operations, which a note below the table
+    points out.
+
+    Args:
+        phases (Dict[str, dict]): Phases recorded by a PhaseProfiler.
+
+    Returns:
+        str: Markdown table with a row per phase.
+    """
+    rows = [
+        "| Phase | Calls | Wall (s) | CPU (s) | Peak Memory (MiB) | Queries | DB (s) |",
+        "| --- | ---: | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    operations = False
+    for name, stats in phases.items():
+        peak = f"{stats['peak_memory'] / 2**20:.2f}" if stats["peak_memory"] is not None else "-"
+        if stats.get("operation"):
+            operations = True
+            peak = "n/a"
+        cpu = f"{stats['cpu']:.3f}" if stats["cpu"] is not None else "-"
+        queries = stats["queries"] if stats["queries"] is not None else "-"
+        db_time = f"{stats.get('db_time', 0.0):.3f}" if stats.get("db_time", 0.0) is not None else "-"
+        rows.append(f"| {name} | {stats['calls']} | {stats['wall']:.3f} | {cpu} | {peak} | {queries} | {db_time} |")
+    if operations:
+        rows.extend(["", "Peak memory is not tracked per create, update and delete operation (n/a)."])
+    return "\n".join(rows)
+
+
+def render_shape_table(shapes: List[Tuple[str, int]]) -> str:
+    """Render repeated SQL shapes as a Markdown table for the Job log.
+
+    Args:
+        shapes (List[Tuple[str, int]]): SQL shapes with their count.
+
+    Returns:
+        str: Markdown table with a row per SQL shape.
+    """
+    rows = ["| Count | SQL |", "| ---: | --- |"]
+    rows.extend(f"| {count} | `{shape}` |" for shape, count in shapes)
+    return "\n".join(rows)
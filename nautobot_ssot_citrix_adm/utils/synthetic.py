@@ -0,0 +1,414 @@
+"""Seeded generator of synthetic Citrix ADM responses and a NITRO stand-in serving them for benchmarks and tests."""
+import json
+import random
+import uuid
+from copy import deepcopy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import List
+import requests
+
+# Responses of a Citrix ADM the synthetic responses are shaped like.
+DEVICE_TEMPLATE = {
+    "gateway": "56.881.284.240",
+    "mgmt_ip_address": "128.08.54.48",
+    "description": "",
+    "serialnumber": "78NKST0SJ2",
+    "display_name": "172.18.77.78-172.18.77.79",
+    "type": "nsvpx",
+    "netmask": "255.255.255.192",
+    "ha_ip_address": "172.18.77.78",
+    "datacenter_id": "28aa2970-0160-4860-aca8-a85f89268803",
+    "hostname": "UYLLBFRCXM55-EA",
+    "ip_address": "172.18.77.79",
+    "version": "NetScaler NS12.1: Build 63.22.nc, Date: Oct 13 2021, 01:18:50   (64-bit)",
+    "instance_state": "Up",
+}
+NSIP_TEMPLATE = {
+    "ipaddress": "192.168.0.1",
+    "td": "0",
+    "type": "NSIP",
+    "netmask": "255.255.255.0",
+    "flags": "40",
+    "arp": "ENABLED",
+    "icmp": "ENABLED",
+    "vserver": "DISABLED",
+    "telnet": "ENABLED",
+    "ssh": "ENABLED",
+    "gui": "SECUREONLY",
+    "snmp": "ENABLED",
+    "ftp": "ENABLED",
+    "mgmtaccess": "ENABLED",
+    "restrictaccess": "DISABLED",
+    "decrementttl": "DISABLED",
+    "dynamicrouting": "ENABLED",
+    "hostroute": "DISABLED",
+    "advertiseondefaultpartition": "DISABLED",
+    "networkroute": "DISABLED",
+    "tag": "0",
+    "hostrtgwact": "0.0.0.0",
+    "metric": 0,
+    "ospfareaval": "0",
+    "vserverrhilevel": "ONE_VSERVER",
+    "viprtadv2bsd": False,
+    "vipvsercount": "0",
+    "vipvserdowncount": "0",
+    "vipvsrvrrhiactivecount": "0",
+    "vipvsrvrrhiactiveupcount": "0",
+    "ospflsatype": "TYPE5",
+    "state": "ENABLED",
+    "freeports": "1032094",
+    "iptype": ["NSIP"],
+    "icmpresponse": "NONE",
+    "ownernode": "255",
+    "arpresponse": "NONE",
+    "ownerdownresponse": "YES",
+}
+SNIP_TEMPLATE = {
+    "ipaddress": "192.168.0.2",
+    "td": "0",
+    "type": "SNIP",
+    "netmask": "255.255.255.0",
+    "flags": "4",
+    "arp": "ENABLED",
+    "icmp": "ENABLED",
+    "vserver": "DISABLED",
+    "telnet": "ENABLED",
+    "ssh": "ENABLED",
+    "gui": "ENABLED",
+    "snmp": "ENABLED",
+    "ftp": "ENABLED",
+    "mgmtaccess": "ENABLED",
+    "restrictaccess": "DISABLED",
+    "decrementttl": "DISABLED",
+    "dynamicrouting": "DISABLED",
+    "hostroute": "DISABLED",
+    "advertiseondefaultpartition": "DISABLED",
+    "networkroute": "DISABLED",
+    "tag": "0",
+    "hostrtgwact": "0.0.0.0",
+    "metric": 0,
+    "ospfareaval": "0",
+    "vserverrhilevel": "ONE_VSERVER",
+    "viprtadv2bsd": True,
+    "vipvsercount": "0",
+    "vipvserdowncount": "0",
+    "vipvsrvrrhiactivecount": "0",
+    "vipvsrvrrhiactiveupcount": "0",
+    "ospflsatype": "TYPE5",
+    "state": "ENABLED",
+    "freeports": "1032080",
+    "iptype": ["SNIP", "GSLBsiteIP"],
+    "icmpresponse": "NONE",
+    "ownernode": "255",
+    "arpresponse": "NONE",
+    "ownerdownresponse": "YES",
+}
+NSIP6_TEMPLATE = {
+    "ipv6address": "fe80::1234:5678:9abc:dev1/64",
+    "td": "0",
+    "scope": "link-local",
+    "iptype": ["NSIP"],
+    "vlan": "1",
+    "nd": "ENABLED",
+    "icmp": "ENABLED",
+    "vserver": "DISABLED",
+    "telnet": "ENABLED",
+    "ssh": "ENABLED",
+    "gui": "ENABLED",
+    "snmp": "ENABLED",
+    "ftp": "ENABLED",
+    "mgmtaccess": "ENABLED",
+    "restrictaccess": "DISABLED",
+    "state": "ENABLED",
+    "curstate": "ACTIVE",
+    "map": "0.0.0.0",
+    "decrementhoplimit": "DISABLED",
+    "dynamicrouting": "ENABLED",
+    "hostroute": "DISABLED",
+    "advertiseondefaultpartition": "DISABLED",
+    "networkroute": "DISABLED",
+    "tag": "0",
+    "ip6hostrtgw": "::",
+    "metric": 0,
+    "vserverrhilevel": "ONE_VSERVER",
+    "viprtadv2bsd": False,
+    "vipvsercount": "0",
+    "vipvserdowncount": "0",
+    "ospf6lsatype": "EXTERNAL",
+    "ownernode": "255",
+    "ownerdownresponse": "YES",
+    "systemtype": "HA",
+}
+
+
+class SyntheticAdc:
+    """Responses of a synthetic ADC with a VLAN and a SNIP per subnet.
+
+    Every VLAN gets its own /24 in 10.0.0.0/8 bound to a random interface and each SNIP is placed in a different
+    random subnet. The same seed always produces the same responses.
+    """
+
+    def __init__(self, index: int = 0, vlans: int = 10, snips: int = 10, seed: int = 0):
+        """Generate the responses of an ADC.
+
+        Args:
+            index (int, optional): Index of the ADC, used for its hostname and addresses. Defaults to 0.
+            vlans (int, optional): Number of VLANs with an IP binding. Defaults to 10.
+            snips (int, optional): Number of SNIPs, at most one per VLAN. Defaults to 10.
+            seed (int, optional): Seed of the random generator. Defaults to 0.
+        """
+        rng = random.Random(f"{seed}-{index}")
+        self.subnets = [
+            f"10.{(index * vlans + vlan) // 256 % 256}.{(index * vlans + vlan) % 256}" for vlan in range(vlans)
+        ]
+        nsip = f"{self.subnets[0]}.1" if self.subnets else f"192.0.2.{index % 254 + 1}"
+        self.device = {
+            **deepcopy(DEVICE_TEMPLATE),
+            "hostname": f"SYNTH-ADC{index:05d}",
+            "ip_address": nsip,
+            "mgmt_ip_address": nsip,
+            "display_name": nsip,
+            "ha_ip_address": "",
+            "netmask": "255.255.255.0",
+            "serialnumber": f"SYNTH{index:08d}",
+        }
+        self.vlan_bindings = [
+            {
+                "id": "1",
+                "vlan_interface_binding": [{"id": "1", "ifnum": "LO/1", "tagged": False, "stateflag": "4"}],
+            }
+        ]
+        for vlan, subnet in enumerate(self.subnets, start=2):
+            ifnum = f"{rng.choice([0, 1, 10])}/{rng.randint(1, 8)}"
+            self.vlan_bindings.append(
+                {
+                    "id": str(vlan),
+                    "vlan_interface_binding": [
+                        {"id": str(vlan), "ifnum": ifnum, "tagged": rng.random() < 0.8, "stateflag": "4"}
+                    ],
+                    "vlan_nsip_binding": [
+                        {"id": str(vlan), "ipaddress": f"{subnet}.1", "netmask": "255.255.255.0", "stateflag": "1"}
+                    ],
+                }
+            )
+        self.nsips = [{**NSIP_TEMPLATE, "ipaddress": self.device["ip_address"], "netmask": "255.255.255.0"}]
+        for subnet in rng.sample(self.subnets, min(snips, len(self.subnets))):
+            self.nsips.append(
+                {**SNIP_TEMPLATE, "ipaddress": f"{subnet}.{rng.randint(2, 254)}", "netmask": "255.255.255.0"}
+            )
+        self.nsip6s = [
+            {**NSIP6_TEMPLATE, "ipv6address": f"fe80::{index:x}:{vlan:x}/64", "vlan": str(vlan)}
+            for vlan in range(1, len(self.subnets) + 2)
+        ]
+
+    def churn(self, rng: random.Random):
+        """Upgrade the ADC and move one of its SNIPs to another address in the same subnet.
+
+        Args:
+            rng (random.Random): Random generator picking the new SNIP address.
+        """
+        self.device["version"] = self.device["version"].replace("NS12.1: Build 63.22.nc", "NS13.1: Build 49.15.nc")
+        snips = [nsip for nsip in self.nsips if nsip["type"] == "SNIP"]
+        if snips:
+            subnet, host = snips[0]["ipaddress"].rsplit(".", 1)
+            snips[0]["ipaddress"] = f"{subnet}.{rng.choice([num for num in range(2, 255) if num != int(host)])}"
+
+
+def generate_adcs(count: int, vlans: int = 10, snips: int = 10, seed: int = 0) -> List[SyntheticAdc]:
+    """Generate synthetic ADCs.
+
+    Args:
+        count (int): Number of ADCs to generate.
+        vlans (int, optional): Number of VLANs with an IP binding per ADC. Defaults to 10.
+        snips (int, optional): Number of SNIPs per ADC. Defaults to 10.
+        seed (int, optional): Seed of the random generator. Defaults to 0.
+
+    Returns:
+        List[SyntheticAdc]: Generated ADCs.
+    """
+    return [SyntheticAdc(index=index, vlans=vlans, snips=snips, seed=seed) for index in range(count)]
+
+
+class SyntheticAdm:
+    """Synthetic Citrix ADM instance managing ADCs spread across Datacenters."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, devices: int, datacenters: int = 1, vlans: int = 10, snips: int = 10, seed: int = 0
+    ):
+        """Generate the Datacenters and ADCs of the instance.
+
+        Args:
+            devices (int): Number of ADCs.
+            datacenters (int, optional): Number of Datacenters the ADCs are spread across. Defaults to 1.
+            vlans (int, optional): Number of VLANs with an IP binding per ADC. Defaults to 10.
+            snips (int, optional): Number of SNIPs per ADC. Defaults to 10.
+            seed (int, optional): Seed of the random generator. Defaults to 0.
+        """
+        self.seed = seed
+        rng = random.Random(seed)
+        self.datacenters = [
+            {
+                "city": "",
+                "zipcode": "",
+                "type": "1",
+                "name": f"SYNTH-DC{index:03d}",
+                "region": "Synthetic",
+                "country": "",
+                "latitude": f"{rng.uniform(-60, 60):.6f}",
+                "longitude": f"{rng.uniform(-180, 180):.6f}",
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            }
+            for index in range(datacenters)
+        ]
+        self.adcs = generate_adcs(count=devices, vlans=vlans, snips=snips, seed=seed)
+        for index, adc in enumerate(self.adcs):
+            adc.device["datacenter_id"] = self.datacenters[index % datacenters]["id"]
+        self.adc_map = {adc.device["ip_address"]: adc for adc in self.adcs}
+
+    def churn(self, fraction: float) -> int:
+        """Change a fraction of the ADCs.
+
+        Args:
+            fraction (float): Fraction of the ADCs to change.
+
+        Returns:
+            int: Number of ADCs changed.
+        """
+        rng = random.Random(f"{self.seed}-churn-{fraction}")
+        changed = rng.sample(self.adcs, round(len(self.adcs) * fraction))
+        for adc in changed:
+            adc.churn(rng)
+        return len(changed)
+
+    def response(self, objecttype: str, instance_ip: str = "") -> dict:
+        """Build the NITRO response for a config object type.
+
+        Args:
+            objecttype (str): NITRO object type requested.
+            instance_ip (str, optional): IP Address of the ADC a proxied request is for. Defaults to "".
+
+        Returns:
+            dict: NITRO response body.
+        """
+        if objecttype == "login":
+            return {"errorcode": 0, "login": [{"sessionid": "synthetic"}]}
+        if objecttype == "logout":
+            return {"errorcode": 0}
+        if objecttype == "mps_datacenter":
+            return {"errorcode": 0, objecttype: self.datacenters}
+        if objecttype == "managed_device":
+            return {"errorcode": 0, objecttype: [adc.device for adc in self.adcs]}
+        adc = self.adc_map.get(instance_ip)
+        proxied = {"nsip": "nsips", "nsip6": "nsip6s", "vlan_binding": "vlan_bindings"}
+        if adc is None or objecttype not in proxied:
+            return {"errorcode": 258, "message": f"No such resource [{objecttype}]"}
+        return {"errorcode": 0, objecttype: getattr(adc, proxied[objecttype])}
+
+
+class NitroRequestHandler(BaseHTTPRequestHandler):
+    """Answer NITRO config requests from the SyntheticAdm of the server."""
+
+    def respond(self):
+        """Send the response of the requested object type."""
+        self.server.requests += 1
+        objecttype = self.path.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+        if self.headers.get("Content-Length"):
+            self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(
+            self.server.adm.response(objecttype, self.headers.get("_MPS_API_PROXY_MANAGED_INSTANCE_IP", ""))
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = respond
+    do_POST = respond
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Don't log each request."""
+
+
+class NitroStandIn:
+    """Local HTTP server answering Citrix NITRO requests from a SyntheticAdm, for use as a context manager."""
+
+    def __init__(self, adm: SyntheticAdm, host: str = "127.0.0.1", port: int = 0):
+        """Create the server without starting it.
+
+        Args:
+            adm (SyntheticAdm): Synthetic instance whose responses are served.
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 picks a free port. Defaults to 0.
+        """
+        self.server = ThreadingHTTPServer((host, port), NitroRequestHandler)
+        self.server.adm = adm
+        self.server.requests = 0
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the stand-in."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        """Number of requests answered."""
+        return self.server.requests
+
+    def __enter__(self):
+        """Start serving in a background thread."""
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop serving."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class EventNotifierStandIn:
+    """Send event notifications shaped like the webhooks of a Citrix ADM event rule over HTTP."""
+
+    def __init__(self, url: str, token: str):
+        """Initialize the notifier.
+
+        Args:
+            url (str): URL of the event receiver.
+            token (str): Nautobot API token to authenticate with.
+        """
+        self.url = url
+        self.token = token
+
+    @staticmethod
+    def event(adc: SyntheticAdc, category: str = "configSaved", by_address: bool = False) -> dict:
+        """Build the event of an ADC.
+
+        Args:
+            adc (SyntheticAdc): ADC the event is about.
+            category (str, optional): Category of the event. Defaults to "configSaved".
+            by_address (bool, optional): Only identify the ADC by its IP Address. Defaults to False.
+
+        Returns:
+            dict: Event as sent by Citrix ADM.
+        """
+        event = {"category": category, "severity": "Minor", "source": adc.device["ip_address"]}
+        if not by_address:
+            event["hostname"] = adc.device["hostname"]
+        return event
+
+    def notify(self, events: List[dict]) -> requests.Response:
+        """Post events to the receiver.
+
+        Args:
+            events (List[dict]): Events built by `event()`.
+
+        Returns:
+            requests.Response: Response of the receiver.
+        """
+        return requests.post(
+            self.url, json={"events": events}, headers={"Authorization": f"Token {self.token}"}, timeout=10
+        )
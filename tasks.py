@@ -653,6 +653,55 @@ def unittest(
     run_command(context, command)
 
 
+@task(
+    help={
+        "compare": "Compare against the previous saved run and fail if the mean of a benchmark regressed by more than this, ie 10%.",
+        "save": "Save the results in .benchmarks/ for later comparison.",
+    }
+)
+def benchmark(context, compare="", save=True):
+    """Run the pytest-benchmark suite and write the results to benchmark.json."""
+    command = "pytest --benchmark-json=benchmark.json"
+    if save:
+        command += " --benchmark-autosave"
+    if compare:
+        command += f" --benchmark-compare --benchmark-compare-fail=mean:{compare}"
+
+    run_command(context, command)
+
+
+@task(
+    help={
+        "devices": "Number of ADCs in the synthetic Citrix ADM. (default: 100)",
+        "datacenters": "Number of Datacenters the ADCs are spread across. (default: 5)",
+        "vlans": "Number of VLANs with an IP binding per ADC. (default: 10)",
+        "snips": "Number of SNIPs per ADC. (default: 10)",
+        "churn": "Fraction of ADCs changed for the churn run. (default: 0.05)",
+        "bulk-import": "Enable the Bulk Import Job option. (default: False)",
+        "output": "JSON file to write the results to. (default: benchmark_sync.json)",
+    }
+)
+def benchmark_sync(  # pylint: disable=too-many-arguments
+    context,
+    devices=100,
+    datacenters=5,
+    vlans=10,
+    snips=10,
+    churn=0.05,
+    bulk_import=False,
+    output="benchmark_sync.json",
+):
+    """Benchmark the Citrix ADM to Nautobot sync end-to-end against a synthetic Citrix ADM."""
+    command = (
+        f"nautobot-server benchmark_citrix_adm_sync --devices {devices} --datacenters {datacenters} --vlans {vlans}"
+        f" --snips {snips} --churn {churn} --output {output}"
+    )
+    if bulk_import:
+        command += " --bulk-import"
+
+    run_command(context, command)
+
+
 @task
 def unittest_coverage(context):
     """Report on code test coverage as measured by 'invoke unittest'."""